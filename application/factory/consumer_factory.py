@@ -41,6 +41,9 @@ def convert_consumer_event(event) -> list:
                         else:
                             new_format.append(consumer_required_format(blockchain_name=BlockchainName.CARDANO.value,
                                                                        blockchain_event=parsed_message))
+                    elif EventConsumerEntity.BLOCK_CONFIRMATION_ATTEMPT.value in parsed_body:
+                        # Re-enqueued while waiting for block confirmations, already in the consumer format
+                        new_format.append(parsed_body)
                     else:
                         # Temporary block for compatibility with legacy ethereum listener (event pubsub)
                         try:
@@ -122,13 +122,24 @@ def get_conversion_history(event, context):
         raise BadRequestException(error_code=ErrorCode.PAGE_SIZE_EXCEEDS_LIMIT.value,
                                   error_details=ErrorDetails[ErrorCode.PAGE_SIZE_EXCEEDS_LIMIT.value].value)
 
-    response = conversion_service.get_conversion_history(address=address,
-                                                         blockchain_name=blockchain_name,
-                                                         token_symbol=token_symbol,
-                                                         conversion_status=conversion_status,
-                                                         order=history_order,
-                                                         page_size=page_size,
-                                                         page_number=page_number)
+    # Presence of the cursor parameter switches to keyset pagination, an empty cursor asks for the first page
+    if ApiParameters.CURSOR.value in query_param:
+        response = conversion_service.get_conversion_history_by_cursor(address=address,
+                                                                       blockchain_name=blockchain_name,
+                                                                       token_symbol=token_symbol,
+                                                                       conversion_status=conversion_status,
+                                                                       order=history_order,
+                                                                       page_size=page_size,
+                                                                       cursor=query_param.get(
+                                                                           ApiParameters.CURSOR.value))
+    else:
+        response = conversion_service.get_conversion_history(address=address,
+                                                             blockchain_name=blockchain_name,
+                                                             token_symbol=token_symbol,
+                                                             conversion_status=conversion_status,
+                                                             order=history_order,
+                                                             page_size=page_size,
+                                                             page_number=page_number)
 
     return generate_lambda_response(HTTPStatus.OK.value,
                                     make_response_body(status=LambdaResponseStatus.SUCCESS.value,
@@ -259,7 +270,37 @@ def get_converter_liquidity_addresses(event, context):
 @exception_handler(EXCEPTIONS=EXCEPTIONS, SLACK_HOOK=SLACK_HOOK, logger=logger)
 def expire_conversion(event, context):
     logger.debug(f"Job for expiring the conversion request={json.dumps(event)}")
-    conversion_service.expire_conversion()
+    response = conversion_service.expire_conversion(watermark=event.get("watermark"))
+    logger.info(f"Expiry sweep response={json.dumps(response)}")
+    logger.info("Successfully")
+
+
+@exception_handler(EXCEPTIONS=EXCEPTIONS, SLACK_HOOK=SLACK_HOOK, logger=logger)
+def rebuild_address_status_count(event, context):
+    logger.debug(f"Rebuilding the address status count request={json.dumps(event)}")
+    conversion_service.rebuild_address_status_count()
+    logger.info("Successfully")
+
+
+@exception_handler(EXCEPTIONS=EXCEPTIONS, SLACK_HOOK=SLACK_HOOK, logger=logger)
+def rebuild_token_pair_liquidity(event, context):
+    logger.debug(f"Rebuilding the token pair liquidity request={json.dumps(event)}")
+    conversion_service.rebuild_token_pair_liquidity()
+    logger.info("Successfully")
+
+
+@exception_handler(EXCEPTIONS=EXCEPTIONS, SLACK_HOOK=SLACK_HOOK, logger=logger)
+def refresh_conversion_daily_stats(event, context):
+    logger.debug(f"Refreshing the conversion daily stats request={json.dumps(event)}")
+    conversion_service.refresh_conversion_daily_stats()
+    logger.info("Successfully")
+
+
+@exception_handler(EXCEPTIONS=EXCEPTIONS, SLACK_HOOK=SLACK_HOOK, logger=logger)
+def backfill_conversion_daily_stats(event, context):
+    logger.debug(f"Backfilling the conversion daily stats request={json.dumps(event)}")
+    conversion_service.backfill_conversion_daily_stats(start_date=event.get("start_date"),
+                                                       end_date=event.get("end_date"))
     logger.info("Successfully")
 
 
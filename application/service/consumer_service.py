@@ -5,16 +5,18 @@ from decimal import Decimal
 from application.service.blockchain_service import BlockchainService
 from application.service.cardano_service import CardanoService
 from application.service.conversion_service import ConversionService
+from application.service.event_ledger_service import EventLedgerService
 from application.service.notification_service import NotificationService
 from application.service.pooling_service import PoolingService
+from application.service.submission_service import SubmissionService
 from application.service.token_service import TokenService
 from application.service.wallet_pair_service import WalletPairService
 from common.logger import get_logger
-from config import MESSAGE_GROUP_ID, SLACK_HOOK
+from config import SLACK_HOOK, BLOCK_CONFIRMATION_WAIT
 from constants.entity import CardanoEventType, BlockchainEntities, CardanoEventConsumer, EventConsumerEntity, \
     WalletPairEntities, ConversionEntities, ConverterBridgeEntities, EthereumEventConsumerEntities, EthereumEventType, \
     TransactionEntities, TokenEntities, ConversionDetailEntities, CardanoAPIEntities, TokenPairEntities, \
-    ConversionFeeEntities, MessagePoolEntities, BinanceEventConsumerEntities, BinanceEventType, \
+    ConversionFeeEntities, BinanceEventConsumerEntities, BinanceEventType, \
     CardanoServicesEventTypes
 from constants.error_details import ErrorCode, ErrorDetails
 from constants.general import BlockchainName, CreatedBy, QueueName, ConversionOn
@@ -24,7 +26,7 @@ from utils.general import update_decimal_places, reset_decimal_places, calculate
 from utils.blockchain import get_next_activity_event_on_conversion, validate_consumer_event_against_transaction, \
     generate_deposit_address_details_for_cardano_operation, \
     validate_conversion_request_amount, validate_consumer_event_type, convert_str_to_decimal, \
-    get_current_block_confirmation, wait_until_transaction_hash_exists_in_blockchain, \
+    get_current_block_confirmation, get_block_confirmation_delay, \
     validate_tx_hash_presence_in_blockchain, validate_tx_token_received_ada_amount
 from utils.exception_handler import bridge_exception_handler
 from utils.exceptions import BadRequestException, InternalServerErrorException, BlockConfirmationNotEnoughException
@@ -40,6 +42,8 @@ class ConsumerService:
         self.wallet_pair_service = WalletPairService()
         self.token_service = TokenService()
         self.pool_service = PoolingService()
+        self.submission_service = SubmissionService()
+        self.event_ledger_service = EventLedgerService()
 
     @staticmethod
     def post_converter_ethereum_events_to_queue(payload):
@@ -50,6 +54,7 @@ class ConsumerService:
 
     def converter_event_consumer(self, payload):
         logger.info(f"Converter event consumer received the payload={payload}")
+        self.conversion_service.clear_conversion_complete_detail_cache()
         blockchain_name = payload.get(EventConsumerEntity.BLOCKCHAIN_NAME.value)
         blockchain_event = payload.get(EventConsumerEntity.BLOCKCHAIN_EVENT.value)
 
@@ -89,13 +94,22 @@ class ConsumerService:
             raise InternalServerErrorException(error_code=ErrorCode.CONSUMER_EVENT_EMPTY.value,
                                                error_details=ErrorDetails[ErrorCode.CONSUMER_EVENT_EMPTY.value].value)
 
+        if self.event_ledger_service.is_event_completed(blockchain_name=blockchain_name, tx_hash=tx_hash,
+                                                        event_type=event_type):
+            logger.info(f"Event already completed for tx_hash={tx_hash}, event_type={event_type}, skipping it")
+            return
+
         validate_consumer_event_type(blockchain_name=blockchain_name, event_type=event_type)
         validate_tx_hash_presence_in_blockchain(blockchain_name=blockchain_name, tx_hash=tx_hash,
                                                 network_id=blockchain_network_id)
-        self.process_event_consumer(event_type=event_type, tx_hash=tx_hash, network_id=blockchain_network_id,
-                                    blockchain_event=blockchain_event, blockchain_detail=blockchain_detail)
-
-    def process_event_consumer(self, event_type, tx_hash, network_id, blockchain_event, blockchain_detail):
+        # Event processing reads back the conversion and transactions it writes, so it never reads from the replica
+        with self.conversion_service.conversion_repo.read_from_primary():
+            self.process_event_consumer(event_type=event_type, tx_hash=tx_hash, network_id=blockchain_network_id,
+                                        blockchain_event=blockchain_event, blockchain_detail=blockchain_detail,
+                                        payload=payload)
+
+    def process_event_consumer(self, event_type, tx_hash, network_id, blockchain_event, blockchain_detail,
+                               payload):
         logger.info("Processing the event consumer payload")
         db_blockchain_name = blockchain_detail.get(BlockchainEntities.NAME.value).lower()
         required_block_confirmation = blockchain_detail.get(BlockchainEntities.BLOCK_CONFIRMATION.value)
@@ -151,10 +165,14 @@ class ConsumerService:
         if transaction is None:
             transaction = self.conversion_service.get_transaction_by_hash(tx_hash=tx_hash)
 
-        self.check_and_update_block_confirmation(tx_id=transaction.get(TransactionEntities.ID.value),
-                                                 blockchain_name=db_blockchain_name,
-                                                 required_block_confirmation=required_block_confirmation,
-                                                 tx_hash=tx_hash, network_id=network_id)
+        current_block_confirmation = self.check_and_update_block_confirmation(
+            tx_id=transaction.get(TransactionEntities.ID.value), blockchain_name=db_blockchain_name, tx_hash=tx_hash,
+            network_id=network_id)
+        if current_block_confirmation < required_block_confirmation:
+            self.enqueue_for_block_confirmation(
+                payload=payload, blockchain_name=db_blockchain_name,
+                missing_block_confirmation=required_block_confirmation - current_block_confirmation)
+            return
 
         self.conversion_service.update_transaction_by_id(tx_id=transaction.get(TransactionEntities.ID.value),
                                                          tx_status=TransactionStatus.SUCCESS.value)
@@ -172,12 +190,7 @@ class ConsumerService:
         activity_event = activity_event_obj.to_dict() if activity_event_obj else None
 
         if activity_event:
-            # Getting message pool id
-            message_group = self.pool_service.get_message_group_pool()
-            if message_group:
-                message_group_id = message_group.get(MessagePoolEntities.MESSAGE_GROUP_ID.value)
-            else:
-                message_group_id = MESSAGE_GROUP_ID
+            message_group_id, message_pool_id = self.pool_service.get_message_group_id(conversion_id=conversion_id)
 
             queue = QueueName.CONVERTER_BRIDGE.value
             if message_group_id in QueueName._value2member_map_:
@@ -186,16 +199,22 @@ class ConsumerService:
             NotificationService.send_message_to_queue(queue=queue,
                                                       message=json.dumps(activity_event),
                                                       message_group_id=message_group_id)
-            if message_group:
-                self.pool_service.update_message_pool(id=message_group.get(MessagePoolEntities.ID.value))
+            if message_pool_id:
+                self.pool_service.update_message_pool(id=message_pool_id)
+            self.event_ledger_service.record_event_completed(blockchain_name=db_blockchain_name, tx_hash=tx_hash,
+                                                             event_type=event_type)
         else:
             conversion_transaction_id = conversion_complete_detail \
                 .get(ConversionDetailEntities.TRANSACTIONS.value, {})[0] \
                 .get(TransactionEntities.CONVERSION_TRANSACTION_ID.value)
-            self.conversion_service.update_conversion_transaction(conversion_transaction_id=conversion_transaction_id,
-                                                                  status=ConversionTransactionStatus.SUCCESS.value)
-            self.conversion_service.update_conversion(conversion_id=conversion.get(ConversionEntities.ID.value),
-                                                      status=ConversionStatus.SUCCESS.value)
+            with self.conversion_service.conversion_repo.unit_of_work():
+                self.conversion_service.update_conversion_transaction(
+                    conversion_transaction_id=conversion_transaction_id,
+                    status=ConversionTransactionStatus.SUCCESS.value)
+                self.conversion_service.update_conversion(conversion_id=conversion.get(ConversionEntities.ID.value),
+                                                          status=ConversionStatus.SUCCESS.value)
+                self.event_ledger_service.record_event_completed(blockchain_name=db_blockchain_name, tx_hash=tx_hash,
+                                                                 event_type=event_type)
             logger.info("Conversion is done")
 
     def process_evm_event(self, event_type, tx_hash, tx_amount, conversion_id, transaction, token_holder):
@@ -419,29 +438,36 @@ class ConsumerService:
 
         return conversion
 
-    def check_and_update_block_confirmation(self, tx_id, blockchain_name, required_block_confirmation,
-                                            tx_hash, network_id):
-
+    def check_and_update_block_confirmation(self, tx_id, blockchain_name, tx_hash, network_id):
         current_block_confirmation = get_current_block_confirmation(blockchain_name=blockchain_name, tx_hash=tx_hash,
                                                                     network_id=network_id)
-        if required_block_confirmation > current_block_confirmation:
-            logger.info(f"Block confirmation is not enough as required confirmation={required_block_confirmation} "
-                        f"and current_confirmation={current_block_confirmation}")
-            self.conversion_service.update_transaction_by_id(tx_id=tx_id, confirmation=current_block_confirmation)
-            current_block_confirmation = get_current_block_confirmation(blockchain_name=blockchain_name,
-                                                                        tx_hash=tx_hash, network_id=network_id)
-
         logger.info(f"Current block confirmation={current_block_confirmation}")
         self.conversion_service.update_transaction_by_id(tx_id=tx_id, confirmation=current_block_confirmation)
+        return current_block_confirmation
 
-        if current_block_confirmation < required_block_confirmation:
+    @staticmethod
+    def enqueue_for_block_confirmation(payload, blockchain_name, missing_block_confirmation):
+        # The progress is on the transaction, the event comes back once the missing blocks should have been mined
+        attempt = payload.get(EventConsumerEntity.BLOCK_CONFIRMATION_ATTEMPT.value, 0) + 1
+        if attempt > BLOCK_CONFIRMATION_WAIT["MAX_ATTEMPTS"]:
+            logger.info(f"Block confirmation is still not enough after attempts={attempt - 1}")
             raise BlockConfirmationNotEnoughException(
                 error_code=ErrorCode.NOT_ENOUGH_BLOCK_CONFIRMATIONS.value,
                 error_details=ErrorDetails[ErrorCode.NOT_ENOUGH_BLOCK_CONFIRMATIONS.value].value)
 
+        delay_seconds = get_block_confirmation_delay(blockchain_name=blockchain_name,
+                                                     missing_block_confirmation=missing_block_confirmation)
+        logger.info(f"Block confirmation is not enough as missing_confirmation={missing_block_confirmation}, "
+                    f"enqueuing the event again with attempt={attempt} and delay_seconds={delay_seconds}")
+        NotificationService.send_message_to_queue(
+            queue=QueueName.EVENT_CONSUMER.value,
+            message=json.dumps({**payload, EventConsumerEntity.BLOCK_CONFIRMATION_ATTEMPT.value: attempt}),
+            message_group_id=None, delay_seconds=delay_seconds)
+
     @bridge_exception_handler(SLACK_HOOK=SLACK_HOOK, logger=logger)
     def converter_bridge(self, payload):
         logger.info(f"Converter bridge received the payload={payload}")
+        self.conversion_service.clear_conversion_complete_detail_cache()
         blockchain_name = payload.get(ConverterBridgeEntities.BLOCKCHAIN_NAME.value)
         blockchain_event = payload.get(ConverterBridgeEntities.BLOCKCHAIN_EVENT.value, {})
 
@@ -455,24 +481,27 @@ class ConsumerService:
                         f"tx_amount={tx_amount}, tx_operation={tx_operation} are missing or invalid values provided")
             raise InternalServerErrorException(error_code=ErrorCode.MISSING_CONVERTER_BRIDGE_FIELDS)
 
-        conversion_complete_detail = self.conversion_service.get_conversion_complete_detail(conversion_id=conversion_id)
-        if not conversion_complete_detail:
-            logger.info(f"Invalid conversion_id={conversion_id} provided")
-            raise InternalServerErrorException(error_code=ErrorCode.INVALID_CONVERSION_ID.value,
-                                               error_details=ErrorDetails[ErrorCode.INVALID_CONVERSION_ID.value].value)
-
-        activity_event_obj = get_next_activity_event_on_conversion(conversion_complete_detail)
-        activity_event = activity_event_obj.to_dict() if activity_event_obj else None
-
-        if payload == activity_event:
-            self.process_converter_bridge_request(
-                conversion_complete_detail=conversion_complete_detail,
-                payload=payload,
-                conversion_side=activity_event_obj.conversion_side)
-            logger.info("Successfully processed the request")
-        else:
-            logger.info("Unable to match the request activity event")
-            raise BadRequestException(error_code=ErrorCode.ACTIVITY_EVENT_NOT_MATCHING)
+        with self.conversion_service.conversion_repo.read_from_primary():
+            conversion_complete_detail = self.conversion_service.get_conversion_complete_detail(
+                conversion_id=conversion_id)
+            if not conversion_complete_detail:
+                logger.info(f"Invalid conversion_id={conversion_id} provided")
+                raise InternalServerErrorException(
+                    error_code=ErrorCode.INVALID_CONVERSION_ID.value,
+                    error_details=ErrorDetails[ErrorCode.INVALID_CONVERSION_ID.value].value)
+
+            activity_event_obj = get_next_activity_event_on_conversion(conversion_complete_detail)
+            activity_event = activity_event_obj.to_dict() if activity_event_obj else None
+
+            if payload == activity_event:
+                self.process_converter_bridge_request(
+                    conversion_complete_detail=conversion_complete_detail,
+                    payload=payload,
+                    conversion_side=activity_event_obj.conversion_side)
+                logger.info("Successfully processed the request")
+            else:
+                logger.info("Unable to match the request activity event")
+                raise BadRequestException(error_code=ErrorCode.ACTIVITY_EVENT_NOT_MATCHING)
 
     def process_converter_bridge_request(self, conversion_complete_detail, payload, conversion_side):
         logger.info("Processing the conversion bridge request")
@@ -622,13 +651,14 @@ class ConsumerService:
             raise InternalServerErrorException(error_code=ErrorCode.INVALID_TRANSACTION_OPERATION_PROVIDED)
 
         if payload_blockchain_name == BlockchainName.CARDANO.value.lower() and (tx_operation in CardanoServicesEventTypes):
-            self.conversion_service.create_transaction(
-                conversion_transaction_id=transactions[0].get(TransactionEntities.CONVERSION_TRANSACTION_ID.value),
-                token_id=target_token.get(TokenEntities.ROW_ID.value),
-                transaction_visibility=TransactionVisibility.EXTERNAL.value,
-                transaction_operation=tx_operation, transaction_hash=tx_hash,
-                transaction_amount=tx_amount, confirmation=0,
-                status=TransactionStatus.WAITING_FOR_CONFIRMATION.value,
-                created_by=CreatedBy.BACKEND.value)
-
-            wait_until_transaction_hash_exists_in_blockchain(tx_hash, network_id)
+            # The presence on chain is checked by the scheduled job, the message group is not held until then
+            with self.conversion_service.conversion_repo.unit_of_work():
+                self.conversion_service.create_transaction(
+                    conversion_transaction_id=transactions[0].get(TransactionEntities.CONVERSION_TRANSACTION_ID.value),
+                    token_id=target_token.get(TokenEntities.ROW_ID.value),
+                    transaction_visibility=TransactionVisibility.EXTERNAL.value,
+                    transaction_operation=tx_operation, transaction_hash=tx_hash,
+                    transaction_amount=tx_amount, confirmation=0,
+                    status=TransactionStatus.WAITING_FOR_CONFIRMATION.value,
+                    created_by=CreatedBy.BACKEND.value)
+                self.submission_service.track_submission(transaction_hash=tx_hash, chain_id=network_id)
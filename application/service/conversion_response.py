@@ -1,6 +1,7 @@
 from constants.entity import ConversionEntities, TokenPairEntities, WalletPairEntities, ConversionDetailEntities, TokenEntities, \
     BlockchainEntities, TransactionEntities, TransactionConversionEntities, SignatureMetadataEntities
 from application.service.token_response import get_trading_view_response
+from utils.general import datetime_to_str
 
 
 def conversion_response(conversion):
@@ -164,17 +165,72 @@ def get_conversion_response(conversion):
     }
 
 
-def get_conversion_history_response(history):
+def get_conversion_history_rows_response(rows):
     return [{
-        ConversionDetailEntities.CONVERSION.value: get_conversion_history_for_conversion_response(
-            conversion[ConversionDetailEntities.CONVERSION.value]),
-        ConversionDetailEntities.WALLET_PAIR.value: get_wallet_pair_response(
-            conversion[ConversionDetailEntities.WALLET_PAIR.value]),
-        ConversionDetailEntities.FROM_TOKEN.value: get_token_response(
-            conversion[ConversionDetailEntities.FROM_TOKEN.value]),
-        ConversionDetailEntities.TO_TOKEN.value: get_token_response(
-            conversion[ConversionDetailEntities.TO_TOKEN.value])
-    } for conversion in history]
+        ConversionDetailEntities.CONVERSION.value: {
+            ConversionEntities.ID.value: row.id,
+            ConversionEntities.DEPOSIT_AMOUNT.value: str(row.deposit_amount.normalize()),
+            ConversionEntities.CLAIM_AMOUNT.value: str(row.claim_amount.normalize()),
+            ConversionEntities.FEE_AMOUNT.value: str(row.fee_amount.normalize()),
+            ConversionEntities.STATUS.value: row.status,
+            ConversionEntities.CREATED_AT.value: datetime_to_str(row.created_at),
+            ConversionEntities.UPDATED_AT.value: datetime_to_str(row.updated_at),
+        },
+        ConversionDetailEntities.WALLET_PAIR.value: {
+            WalletPairEntities.FROM_ADDRESS.value: row.from_address,
+            WalletPairEntities.TO_ADDRESS.value: row.to_address,
+            WalletPairEntities.DEPOSIT_ADDRESS.value: row.deposit_address
+        },
+        ConversionDetailEntities.FROM_TOKEN.value: {
+            TokenEntities.NAME.value: row.from_token_name,
+            TokenEntities.SYMBOL.value: row.from_token_symbol,
+            TokenEntities.LOGO.value: row.from_token_logo,
+            TokenEntities.ALLOWED_DECIMAL.value: int(row.from_token_allowed_decimal),
+            TokenEntities.BLOCKCHAIN.value: {
+                BlockchainEntities.NAME.value: row.from_blockchain_name,
+                BlockchainEntities.SYMBOL.value: row.from_blockchain_symbol,
+                BlockchainEntities.LOGO.value: row.from_blockchain_logo,
+                BlockchainEntities.CHAIN_ID.value: row.from_blockchain_chain_id
+            }
+        },
+        ConversionDetailEntities.TO_TOKEN.value: {
+            TokenEntities.NAME.value: row.to_token_name,
+            TokenEntities.SYMBOL.value: row.to_token_symbol,
+            TokenEntities.LOGO.value: row.to_token_logo,
+            TokenEntities.ALLOWED_DECIMAL.value: int(row.to_token_allowed_decimal),
+            TokenEntities.BLOCKCHAIN.value: {
+                BlockchainEntities.NAME.value: row.to_blockchain_name,
+                BlockchainEntities.SYMBOL.value: row.to_blockchain_symbol,
+                BlockchainEntities.LOGO.value: row.to_blockchain_logo,
+                BlockchainEntities.CHAIN_ID.value: row.to_blockchain_chain_id
+            }
+        }
+    } for row in rows]
+
+
+def get_transaction_rows_response(rows):
+    return [{
+        TransactionEntities.ID.value: row.id,
+        TransactionEntities.TRANSACTION_OPERATION.value: row.transaction_operation,
+        TransactionEntities.TRANSACTION_HASH.value: row.transaction_hash,
+        TransactionEntities.TRANSACTION_AMOUNT.value: str(row.transaction_amount.normalize()),
+        TransactionEntities.CONFIRMATION.value: row.confirmation,
+        TransactionEntities.STATUS.value: row.status,
+        TransactionEntities.CREATED_AT.value: datetime_to_str(row.created_at),
+        TransactionEntities.UPDATED_AT.value: datetime_to_str(row.updated_at),
+        TransactionEntities.TOKEN.value: {
+            TokenEntities.NAME.value: row.token_name,
+            TokenEntities.SYMBOL.value: row.token_symbol,
+            TokenEntities.LOGO.value: row.token_logo,
+            TokenEntities.ALLOWED_DECIMAL.value: int(row.token_allowed_decimal),
+            TokenEntities.BLOCKCHAIN.value: {
+                BlockchainEntities.NAME.value: row.blockchain_name,
+                BlockchainEntities.SYMBOL.value: row.blockchain_symbol,
+                BlockchainEntities.LOGO.value: row.blockchain_logo,
+                BlockchainEntities.CHAIN_ID.value: row.blockchain_chain_id
+            }
+        } if row.token_row_id is not None else None
+    } for row in rows]
 
 
 def create_transaction_for_conversion_response(transaction):
@@ -223,6 +279,3 @@ def get_transaction_by_hash_response(transaction):
         TransactionEntities.CONVERSION_TRANSACTION_ID.value]
     return response
 
-
-def get_expiring_conversion_response(conversions):
-    return [conversion[ConversionEntities.ID.value] for conversion in conversions]
@@ -1,18 +1,23 @@
+import copy
 import json
+import time
+from datetime import datetime, timedelta
 from decimal import Decimal
 
 from application.service.conversion_response import get_latest_user_pending_conversion_request_response, \
     create_conversion_response, create_conversion_request_response, \
-    get_conversion_detail_response, get_conversion_history_response, create_conversion_transaction_response, \
+    get_conversion_detail_response, get_conversion_history_rows_response, create_conversion_transaction_response, \
     create_transaction_response, create_transaction_for_conversion_response, get_transaction_by_hash_response, \
     claim_conversion_response, \
-    get_conversion_response, update_conversion_response, get_expiring_conversion_response, get_transaction_response
+    get_conversion_response, update_conversion_response, get_transaction_rows_response
+from application.service.event_ledger_service import EventLedgerService
 from application.service.token_service import TokenService
 from application.service.wallet_pair_service import WalletPairService
 from common.blockchain_util import BlockChainUtil
 from common.logger import get_logger
 from common.utils import Utils
-from config import SIGNATURE_EXPIRY_BLOCKS, EXPIRE_CONVERSION, CONVERTER_REPORTING_SLACK_HOOK
+from config import SIGNATURE_EXPIRY_BLOCKS, EXPIRE_CONVERSION, EXPIRE_CONVERSION_SWEEP, CONVERTER_REPORTING_SLACK_HOOK, \
+    CONVERSION_DAILY_STATS
 from constants.entity import TokenPairEntities, WalletPairEntities, \
     ConversionEntities, TokenEntities, BlockchainEntities, ConversionDetailEntities, TransactionConversionEntities, \
     TransactionEntities, ConversionFeeEntities, ConverterBridgeEntities, EventConsumerEntity, TokenLiquidityEntities
@@ -26,11 +31,12 @@ from utils.blockchain import validate_address, validate_conversion_claim_request
     check_existing_transaction_state, validate_evm_transaction_details_against_conversion, \
     validate_cardano_transaction_details_against_conversion
 from utils.exceptions import BadRequestException, InternalServerErrorException
-from utils.general import get_blockchain_from_token_pair_details, get_response_from_entities, \
+from utils.general import get_blockchain_from_token_pair_details, \
     is_supported_network_conversion, get_evm_network_url, get_offset, paginate_items_response_format, \
     datetime_in_utcnow, relative_date, datetime_to_str, get_formatted_conversion_status_report, \
     reset_decimal_places, update_decimal_places, get_cardano_network_url_and_project_id, \
-    calculate_fee_amount, calculate_claim_amount_by_conversion_ratio
+    calculate_fee_amount, calculate_claim_amount_by_conversion_ratio, cursor_paginate_items_response_format, \
+    encode_pagination_cursor, decode_pagination_cursor
 from utils.signature import validate_conversion_signature, validate_cardano_conversion_signature, get_signature, \
     validate_cardano_hw_signature
 from utils.cardano_blockchain import CardanoBlockchainUtil
@@ -45,11 +51,18 @@ class ConversionService:
         self.conversion_repo = ConversionRepository()
         self.token_service = TokenService()
         self.wallet_pair_service = WalletPairService()
+        self.event_ledger_service = EventLedgerService()
+        # Complete details loaded while processing the current consumer event, dropped on every conversion write
+        self.conversion_complete_detail_cache = dict()
+
+    def clear_conversion_complete_detail_cache(self):
+        self.conversion_complete_detail_cache.clear()
 
     def create_conversion(self, wallet_pair_id, deposit_amount, fee_amount, claim_amount,
                           created_by=CreatedBy.DAPP.value):
         logger.info(f"Creating the conversion with wallet_pair_id={wallet_pair_id}, deposit_amount={deposit_amount}, "
                     f"fee_amount={fee_amount} claim_amount={claim_amount} created_by={created_by}")
+        self.clear_conversion_complete_detail_cache()
         conversion = self.conversion_repo.create_conversion(wallet_pair_id=wallet_pair_id,
                                                             deposit_amount=deposit_amount, fee_amount=fee_amount,
                                                             claim_amount=claim_amount, created_by=created_by)
@@ -57,6 +70,7 @@ class ConversionService:
 
     def create_conversion_transaction(self, conversion_id, created_by):
         logger.info(f"Creating the conversion transaction = {conversion_id}, created_by={created_by}")
+        self.clear_conversion_complete_detail_cache()
         conversion_transaction = self.conversion_repo.create_conversion_transaction(conversion_id=conversion_id,
                                                                                     created_by=created_by)
         return create_conversion_transaction_response(conversion_transaction.to_dict())
@@ -69,6 +83,7 @@ class ConversionService:
                     f"{transaction_visibility}, transaction_operation={transaction_operation}, "
                     f"transaction_hash={transaction_hash}, transaction_amount={transaction_amount}, "
                     f" confirmation={confirmation}, status={status}, created_by={created_by}")
+        self.clear_conversion_complete_detail_cache()
         transaction = self.conversion_repo.create_transaction(conversion_transaction_id=conversion_transaction_id,
                                                               token_id=token_id,
                                                               transaction_visibility=transaction_visibility,
@@ -91,7 +106,7 @@ class ConversionService:
 
     def get_conversion(self, conversion_id):
         logger.info(f"Getting the conversion for the conversion_id={conversion_id} ")
-        conversion = self.get_conversion_complete_detail(conversion_id=conversion_id)
+        conversion = self.__get_conversion_detail(conversion_id=conversion_id)
 
         if conversion is None:
             raise BadRequestException(error_code=ErrorCode.INVALID_CONVERSION_ID.value,
@@ -106,20 +121,8 @@ class ConversionService:
 
     def __get_conversion_detail(self, conversion_id):
         logger.info(f"Get the conversion detail for the conversion_id={conversion_id}")
-        conversion_detail = self.conversion_repo.get_conversion_detail(conversion_id=conversion_id)
-        if conversion_detail:
-            conversion_detail = conversion_detail.to_dict()
-            conversion_row_ids = ConversionService.get_conversion_row_ids(conversion_details=[conversion_detail])
-            transaction_details = dict()
-            if conversion_row_ids:
-                transaction_details = self.get_transactions_for_conversion_row_ids(
-                    conversion_row_ids=conversion_row_ids)
-            transaction_details = self.format_transactions_with_conversion(transaction_details=transaction_details)
-            conversion_details = self.add_transaction_detail_to_conversion_detail(
-                conversion_details=[conversion_detail],
-                transaction_details=transaction_details)
-            conversion_detail = conversion_details[0]
-        return conversion_detail
+        conversion_detail = self.conversion_repo.get_conversion_complete_detail(conversion_id=conversion_id)
+        return conversion_detail.to_dict() if conversion_detail else None
 
     def get_conversion_detail(self, conversion_id):
         logger.info(f"Get the conversion for the ID={conversion_id}")
@@ -140,6 +143,7 @@ class ConversionService:
     def update_conversion_status(self, conversion_id, status):
         logger.info(f"Updating the conversion status for the conversion_id={conversion_id}, "
                     f"status={status}")
+        self.clear_conversion_complete_detail_cache()
         self.conversion_repo.update_conversion_status(conversion_id=conversion_id, status=status)
 
     def update_conversion(self, conversion_id, deposit_amount=None, claim_amount=None, fee_amount=None, status=None,
@@ -147,6 +151,7 @@ class ConversionService:
         logger.info(f"Updating the conversion  for the conversion_id={conversion_id}, "
                     f"deposit_amount={deposit_amount}, claim_amount={claim_amount}, fee_amount={fee_amount}, "
                     f"status={status}, claim_signature={claim_signature}")
+        self.clear_conversion_complete_detail_cache()
         conversion = self.conversion_repo.update_conversion(conversion_id=conversion_id, deposit_amount=deposit_amount,
                                                             claim_amount=claim_amount, fee_amount=fee_amount,
                                                             status=status, claim_signature=claim_signature)
@@ -155,6 +160,7 @@ class ConversionService:
     def update_conversion_transaction(self, conversion_transaction_id, status):
         logger.info(f"Updating the conversion transaction for the conversion_transaction_id={conversion_transaction_id}"
                     f", status={status}")
+        self.clear_conversion_complete_detail_cache()
         self.conversion_repo.update_conversion_transaction(conversion_transaction_id=conversion_transaction_id,
                                                            status=status)
 
@@ -449,76 +455,64 @@ class ConversionService:
         logger.info(f"Getting the conversion history for the given address={address}, "
                     f"blockchain={blockchain_name}, token={token_symbol}, status={conversion_status}, "
                     f"order={order.value}, page_size={page_size}, page_number={page_number}")
-        total_conversion_history = self.conversion_repo.get_conversion_history_count(
+        offset = get_offset(page_number=page_number, page_size=page_size)
+        conversion_history_rows, total_conversion_history = self.conversion_repo.get_conversion_history_page(
             address=address,
             blockchain_name=blockchain_name,
             token_symbol=token_symbol,
-            conversion_status=conversion_status
+            conversion_status=conversion_status,
+            order=order,
+            offset=offset,
+            limit=page_size
         )
-        offset = get_offset(page_number=page_number, page_size=page_size)
-
-        if total_conversion_history and total_conversion_history > offset:
-            conversion_history_obj = self.conversion_repo.get_conversion_history(address=address,
-                                                                                 blockchain_name=blockchain_name,
-                                                                                 token_symbol=token_symbol,
-                                                                                 conversion_status=conversion_status,
-                                                                                 order=order,
-                                                                                 offset=offset,
-                                                                                 limit=page_size)
-            conversion_history = get_response_from_entities(conversion_history_obj)
-            conversion_detail_history_response = get_conversion_history_response(conversion_history)
-        else:
-            conversion_detail_history_response = []
+        conversion_detail_history_response = get_conversion_history_rows_response(conversion_history_rows)
 
         return paginate_items_response_format(items=conversion_detail_history_response,
                                               total_records=total_conversion_history,
                                               page_number=page_number,
                                               page_size=page_size)
 
-    @staticmethod
-    def get_conversion_row_ids(conversion_details):
-        return [conversion_detail.get(ConversionDetailEntities.CONVERSION.value).get(ConversionEntities.ROW_ID.value)
-                for conversion_detail in conversion_details]
+    def get_conversion_history_by_cursor(self, address, blockchain_name, token_symbol, conversion_status,
+                                         order=ConversionHistoryOrder.DEFAULT,
+                                         page_size=PaginationDefaults.PAGE_SIZE.value, cursor=None):
+        logger.info(f"Getting the conversion history for the given address={address}, "
+                    f"blockchain={blockchain_name}, token={token_symbol}, status={conversion_status}, "
+                    f"order={order.value}, page_size={page_size}, cursor={cursor}")
+        position = decode_pagination_cursor(cursor=cursor, order=order.value) if cursor else None
 
-    @staticmethod
-    def format_transactions_with_conversion(transaction_details):
-        formatted_transaction_details = {}
-        for transaction_detail in transaction_details:
-            conversion_row_id = transaction_detail.get(TransactionEntities.CONVERSION_TRANSACTION.value, {}).get(
-                TransactionConversionEntities.CONVERSION_ID.value)
-            formatted_transaction_details[conversion_row_id] = formatted_transaction_details.get(conversion_row_id, {})
-            formatted_transaction_details[conversion_row_id][ConversionDetailEntities.TRANSACTIONS.value] = \
-                formatted_transaction_details[
-                    conversion_row_id].get(ConversionDetailEntities.TRANSACTIONS.value, [])
-            formatted_transaction_details[conversion_row_id][ConversionDetailEntities.TRANSACTIONS.value].append(
-                transaction_detail)
-        return formatted_transaction_details
+        conversion_history_rows, next_position = self.conversion_repo.get_conversion_history_by_cursor(
+            address=address,
+            blockchain_name=blockchain_name,
+            token_symbol=token_symbol,
+            conversion_status=conversion_status,
+            order=order,
+            position=position,
+            limit=page_size
+        )
+        next_cursor = encode_pagination_cursor(order.value, *next_position) if next_position else None
+        conversion_history = get_conversion_history_rows_response(conversion_history_rows)
 
-    @staticmethod
-    def add_transaction_detail_to_conversion_detail(conversion_details, transaction_details):
-        for conversion_detail in conversion_details:
-            conversion_row_id = conversion_detail.get(ConversionDetailEntities.CONVERSION.value) \
-                                                 .get(ConversionEntities.ROW_ID.value)
-            transaction_detail = transaction_details.get(conversion_row_id, {}).get("transactions", [])
-            conversion_detail[ConversionDetailEntities.TRANSACTIONS.value] = transaction_detail
-        return conversion_details
+        return cursor_paginate_items_response_format(items=conversion_history,
+                                                     next_cursor=next_cursor,
+                                                     page_size=page_size)
 
     def get_transaction_by_conversion_id(self, conversion_id):
         logger.info(f"Getting the transactions for the given conversion_id={conversion_id}")
         conversion = self.__get_conversion_only(conversion_id=conversion_id)
-        transactions = self.get_transactions_for_conversion_row_ids(
+        transactions = self.conversion_repo.get_transaction_rows_for_conversion_row_ids(
             conversion_row_ids=[conversion.get(ConversionEntities.ROW_ID.value)])
-        return get_transaction_response(transactions)
-
-    def get_transactions_for_conversion_row_ids(self, conversion_row_ids):
-        logger.info(f"Getting the transactions for the given conversion_row_ids={conversion_row_ids}")
-        transaction_objs = self.conversion_repo.get_transactions_for_conversion_row_ids(
-            conversion_row_ids=conversion_row_ids)
-        return get_response_from_entities(transaction_objs)
+        return get_transaction_rows_response(transactions)
 
     def get_conversion_complete_detail(self, conversion_id):
         logger.info(f"Getting the conversion complete detail")
-        return self.__get_conversion_detail(conversion_id=conversion_id)
+        if conversion_id not in self.conversion_complete_detail_cache:
+            self.conversion_complete_detail_cache[conversion_id] = self.__get_conversion_detail(
+                conversion_id=conversion_id)
+        else:
+            logger.info(f"Reusing the conversion complete detail loaded for the conversion_id={conversion_id}")
+
+        # Callers get their own copy so the cached detail stays as it was loaded
+        return copy.deepcopy(self.conversion_complete_detail_cache[conversion_id])
 
     @staticmethod
     def get_conversion_ids_from_conversion_detail(conversion_detail):
@@ -548,33 +542,36 @@ class ConversionService:
         transaction_operation = next_activity.get(EventConsumerEntity.BLOCKCHAIN_EVENT.value) \
                                              .get(ConverterBridgeEntities.TX_OPERATION.value)
 
-        if not len(transaction):
-            token_id = conversion_detail.get(ConversionDetailEntities.FROM_TOKEN.value) \
-                                        .get(TokenEntities.ROW_ID.value)
-            conversion_transaction = self.create_conversion_transaction(conversion_id=conversion_row_id,
-                                                                        created_by=created_by)
-            conversion_transaction_row_id = conversion_transaction.get(TransactionConversionEntities.ROW_ID.value)
-            transaction_amount = conversion_detail.get(ConversionDetailEntities.CONVERSION.value, {}) \
-                                                  .get(ConversionEntities.DEPOSIT_AMOUNT.value)
-        else:
-            token_id = conversion_detail.get(ConversionDetailEntities.TO_TOKEN.value) \
-                                        .get(TokenEntities.ROW_ID.value)
-            conversion_transaction_row_id = transaction[0].get(TransactionEntities.CONVERSION_TRANSACTION_ID.value)
-            transaction_amount = conversion_detail.get(ConversionDetailEntities.CONVERSION.value, {}) \
-                                                  .get(ConversionEntities.CLAIM_AMOUNT.value)
-
-        if transaction_amount is None:
-            raise BadRequestException(error_code=ErrorCode.UNSUPPORTED_CHAIN_ID.value,
-                                      error_details=ErrorDetails[ErrorCode.UNSUPPORTED_CHAIN_ID.value].value)
-
-        transaction = self.create_transaction(conversion_transaction_id=conversion_transaction_row_id,
-                                              token_id=token_id,
-                                              transaction_visibility=TransactionVisibility.EXTERNAL.value,
-                                              transaction_operation=transaction_operation,
-                                              transaction_hash=transaction_hash, transaction_amount=transaction_amount,
-                                              confirmation=0, status=TransactionStatus.WAITING_FOR_CONFIRMATION.value,
-                                              created_by=created_by)
-        self.update_conversion_status(conversion_id=conversion_id, status=ConversionStatus.PROCESSING.value)
+        # Conversion transaction, transaction and the status change are committed together
+        with self.conversion_repo.unit_of_work():
+            if not len(transaction):
+                token_id = conversion_detail.get(ConversionDetailEntities.FROM_TOKEN.value) \
+                                            .get(TokenEntities.ROW_ID.value)
+                conversion_transaction = self.create_conversion_transaction(conversion_id=conversion_row_id,
+                                                                            created_by=created_by)
+                conversion_transaction_row_id = conversion_transaction.get(TransactionConversionEntities.ROW_ID.value)
+                transaction_amount = conversion_detail.get(ConversionDetailEntities.CONVERSION.value, {}) \
+                                                      .get(ConversionEntities.DEPOSIT_AMOUNT.value)
+            else:
+                token_id = conversion_detail.get(ConversionDetailEntities.TO_TOKEN.value) \
+                                            .get(TokenEntities.ROW_ID.value)
+                conversion_transaction_row_id = transaction[0].get(TransactionEntities.CONVERSION_TRANSACTION_ID.value)
+                transaction_amount = conversion_detail.get(ConversionDetailEntities.CONVERSION.value, {}) \
+                                                      .get(ConversionEntities.CLAIM_AMOUNT.value)
+
+            if transaction_amount is None:
+                raise BadRequestException(error_code=ErrorCode.UNSUPPORTED_CHAIN_ID.value,
+                                          error_details=ErrorDetails[ErrorCode.UNSUPPORTED_CHAIN_ID.value].value)
+
+            transaction = self.create_transaction(conversion_transaction_id=conversion_transaction_row_id,
+                                                  token_id=token_id,
+                                                  transaction_visibility=TransactionVisibility.EXTERNAL.value,
+                                                  transaction_operation=transaction_operation,
+                                                  transaction_hash=transaction_hash,
+                                                  transaction_amount=transaction_amount, confirmation=0,
+                                                  status=TransactionStatus.WAITING_FOR_CONFIRMATION.value,
+                                                  created_by=created_by)
+            self.update_conversion_status(conversion_id=conversion_id, status=ConversionStatus.PROCESSING.value)
 
         return transaction
 
@@ -583,6 +580,7 @@ class ConversionService:
         logger.info(f"Updating the transaction of tx_id={tx_id}, tx_operation={tx_operation}, "
                     f"tx_visibility={tx_visibility}, tx_amount={tx_amount}, confirmation={confirmation}, "
                     f"tx_status={tx_status}, created_by={created_by}")
+        self.clear_conversion_complete_detail_cache()
         self.conversion_repo.update_transaction_by_id(tx_id=tx_id, tx_operation=tx_operation,
                                                       tx_visibility=tx_visibility, tx_amount=tx_amount,
                                                       confirmation=confirmation, tx_status=tx_status,
@@ -638,6 +636,48 @@ class ConversionService:
         logger.info(f"Getting the conversion count by status for the address={address}")
         return self.conversion_repo.get_conversion_count_by_status(address=address)
 
+    def rebuild_address_status_count(self):
+        logger.info("Rebuilding the conversion count by status for every address")
+        self.conversion_repo.rebuild_address_status_count()
+
+    def rebuild_token_pair_liquidity(self):
+        logger.info("Rebuilding the locked and frozen liquidity of every token pair")
+        self.conversion_repo.rebuild_token_pair_liquidity()
+
+    def refresh_conversion_daily_stats(self):
+        watermark = self.conversion_repo.get_conversion_daily_stats_watermark()
+        if watermark is None:
+            logger.info("No conversion daily stats found, backfilling the whole conversion history")
+            self.backfill_conversion_daily_stats()
+            return
+
+        updated_since = watermark - timedelta(minutes=CONVERSION_DAILY_STATS["WATERMARK_OVERLAP_MINUTES"])
+        days = self.conversion_repo.get_conversion_days_updated_since(updated_at=updated_since)
+        logger.info(f"Refreshing the conversion daily stats of days={[str(day) for day in days]} having conversions "
+                    f"updated since {updated_since}")
+        for day in days:
+            self.conversion_repo.refresh_conversion_daily_stats(start_date=day, end_date=day)
+
+    def backfill_conversion_daily_stats(self, start_date=None, end_date=None):
+        if start_date:
+            start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+        else:
+            first_conversion_created_at = self.conversion_repo.get_first_conversion_created_at()
+            if first_conversion_created_at is None:
+                logger.info("No conversions found to backfill the conversion daily stats")
+                return
+            start_date = first_conversion_created_at.date()
+
+        end_date = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else datetime_in_utcnow().date()
+
+        # Every batch of days is rebuilt in its own transaction
+        batch_days = CONVERSION_DAILY_STATS["BACKFILL_DAYS_PER_BATCH"]
+        while start_date <= end_date:
+            batch_end_date = min(start_date + timedelta(days=batch_days - 1), end_date)
+            logger.info(f"Backfilling the conversion daily stats from {start_date} to {batch_end_date}")
+            self.conversion_repo.refresh_conversion_daily_stats(start_date=start_date, end_date=batch_end_date)
+            start_date = batch_end_date + timedelta(days=1)
+
     def get_liquidity_balance_data(self, token_pair_id: str):
         logger.info(f"Retrieving liquidity balance for token_pair_id {token_pair_id}")
 
@@ -665,35 +705,54 @@ class ConversionService:
 
         return data
 
-    def expire_conversion(self):
+    def expire_conversion(self, watermark=None):
+        start_time = time.monotonic()
         current_datetime = datetime_in_utcnow()
-        cardano_expire_datetime = relative_date(date_time=current_datetime, hours=EXPIRE_CONVERSION.get("CARDANO", 0))
-        ethereum_expire_datetime = relative_date(date_time=current_datetime, hours=EXPIRE_CONVERSION.get("ETHEREUM", 0))
-        binance_expire_datetime = relative_date(date_time=current_datetime, hours=EXPIRE_CONVERSION.get("BINANCE", 0))
-        print(f"Expiring the conversion of ethereum, cardano and binance which is less than or equal to "
-              f"{ethereum_expire_datetime}, {cardano_expire_datetime} or {binance_expire_datetime} respectively ")
-        conversions = self.conversion_repo.get_expiring_conversion(
-            ethereum_expire_datetime=ethereum_expire_datetime,
-            cardano_expire_datetime=cardano_expire_datetime,
-            binance_expire_datetime=binance_expire_datetime)
-        conversion_ids = get_expiring_conversion_response(get_response_from_entities(conversions))
-        print(f"Expiring conversions total={len(conversion_ids)} conversion_ids={conversion_ids}")
-        self.conversion_repo.set_conversions_to_expire(conversion_ids=conversion_ids)
+        blockchain_row_ids = self.conversion_repo.get_blockchain_row_ids_by_name()
+        expire_datetime_by_blockchain = {
+            blockchain_row_ids[blockchain_name.lower()]: relative_date(date_time=current_datetime, hours=hours)
+            for blockchain_name, hours in EXPIRE_CONVERSION.items() if blockchain_name.lower() in blockchain_row_ids}
+        logger.info(f"Expiring the conversions created on or before {expire_datetime_by_blockchain} per source "
+                    f"blockchain, resuming after watermark={watermark}")
+
+        chunk_size = EXPIRE_CONVERSION_SWEEP["CHUNK_SIZE"]
+        total_expired = 0
+        completed = not expire_datetime_by_blockchain
+        self.clear_conversion_complete_detail_cache()
+        while not completed:
+            expired, watermark = self.conversion_repo.expire_conversions_chunk(
+                expire_datetime_by_blockchain=expire_datetime_by_blockchain, watermark=watermark,
+                chunk_size=chunk_size)
+            total_expired += expired
+            logger.info(f"Expired conversions chunk rows={expired} watermark={watermark}")
+            completed = expired < chunk_size
+            if not completed and time.monotonic() - start_time > EXPIRE_CONVERSION_SWEEP["MAX_DURATION_SECONDS"]:
+                logger.info(f"Expiry sweep stopped on the duration limit, resume with watermark={watermark}")
+                break
+
+        self.conversion_repo.delete_expired_frozen_liquidity()
+        self.event_ledger_service.delete_expired_events()
+        duration = time.monotonic() - start_time
+        logger.info(f"Expired conversions total={total_expired} completed={completed} duration={duration:.2f}s")
+        return {"expired": total_expired, "completed": completed, "watermark": watermark}
 
     def generate_conversion_report(self):
+        self.refresh_conversion_daily_stats()
+
         current_date = datetime_in_utcnow().date()
-        previous_date_str = datetime_to_str(relative_date(current_date, days=1))
+        previous_date = relative_date(current_date, days=1)
 
         # Generate report only for previous date
-        self.__generate_conversion_report(start_date=previous_date_str, end_date=previous_date_str)
+        self.__generate_conversion_report(start_date=previous_date, end_date=previous_date)
 
         # Generate report till previous date
-        self.__generate_conversion_report(start_date=None, end_date=previous_date_str)
+        self.__generate_conversion_report(start_date=None, end_date=previous_date)
 
     def __generate_conversion_report(self, start_date, end_date):
         logger.info(f"Getting the conversion report from start_date={start_date} and end_date={end_date}")
         report = self.conversion_repo.generate_conversion_report(start_date=start_date, end_date=end_date)
         logger.info(json.dumps(report))
-        formatted_content = get_formatted_conversion_status_report(start_date=start_date, end_date=end_date,
-                                                                   report=report)
+        formatted_content = get_formatted_conversion_status_report(
+            start_date=datetime_to_str(start_date) if start_date else None, end_date=datetime_to_str(end_date),
+            report=report)
         Utils().report_slack(slack_msg=formatted_content, SLACK_HOOK=CONVERTER_REPORTING_SLACK_HOOK)
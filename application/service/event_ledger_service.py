@@ -0,0 +1,30 @@
+from common.logger import get_logger
+from config import EVENT_LEDGER
+from constants.status import ConsumerEventOutcome
+from infrastructure.repositories.event_ledger_repository import EventLedgerRepository
+from utils.general import datetime_in_utcnow, relative_date
+
+logger = get_logger(__name__)
+
+
+class EventLedgerService:
+
+    def __init__(self):
+        self.event_ledger_repo = EventLedgerRepository()
+
+    def is_event_completed(self, blockchain_name, tx_hash, event_type):
+        return self.event_ledger_repo.has_event_outcome(blockchain_name=blockchain_name.lower(),
+                                                        transaction_hash=tx_hash, event_type=event_type,
+                                                        outcome=ConsumerEventOutcome.COMPLETED.value)
+
+    def record_event_completed(self, blockchain_name, tx_hash, event_type):
+        logger.info(f"Recording the event completed for blockchain_name={blockchain_name}, tx_hash={tx_hash}, "
+                    f"event_type={event_type}")
+        self.event_ledger_repo.record_event_outcome(blockchain_name=blockchain_name.lower(),
+                                                    transaction_hash=tx_hash, event_type=event_type,
+                                                    outcome=ConsumerEventOutcome.COMPLETED.value)
+
+    def delete_expired_events(self):
+        created_before = relative_date(date_time=datetime_in_utcnow(), days=EVENT_LEDGER["RETENTION_DAYS"])
+        logger.info(f"Deleting the consumer events recorded before {created_before}")
+        self.event_ledger_repo.delete_events_created_before(created_before=created_before)
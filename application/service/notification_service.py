@@ -12,5 +12,6 @@ class NotificationService:
         SnsService.publish_message(topic=topic, message=message)
 
     @staticmethod
-    def send_message_to_queue(queue, message, message_group_id):
-        SqsService.send_message_to_queue(queue=queue, message=message, message_group_id=message_group_id)
+    def send_message_to_queue(queue, message, message_group_id, delay_seconds=None):
+        SqsService.send_message_to_queue(queue=queue, message=message, message_group_id=message_group_id,
+                                         delay_seconds=delay_seconds)
@@ -1,5 +1,9 @@
 from common.logger import get_logger
+from config import MESSAGE_GROUP_ID, MESSAGE_GROUP_ASSIGNMENT
+from constants.entity import MessagePoolEntities
+from constants.general import MessageGroupAssignmentMode
 from infrastructure.repositories.pooling_repository import PoolingRepository
+from utils.general import get_weighted_group
 
 logger = get_logger(__name__)
 
@@ -17,3 +21,16 @@ class PoolingService:
     def update_message_pool(self, id):
         logger.info(f"Updating the message pool id={id}")
         self.pooling_repo.update_message_pool(id=id)
+
+    def get_message_group_id(self, conversion_id):
+        # Returns the message group id and the id of the pool row to mark as used once the message is sent
+        if MESSAGE_GROUP_ASSIGNMENT["MODE"] == MessageGroupAssignmentMode.HASH.value:
+            message_group_id = get_weighted_group(key=conversion_id, weighted_groups=MESSAGE_GROUP_ASSIGNMENT["GROUPS"])
+            logger.info(f"Message group id={message_group_id} assigned by hash to conversion_id={conversion_id}")
+            return message_group_id if message_group_id is not None else MESSAGE_GROUP_ID, None
+
+        message_group = self.get_message_group_pool()
+        if message_group:
+            return message_group.get(MessagePoolEntities.MESSAGE_GROUP_ID.value), \
+                message_group.get(MessagePoolEntities.ID.value)
+        return MESSAGE_GROUP_ID, None
@@ -0,0 +1,72 @@
+import time
+
+from common.logger import get_logger
+from common.utils import Utils
+from config import PENDING_SUBMISSION, SLACK_HOOK
+from constants.status import PendingSubmissionStatus
+from infrastructure.repositories.submission_repository import SubmissionRepository
+from utils.blockchain import is_transaction_hash_present
+from utils.cardano_blockchain import CardanoBlockchainUtil
+from utils.general import datetime_in_utcnow, relative_date, get_cardano_network_url_and_project_id
+
+logger = get_logger(__name__)
+
+
+class SubmissionService:
+
+    def __init__(self):
+        self.submission_repo = SubmissionRepository()
+
+    def track_submission(self, transaction_hash, chain_id):
+        logger.info(f"Tracking the submitted transaction_hash={transaction_hash} on chain_id={chain_id}")
+        self.submission_repo.create_pending_submission(transaction_hash=transaction_hash, chain_id=chain_id,
+                                                       status=PendingSubmissionStatus.PENDING.value)
+
+    def check_pending_submissions(self):
+        submissions = self.submission_repo.get_submissions_by_status(status=PendingSubmissionStatus.PENDING.value,
+                                                                     limit=PENDING_SUBMISSION["BATCH_SIZE"])
+        missing_before = relative_date(date_time=datetime_in_utcnow(), hours=PENDING_SUBMISSION["MISSING_AFTER_HOURS"])
+        logger.info(f"Checking the pending submissions={len(submissions)}, missing when created before "
+                    f"{missing_before}")
+
+        deadline = time.monotonic() + PENDING_SUBMISSION["MAX_RUN_SECONDS"]
+        cardano_blockchains = dict()
+        checked = 0
+        present_row_ids = []
+        missing_submissions = []
+        for submission in submissions:
+            # Runs must not overlap, a second run would report the same submissions missing again
+            if time.monotonic() >= deadline:
+                logger.info(f"Stopping the check after {checked} submissions, the rest is left to the next run")
+                break
+            checked += 1
+
+            if submission.chain_id not in cardano_blockchains:
+                url, project_id = get_cardano_network_url_and_project_id(chain_id=submission.chain_id)
+                cardano_blockchains[submission.chain_id] = CardanoBlockchainUtil(project_id=project_id, base_url=url)
+
+            try:
+                present = is_transaction_hash_present(cardano_blockchain=cardano_blockchains[submission.chain_id],
+                                                      tx_hash=submission.transaction_hash)
+            except Exception as e:
+                # Not known either way, the submission stays pending until the chain can be read
+                logger.info(f"Unable to check the transaction_hash={submission.transaction_hash}, error={e}")
+                continue
+
+            if present:
+                present_row_ids.append(submission.row_id)
+            elif submission.created_at <= missing_before:
+                missing_submissions.append(submission)
+
+        if present_row_ids:
+            self.submission_repo.delete_submissions(row_ids=present_row_ids)
+        if missing_submissions:
+            self.submission_repo.update_submissions_status(
+                row_ids=[submission.row_id for submission in missing_submissions],
+                status=PendingSubmissionStatus.MISSING.value)
+            transaction_hashes = [submission.transaction_hash for submission in missing_submissions]
+            Utils().report_slack(slack_msg=f"```Submitted transactions not found on chain after "
+                                           f"{PENDING_SUBMISSION['MISSING_AFTER_HOURS']} hour(s) "
+                                           f"transaction_hashes={transaction_hashes}```", SLACK_HOOK=SLACK_HOOK)
+
+        return {"checked": checked, "present": len(present_row_ids), "missing": len(missing_submissions)}
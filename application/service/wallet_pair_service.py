@@ -2,16 +2,22 @@ from application.service.wallet_pair_response import get_wallet_pair_by_addresse
     create_wallet_pair_response, get_wallet_pair_detail_by_deposit_address_response, \
     get_wallet_pair_by_conversion_id_response, get_all_deposit_address_response, \
     get_wallets_address_by_ethereum_address_response
+
 from common.logger import get_logger
+from config import DEPOSIT_ADDRESS_CACHE
 from constants.entity import TokenPairEntities, BlockchainEntities, TokenEntities, WalletPairEntities, \
     CardanoAPIEntities
 from infrastructure.repositories.wallet_pair_repository import WalletPairRepository
 from utils.blockchain import get_deposit_address_details
-from utils.general import get_response_from_entities
+from utils.cache import LRUCache
 from utils.signature import create_signature_metadata
 
 logger = get_logger(__name__)
 
+# A deposit address maps to the same wallet pair for its whole life, only unknown addresses need to expire
+deposit_address_cache = LRUCache(name="deposit_address", max_size=DEPOSIT_ADDRESS_CACHE["MAX_SIZE"],
+                                 negative_ttl_seconds=DEPOSIT_ADDRESS_CACHE["NEGATIVE_TTL_SECONDS"])
+
 
 class WalletPairService:
 
@@ -38,33 +44,63 @@ class WalletPairService:
 
         wallet_pair = self.get_wallet_pair_by_addresses(from_address=from_address, to_address=to_address,
                                                         token_pair_id=token_pair_row_id)
-
-        # persist only when it's not present
-        if wallet_pair is None:
-            from_blockchain_name = token_pair.get(TokenPairEntities.FROM_TOKEN.value, {}) \
-                                             .get(TokenEntities.BLOCKCHAIN.value, {}) \
-                                             .get(BlockchainEntities.NAME.value, None)
-            token_name = token_pair.get(TokenPairEntities.FROM_TOKEN.value, {}) \
-                                   .get(TokenEntities.SYMBOL.value, None)
-
-            signature_metadata = create_signature_metadata(token_pair_id=token_pair_id, amount=amount,
-                                                           from_address=from_address, to_address=to_address,
-                                                           block_number=block_number)
-            deposit_address_details = get_deposit_address_details(blockchain_name=from_blockchain_name,
-                                                                  token_name=token_name)
-            wallet_pair = self.create_wallet_pair(
-                from_address=from_address, to_address=to_address,
-                token_pair_id=token_pair_row_id,
-                signature=signature, signature_expiry=None,
-                signature_metadata=signature_metadata,
-                deposit_address=deposit_address_details.get(CardanoAPIEntities.DERIVED_ADDRESS.value),
-                deposit_address_detail=deposit_address_details)
-        return wallet_pair
+        if wallet_pair is not None:
+            return wallet_pair
+
+        from_blockchain_name = token_pair.get(TokenPairEntities.FROM_TOKEN.value, {}) \
+                                         .get(TokenEntities.BLOCKCHAIN.value, {}) \
+                                         .get(BlockchainEntities.NAME.value, None)
+        token_name = token_pair.get(TokenPairEntities.FROM_TOKEN.value, {}) \
+                               .get(TokenEntities.SYMBOL.value, None)
+        signature_metadata = create_signature_metadata(token_pair_id=token_pair_id, amount=amount,
+                                                       from_address=from_address, to_address=to_address,
+                                                       block_number=block_number)
+
+        # Derived before the insert so no transaction is held open over the cardano service call, a concurrent
+        # request that loses the insert reads the committed wallet pair and its address instead
+        deposit_address_details = get_deposit_address_details(blockchain_name=from_blockchain_name,
+                                                              token_name=token_name)
+        deposit_address = deposit_address_details.get(CardanoAPIEntities.DERIVED_ADDRESS.value) \
+            if deposit_address_details else None
+
+        wallet_pair, _ = self.wallet_pair_repo.get_or_create_wallet_pair(
+            from_address=from_address, to_address=to_address, token_pair_id=token_pair_row_id,
+            signature=signature, signature_expiry=None, signature_metadata=signature_metadata,
+            deposit_address=deposit_address, deposit_address_detail=deposit_address_details)
+
+        if wallet_pair.deposit_address:
+            deposit_address_cache.set(wallet_pair.deposit_address,
+                                      get_wallet_pair_detail_by_deposit_address_response(wallet_pair.to_dict()))
+        return create_wallet_pair_response(wallet_pair.to_dict())
 
     def get_wallet_pair_by_deposit_address(self, deposit_address):
         logger.info(f"Getting the wallet pair detail for the deposit_address ={deposit_address}")
-        wallet_pair = self.wallet_pair_repo.get_wallet_pair_by_deposit_address(deposit_address=deposit_address)
-        return get_wallet_pair_detail_by_deposit_address_response(wallet_pair.to_dict()) if wallet_pair else None
+        if not deposit_address_cache.warmed:
+            self.warm_deposit_address_cache()
+
+        found, wallet_pair = deposit_address_cache.get(deposit_address)
+        if not found:
+            wallet_pair = self.wallet_pair_repo.get_wallet_pair_by_deposit_address(deposit_address=deposit_address)
+            if wallet_pair is None:
+                deposit_address_cache.set_missing(deposit_address)
+                return None
+
+            wallet_pair = get_wallet_pair_detail_by_deposit_address_response(wallet_pair.to_dict())
+            deposit_address_cache.set(deposit_address, wallet_pair)
+
+        return dict(wallet_pair)
+
+    def warm_deposit_address_cache(self):
+        wallet_pairs = self.wallet_pair_repo.get_all_deposit_address()
+        self.cache_deposit_addresses(wallet_pairs)
+        deposit_address_cache.set_warmed()
+        logger.info(f"Warmed the deposit address cache, cache stats={deposit_address_cache.stats()}")
+
+    @staticmethod
+    def cache_deposit_addresses(wallet_pairs):
+        for wallet_pair in wallet_pairs:
+            deposit_address_cache.set(wallet_pair.deposit_address,
+                                      get_wallet_pair_detail_by_deposit_address_response(wallet_pair._mapping))
 
     def get_wallet_pair_by_conversion_id(self, conversion_id):
         logger.info(f"Getting the wallet pair detail for the conversion id ={conversion_id}")
@@ -74,7 +110,9 @@ class WalletPairService:
     def get_all_deposit_address(self):
         logger.info("Getting all the deposit address")
         addresses = self.wallet_pair_repo.get_all_deposit_address()
-        address_data = get_response_from_entities(addresses)
+        self.cache_deposit_addresses(addresses)
+        deposit_address_cache.set_warmed()
+        address_data = [address._mapping for address in addresses]
         logger.info(f"Total addresses we are going to listen={len(address_data)}")
         return get_all_deposit_address_response(address_data)
 
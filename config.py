@@ -7,6 +7,14 @@ NETWORK = {
         "DB_NAME": "converter_unittest_db",
         "DB_PORT": 3306,
         "DB_LOGGING": True,
+        "DB_REPLICA_HOST": "",
+        "DB_REPLICA_LAG_SECONDS": 1,
+        "DB_POOL_MODE": "queue",
+        "DB_POOL_SIZE": 1,
+        "DB_MAX_OVERFLOW": 1,
+        "DB_POOL_TIMEOUT": 10,
+        "DB_POOL_RECYCLE": 280,
+        "DB_POOL_PRE_PING": True,
     },
 }
 
@@ -100,8 +108,14 @@ QUEUE_DETAILS = {
 TOKEN_CONTRACT_PATH = {
 }
 
-MAX_RETRY = {"BLOCK_CONFIRMATION": 0, "TRANSACTION_HASH_PRESENCE": 0}
-SLEEP_TIME = {"BLOCK_CONFIRMATION": 0, "TRANSACTION_HASH_PRESENCE": 0}
+# An event short of block confirmations goes back to the event consumer queue, delayed by the missing blocks
+# times the block time, SQS caps the delay at 900 seconds
+BLOCK_CONFIRMATION_WAIT = {
+    "BLOCK_TIME_SECONDS": {"ethereum": 12, "binance": 3, "cardano": 20},
+    "MIN_DELAY_SECONDS": 10,
+    "MAX_DELAY_SECONDS": 900,
+    "MAX_ATTEMPTS": 20
+}
 
 SIGNATURE_EXPIRY_BLOCKS = {
     "CARDANO": 0,
@@ -111,9 +125,60 @@ SIGNATURE_EXPIRY_BLOCKS = {
 
 MESSAGE_GROUP_ID = ""
 
+# "least_recently_used" takes the message_group_pool row used longest ago, "hash" maps the conversion id onto
+# GROUPS by weight without any database access, every event of a conversion then lands in the same group
+MESSAGE_GROUP_ASSIGNMENT = {
+    "MODE": "least_recently_used",
+    "GROUPS": {
+        "CONVERTER_BRIDGE_1": 1,
+        "CONVERTER_BRIDGE_2": 1,
+        "CONVERTER_BRIDGE_3": 1,
+        "CONVERTER_BRIDGE_4": 1
+    }
+}
+
 # In Hours
 EXPIRE_CONVERSION = {
     "CARDANO": 0,
     "ETHEREUM": 0,
     "BINANCE": 0
 }
+
+# Every chunk is expired in its own transaction, the duration stays below the lambda timeout
+EXPIRE_CONVERSION_SWEEP = {
+    "CHUNK_SIZE": 500,
+    "MAX_DURATION_SECONDS": 240
+}
+
+# Token pairs and blockchains cached in memory across warm invocations, 0 disables the cache. They are changed
+# outside the service, a change is seen once the cached entry expires
+REFERENCE_DATA_CACHE = {
+    "TTL_SECONDS": 300
+}
+
+# Wallet pairs by deposit address, unknown addresses are remembered for NEGATIVE_TTL_SECONDS
+DEPOSIT_ADDRESS_CACHE = {
+    "MAX_SIZE": 10000,
+    "NEGATIVE_TTL_SECONDS": 60
+}
+
+# Cardano service submissions are checked on chain by a scheduled job, a hash still absent after
+# MISSING_AFTER_HOURS is reported and no longer checked. A run stops checking after MAX_RUN_SECONDS so it
+# finishes before the next one is scheduled
+PENDING_SUBMISSION = {
+    "BATCH_SIZE": 500,
+    "MISSING_AFTER_HOURS": 1,
+    "MAX_RUN_SECONDS": 40
+}
+
+# Completed consumer events are kept past the event consumer dead letter queue retention of 7 days, a message
+# redriven from it is still recognised as already processed
+EVENT_LEDGER = {
+    "RETENTION_DAYS": 14
+}
+
+CONVERSION_DAILY_STATS = {
+    # Conversions committed late can carry an updated_at older than the last refresh
+    "WATERMARK_OVERLAP_MINUTES": 10,
+    "BACKFILL_DAYS_PER_BATCH": 30
+}
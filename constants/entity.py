@@ -175,11 +175,13 @@ class PaginationEntity(Enum):
     LIMIT = "limit"
     TOTAL_RECORDS = "total_records"
     PAGE_COUNT = "page_count"
+    NEXT_CURSOR = "next_cursor"
 
 
 class EventConsumerEntity(Enum):
     BLOCKCHAIN_NAME = "blockchain_name"
     BLOCKCHAIN_EVENT = "blockchain_event"
+    BLOCK_CONFIRMATION_ATTEMPT = "block_confirmation_attempt"
 
 
 class CardanoEventConsumer(Enum):
@@ -295,6 +297,7 @@ class SQSEntities(Enum):
     QUEUE_URL = "QueueUrl"
     MESSAGE_BODY = "MessageBody"
     MESSAGE_GROUP_ID = "MessageGroupId"
+    DELAY_SECONDS = "DelaySeconds"
 
 
 class ConversionReportingEntities(Enum):
@@ -37,22 +37,28 @@ class SignatureTypeEntities(Enum):
     CONVERSION_OUT = "__conversionOut"
 
 
-class MaxRetryEntities(Enum):
-    BLOCK_CONFIRMATION = "BLOCK_CONFIRMATION"
-    TRANSACTION_HASH_PRESENCE = "TRANSACTION_HASH_PRESENCE"
-
-
-class SleepTimeEntities(Enum):
-    BLOCK_CONFIRMATION = "BLOCK_CONFIRMATION"
-    TRANSACTION_HASH_PRESENCE = "TRANSACTION_HASH_PRESENCE"
-
-
 class ConversionHistoryOrder(Enum):
     STATUS = "STATUS"
     DATE = "DATE"
     DEFAULT = STATUS
 
 
+class WalletPairAddressSide(Enum):
+    FROM = "FROM"
+    TO = "TO"
+
+
+class MessageGroupAssignmentMode(Enum):
+    LEAST_RECENTLY_USED = "least_recently_used"
+    HASH = "hash"
+
+
+class DatabasePoolMode(Enum):
+    QUEUE = "queue"
+    # Connections are pooled by an external proxy, every checkout opens a fresh connection to it
+    NULL = "null"
+
+
 SIGNATURE_TYPES = [SignatureTypeEntities.CONVERSION_IN.value, SignatureTypeEntities.CONVERSION_OUT.value]
 
 ENV_CONVERTER_SIGNER_PRIVATE_KEY_PATH = {
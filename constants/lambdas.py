@@ -25,3 +25,12 @@ class PaginationDefaults(Enum):
     PAGE_SIZE = 15
     PAGE_NUMBER = 1
     ASC = 'ASC'
+
+
+class SQSBatchParamType(Enum):
+    RECORDS = "Records"
+    MESSAGE_ID = "messageId"
+    ATTRIBUTES = "attributes"
+    MESSAGE_GROUP_ID = "MessageGroupId"
+    BATCH_ITEM_FAILURES = "batchItemFailures"
+    ITEM_IDENTIFIER = "itemIdentifier"
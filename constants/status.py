@@ -11,6 +11,25 @@ class ConversionStatus(Enum):
     CANCELED = "CANCELED"
 
 
+# Position of the conversion status on the conversion history ordered by status
+CONVERSION_STATUS_RANK = {ConversionStatus.WAITING_FOR_CLAIM.value: 1,
+                          ConversionStatus.USER_INITIATED.value: 2,
+                          ConversionStatus.CLAIM_INITIATED.value: 3,
+                          ConversionStatus.PROCESSING.value: 4,
+                          ConversionStatus.SUCCESS.value: 5,
+                          ConversionStatus.EXPIRED.value: 6,
+                          ConversionStatus.CANCELED.value: 7}
+DEFAULT_CONVERSION_STATUS_RANK = 8
+
+# Claim amount of these conversions is locked on the liquidity of their token pair
+LIQUIDITY_LOCKED_CONVERSION_STATUSES = [ConversionStatus.PROCESSING.value,
+                                        ConversionStatus.WAITING_FOR_CLAIM.value,
+                                        ConversionStatus.CLAIM_INITIATED.value]
+# Claim amount of a user initiated conversion stays frozen for a few minutes after it is created
+LIQUIDITY_FROZEN_CONVERSION_STATUS = ConversionStatus.USER_INITIATED.value
+LIQUIDITY_FROZEN_MINUTES = 5
+
+
 class ConversionTransactionStatus(Enum):
     FAILED = "FAILED"
     SUCCESS = "SUCCESS"
@@ -53,6 +72,15 @@ class TransactionStatus(Enum):
     SUCCESS = "SUCCESS"
 
 
+class PendingSubmissionStatus(Enum):
+    PENDING = "PENDING"
+    MISSING = "MISSING"
+
+
+class ConsumerEventOutcome(Enum):
+    COMPLETED = "COMPLETED"
+
+
 ALLOWED_CONVERTER_BRIDGE_TX_OPERATIONS = [TransactionOperation.TOKEN_BURNT.value,
                                           TransactionOperation.TOKEN_MINTED.value,
                                           TransactionOperation.TOKEN_TRANSFERRED.value]
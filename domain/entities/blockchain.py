@@ -1,10 +1,15 @@
 from datetime import date
 
 from constants.entity import BlockchainEntities
-from utils.general import datetime_to_str
+from domain.entities.fields import DatetimeField
 
 
 class Blockchain:
+    __slots__ = ("id", "name", "description", "symbol", "logo", "chain_id", "block_confirmation",
+                 "is_extension_available", "created_by", "_created_at", "_updated_at")
+    created_at = DatetimeField()
+    updated_at = DatetimeField()
+
     def __init__(self, id: str, name: str, description: str, symbol: str, logo: str, chain_id: int,
                  block_confirmation: int, is_extension_available: bool, created_by: str, created_at: date,
                  updated_at: date):
@@ -17,8 +22,8 @@ class Blockchain:
         self.block_confirmation = block_confirmation
         self.is_extension_available = is_extension_available
         self.created_by = created_by
-        self.created_at = datetime_to_str(created_at)
-        self.updated_at = datetime_to_str(updated_at)
+        self.created_at = created_at
+        self.updated_at = updated_at
 
     def to_dict(self):
         return {
@@ -2,24 +2,32 @@ from datetime import date
 from decimal import Decimal
 
 from constants.entity import ConversionEntities
-from utils.general import datetime_to_str
+from domain.entities.fields import DatetimeField, DecimalField
 
 
 class Conversion:
+    __slots__ = ("row_id", "id", "wallet_pair_id", "_deposit_amount", "_claim_amount", "_fee_amount", "status",
+                 "claim_signature", "created_by", "_created_at", "_updated_at")
+    created_at = DatetimeField()
+    updated_at = DatetimeField()
+    deposit_amount = DecimalField()
+    claim_amount = DecimalField()
+    fee_amount = DecimalField()
+
     def __init__(self, row_id: int, id: str, wallet_pair_id: int, deposit_amount: Decimal, claim_amount: Decimal,
                  fee_amount: Decimal, status: str, claim_signature: str, created_by: str, created_at: date,
                  updated_at: date):
         self.row_id = int(row_id)
         self.id = id
         self.wallet_pair_id = int(wallet_pair_id)
-        self.deposit_amount = str(deposit_amount.normalize())
-        self.claim_amount = str(claim_amount.normalize())
-        self.fee_amount = str(fee_amount.normalize())
+        self.deposit_amount = deposit_amount
+        self.claim_amount = claim_amount
+        self.fee_amount = fee_amount
         self.status = status
         self.claim_signature = claim_signature
         self.created_by = created_by
-        self.created_at = datetime_to_str(created_at)
-        self.updated_at = datetime_to_str(updated_at)
+        self.created_at = created_at
+        self.updated_at = updated_at
 
     def to_dict(self):
         return {
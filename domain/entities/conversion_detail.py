@@ -9,13 +9,17 @@ from utils.general import get_response_from_entities
 
 
 class ConversionDetail:
+    __slots__ = ("conversion_obj", "wallet_pair_obj", "from_token_obj", "to_token_obj", "token_pair_obj",
+                 "transaction_objs")
+
     def __init__(self, conversion_obj: Conversion, wallet_pair_obj: WalletPair, from_token_obj: Token,
-                 to_token_obj: Token, token_pair_obj: Token):
+                 to_token_obj: Token, token_pair_obj: Token, transaction_objs: List[Transaction] = None):
         self.conversion_obj = conversion_obj
         self.wallet_pair_obj = wallet_pair_obj
         self.from_token_obj = from_token_obj
         self.to_token_obj = to_token_obj
         self.token_pair_obj = token_pair_obj
+        self.transaction_objs = transaction_objs
 
     def to_dict(self):
         conversion = {} if self.conversion_obj is None else self.conversion_obj.to_dict()
@@ -23,10 +27,14 @@ class ConversionDetail:
         from_token = {} if self.from_token_obj is None else self.from_token_obj.to_dict()
         to_token = {} if self.to_token_obj is None else self.to_token_obj.to_dict()
         token_pair = {} if self.token_pair_obj is None else self.token_pair_obj.to_dict()
-        return {
+        conversion_detail = {
             ConversionDetailEntities.CONVERSION.value: conversion,
             ConversionDetailEntities.WALLET_PAIR.value: wallet_pair,
             ConversionDetailEntities.FROM_TOKEN.value: from_token,
             ConversionDetailEntities.TO_TOKEN.value: to_token,
             ConversionDetailEntities.TOKEN_PAIR.value: token_pair
         }
+        if self.transaction_objs is not None:
+            conversion_detail[ConversionDetailEntities.TRANSACTIONS.value] = \
+                get_response_from_entities(self.transaction_objs)
+        return conversion_detail
@@ -3,18 +3,22 @@ from decimal import Decimal
 
 from constants.entity import ConversionFeeEntities
 from domain.entities.token import Token
-from utils.general import datetime_to_str
+from domain.entities.fields import DatetimeField, DecimalField
 
 
 class ConversionFee:
+    __slots__ = ("id", "_percentage_from_source", "token_obj", "created_by", "_created_at", "_updated_at")
+    created_at = DatetimeField()
+    updated_at = DatetimeField()
+    percentage_from_source = DecimalField()
 
     def __init__(self, id: str, percentage_from_source: Decimal, token_obj: Token, created_by: str, created_at: date, updated_at: date):
         self.id = id
-        self.percentage_from_source = str(percentage_from_source.normalize())
+        self.percentage_from_source = percentage_from_source
         self.token_obj = token_obj
         self.created_by = created_by
-        self.created_at = datetime_to_str(created_at)
-        self.updated_at = datetime_to_str(updated_at)
+        self.created_at = created_at
+        self.updated_at = updated_at
 
     def to_dict(self):
         token_obj = {} if self.token_obj is None else self.token_obj.to_dict()
@@ -1,16 +1,20 @@
 from decimal import Decimal
 
 from constants.entity import ConverterBridgeEntities
+from domain.entities.fields import DecimalField
 
 
 class ConverterBridge:
+    __slots__ = ("blockchain_name", "blockchain_network_id", "conversion_id", "_tx_amount", "tx_operation",
+                 "conversion_side")
+    tx_amount = DecimalField()
 
     def __init__(self, blockchain_name: str, blockchain_network_id: int, conversion_id: str, tx_amount: Decimal,
                  tx_operation: str, conversion_side: str):
         self.blockchain_name = blockchain_name
         self.blockchain_network_id = blockchain_network_id
         self.conversion_id = conversion_id
-        self.tx_amount = str(tx_amount.normalize())
+        self.tx_amount = tx_amount
         self.tx_operation = tx_operation
         self.conversion_side = conversion_side
 
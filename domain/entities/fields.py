@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+
+from utils.general import datetime_to_str
+
+
+class FormattedField(ABC):
+    # Keeps the raw value in the "_<name>" slot and formats it only when the attribute is read
+
+    def __set_name__(self, owner, name):
+        self.slot = f"_{name}"
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return self.format(getattr(obj, self.slot))
+
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, value)
+
+    @abstractmethod
+    def format(self, value):
+        pass
+
+
+class DatetimeField(FormattedField):
+
+    def format(self, value):
+        return datetime_to_str(value)
+
+
+class OptionalDatetimeField(FormattedField):
+
+    def format(self, value):
+        return datetime_to_str(value) if value else None
+
+
+class DecimalField(FormattedField):
+
+    def format(self, value):
+        return str(value.normalize())
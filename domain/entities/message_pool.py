@@ -1,10 +1,13 @@
 from datetime import date
 
 from constants.entity import MessagePoolEntities
-from utils.general import datetime_to_str
+from domain.entities.fields import DatetimeField
 
 
 class MessagePool:
+    __slots__ = ("row_id", "id", "name", "message_group_id", "is_enabled", "created_by", "_created_at", "_updated_at")
+    created_at = DatetimeField()
+    updated_at = DatetimeField()
 
     def __init__(self, row_id: int, id: str, name: str, message_group_id: str, is_enabled: bool, created_by: str,
                  created_at: date, updated_at: date):
@@ -14,8 +17,8 @@ class MessagePool:
         self.message_group_id = message_group_id
         self.is_enabled = is_enabled
         self.created_by = created_by
-        self.created_at = datetime_to_str(created_at)
-        self.updated_at = datetime_to_str(updated_at)
+        self.created_at = created_at
+        self.updated_at = updated_at
 
     def to_dict(self):
         return {
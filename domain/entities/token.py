@@ -3,10 +3,15 @@ from datetime import date
 from constants.entity import TokenEntities
 from domain.entities.blockchain import Blockchain
 from domain.entities.trading_view import TradingView
-from utils.general import datetime_to_str
+from domain.entities.fields import DatetimeField
 
 
 class Token:
+    __slots__ = ("row_id", "id", "name", "description", "symbol", "logo", "allowed_decimal", "token_address",
+                 "contract_address", "blockchain_obj", "trading_view_obj", "created_by", "_created_at", "_updated_at")
+    created_at = DatetimeField()
+    updated_at = DatetimeField()
+
     def __init__(self, row_id: int, id_: str, name: str, description: str, symbol: str, logo: str, allowed_decimal: int,
                  token_address: str, contract_address: str, created_by: str, created_at: date, updated_at: date,
                  blockchain_obj: Blockchain, trading_view_obj: TradingView):
@@ -22,8 +27,8 @@ class Token:
         self.blockchain_obj = blockchain_obj
         self.trading_view_obj = trading_view_obj
         self.created_by = created_by
-        self.created_at = datetime_to_str(created_at)
-        self.updated_at = datetime_to_str(updated_at)
+        self.created_at = created_at
+        self.updated_at = updated_at
 
     def to_dict(self):
         blockchain = {} if self.blockchain_obj is None else self.blockchain_obj.to_dict()
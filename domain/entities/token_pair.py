@@ -4,19 +4,25 @@ from constants.entity import TokenPairEntities
 from constants.blockchain import DEFAULT_ADA_THRESHOLD
 from domain.entities.conversion_fee import ConversionFee
 from domain.entities.token import Token
-from utils.general import datetime_to_str
+from domain.entities.fields import DatetimeField, DecimalField
 from decimal import Decimal
 
 
 class TokenPair:
+    __slots__ = ("row_id", "id", "_min_value", "_max_value", "created_by", "from_token_obj", "to_token_obj",
+                 "conversion_fee_obj", "conversion_ratio", "is_liquid", "ada_threshold", "_created_at", "_updated_at")
+    created_at = DatetimeField()
+    updated_at = DatetimeField()
+    min_value = DecimalField()
+    max_value = DecimalField()
 
     def __init__(self, row_id: int, id_: str, min_value: Decimal, max_value: Decimal, created_by: str, created_at: date,
                  updated_at: date, from_token_obj: Token, to_token_obj: Token, conversion_fee_obj: ConversionFee,
                  conversion_ratio: Decimal, is_liquid: bool, ada_threshold: int):
         self.row_id = row_id
         self.id = id_
-        self.min_value = str(min_value.normalize())
-        self.max_value = str(max_value.normalize())
+        self.min_value = min_value
+        self.max_value = max_value
         self.created_by = created_by
         self.from_token_obj = from_token_obj
         self.to_token_obj = to_token_obj
@@ -24,8 +30,8 @@ class TokenPair:
         self.conversion_ratio = str(conversion_ratio) if conversion_ratio else None
         self.is_liquid = is_liquid
         self.ada_threshold = ada_threshold if ada_threshold is not None else DEFAULT_ADA_THRESHOLD
-        self.created_at = datetime_to_str(created_at)
-        self.updated_at = datetime_to_str(updated_at)
+        self.created_at = created_at
+        self.updated_at = updated_at
 
     def to_dict(self):
         from_token = {} if self.from_token_obj is None else self.from_token_obj.to_dict()
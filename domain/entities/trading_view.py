@@ -1,18 +1,21 @@
 from datetime import date
 
 from constants.entity import TradingViewEntities
-from utils.general import datetime_to_str
+from domain.entities.fields import DatetimeField
 
 
 class TradingView:
+    __slots__ = ("row_id", "id", "symbol", "alt_text", "_created_at", "_updated_at")
+    created_at = DatetimeField()
+    updated_at = DatetimeField()
 
     def __init__(self, row_id: int, id_: str, symbol: str, alt_text: str, created_at: date, updated_at: date):
         self.row_id = row_id
         self.id = id_
         self.symbol = symbol
         self.alt_text = alt_text
-        self.created_at = datetime_to_str(created_at)
-        self.updated_at = datetime_to_str(updated_at)
+        self.created_at = created_at
+        self.updated_at = updated_at
 
     def to_dict(self):
         return {
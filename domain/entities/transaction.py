@@ -4,10 +4,17 @@ from decimal import Decimal
 from constants.entity import TransactionEntities
 from domain.entities.token import Token
 from domain.entities.transaction_conversion import ConversionTransaction
-from utils.general import datetime_to_str
+from domain.entities.fields import DatetimeField, DecimalField
 
 
 class Transaction:
+    __slots__ = ("row_id", "id", "conversion_transaction_id", "token_id", "transaction_visibility",
+                 "transaction_operation", "transaction_hash", "_transaction_amount", "confirmation", "status",
+                 "created_by", "_created_at", "_updated_at", "conversion_transaction_obj", "token_obj")
+    created_at = DatetimeField()
+    updated_at = DatetimeField()
+    transaction_amount = DecimalField()
+
     def __init__(self, row_id: int, id: str, conversion_transaction_id: int, token_id: int,
                  transaction_visibility: str, transaction_operation: str, transaction_hash: str,
                  transaction_amount: Decimal, confirmation: int, status: str, created_by: str, created_at: date,
@@ -19,12 +26,12 @@ class Transaction:
         self.transaction_visibility = transaction_visibility
         self.transaction_operation = transaction_operation
         self.transaction_hash = transaction_hash
-        self.transaction_amount = str(transaction_amount.normalize())
+        self.transaction_amount = transaction_amount
         self.confirmation = confirmation
         self.status = status
         self.created_by = created_by
-        self.created_at = datetime_to_str(created_at)
-        self.updated_at = datetime_to_str(updated_at)
+        self.created_at = created_at
+        self.updated_at = updated_at
         self.conversion_transaction_obj = conversion_transaction_obj
         self.token_obj = token_obj
 
@@ -1,10 +1,13 @@
 from datetime import date
 
 from constants.entity import TransactionConversionEntities
-from utils.general import datetime_to_str
+from domain.entities.fields import DatetimeField
 
 
 class ConversionTransaction:
+    __slots__ = ("row_id", "id", "conversion_id", "status", "created_by", "_created_at", "_updated_at")
+    created_at = DatetimeField()
+    updated_at = DatetimeField()
 
     def __init__(self, row_id: int, id: str, conversion_id: int, status: str, created_by: str, created_at: date,
                  updated_at: date):
@@ -13,8 +16,8 @@ class ConversionTransaction:
         self.conversion_id = conversion_id
         self.status = status
         self.created_by = created_by
-        self.created_at = datetime_to_str(created_at)
-        self.updated_at = datetime_to_str(updated_at)
+        self.created_at = created_at
+        self.updated_at = updated_at
 
     def to_dict(self):
         return {
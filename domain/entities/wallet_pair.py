@@ -1,10 +1,16 @@
 from datetime import date
 
 from constants.entity import WalletPairEntities
-from utils.general import datetime_to_str
+from domain.entities.fields import DatetimeField, OptionalDatetimeField
 
 
 class WalletPair:
+    __slots__ = ("row_id", "id", "token_pair_id", "from_address", "to_address", "deposit_address",
+                 "deposit_address_detail", "signature", "signature_metadata", "_signature_expiry", "created_by",
+                 "_created_at", "_updated_at")
+    created_at = DatetimeField()
+    updated_at = DatetimeField()
+    signature_expiry = OptionalDatetimeField()
 
     def __init__(self, row_id: int, id: str, token_pair_id: int, from_address: str, to_address: str,
                  deposit_address: str, deposit_address_detail: dict, signature: str, signature_metadata: dict,
@@ -20,10 +26,10 @@ class WalletPair:
         self.deposit_address_detail = deposit_address_detail
         self.signature = signature
         self.signature_metadata = signature_metadata
-        self.signature_expiry = datetime_to_str(signature_expiry) if signature_expiry else None
+        self.signature_expiry = signature_expiry
         self.created_by = created_by
-        self.created_at = datetime_to_str(created_at)
-        self.updated_at = datetime_to_str(updated_at)
+        self.created_at = created_at
+        self.updated_at = updated_at
 
     def to_dict(self):
         return {
@@ -33,6 +33,13 @@ class ConversionFactory:
         return ConversionTransaction(row_id=row_id, id=id, conversion_id=conversion_id, status=status,
                                      created_by=created_by, created_at=created_at, updated_at=updated_at)
 
+    @staticmethod
+    def conversion_complete_detail(conversion, transactions):
+        conversion_detail = ConversionFactory.conversion_detail(conversion=conversion)
+        conversion_detail.transaction_objs = [ConversionFactory.transaction_detail(transaction=transaction)
+                                              for transaction in transactions]
+        return conversion_detail
+
     @staticmethod
     def conversion_detail(conversion):
         wallet_pair = conversion.wallet_pair
@@ -151,7 +158,7 @@ class ConversionFactory:
             token = conversion_status_count.token
             from_blockchain = conversion_status_count.from_blockchain
             to_blockchain = conversion_status_count.to_blockchain
-            count = conversion_status_count.count
+            count = int(conversion_status_count.count)
             status = conversion_status_count.status
             amount = str(conversion_status_count.amount)
             key = f"{token}_{from_blockchain}_{to_blockchain}"
@@ -1,11 +1,21 @@
 from sqlalchemy import Column, VARCHAR, INTEGER, ForeignKey, UniqueConstraint, DECIMAL, BOOLEAN, BIGINT, \
-    func, TEXT, TIMESTAMP, text, JSON
+    func, TEXT, TIMESTAMP, text, JSON, Index, DATE
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
+from constants.status import CONVERSION_STATUS_RANK, DEFAULT_CONVERSION_STATUS_RANK
+
 Base = declarative_base()
 
 
+def get_conversion_status_rank(status):
+    return CONVERSION_STATUS_RANK.get(status, DEFAULT_CONVERSION_STATUS_RANK)
+
+
+def default_conversion_status_rank(context):
+    return get_conversion_status_rank(context.get_current_parameters()["status"])
+
+
 class BlockChainDBModel(Base):
     __tablename__ = "blockchain"
     row_id = Column("row_id", BIGINT, primary_key=True, autoincrement=True)
@@ -126,15 +136,37 @@ class WalletPairDBModel(Base):
     __table_args__ = (UniqueConstraint(token_pair_id, from_address, to_address), {})
 
 
+class WalletPairAddressDBModel(Base):
+    __tablename__ = "wallet_pair_address"
+    row_id = Column("row_id", BIGINT, primary_key=True, autoincrement=True)
+    address = Column("address", VARCHAR(250), nullable=False)
+    wallet_pair_id = Column("wallet_pair_id", BIGINT, ForeignKey(WalletPairDBModel.row_id), nullable=False)
+    side = Column("side", VARCHAR(10), nullable=False)
+    # Copied from the wallet pair, the latest wallet pair of an address is read from the index alone
+    wallet_pair_created_at = Column("wallet_pair_created_at", TIMESTAMP, nullable=False)
+    created_at = Column("created_at", TIMESTAMP,
+                        server_default=func.current_timestamp(), nullable=False)
+    __table_args__ = (UniqueConstraint(address, wallet_pair_id, side),
+                      Index("ix_wallet_pair_address_address_created_at", address, wallet_pair_created_at,
+                            wallet_pair_id), {})
+
+
 class ConversionDBModel(Base):
     __tablename__ = "conversion"
     row_id = Column("row_id", BIGINT, primary_key=True, autoincrement=True)
     id = Column("id", VARCHAR(50), unique=True, nullable=False)
     wallet_pair_id = Column("wallet_pair_id", BIGINT, ForeignKey(WalletPairDBModel.row_id), nullable=False)
+    # Copied from the token pair of the wallet pair, so chain and token filters need no join
+    from_token_id = Column("from_token_id", BIGINT, ForeignKey(TokenDBModel.row_id), nullable=False)
+    to_token_id = Column("to_token_id", BIGINT, ForeignKey(TokenDBModel.row_id), nullable=False)
+    from_blockchain_id = Column("from_blockchain_id", BIGINT, ForeignKey(BlockChainDBModel.row_id), nullable=False)
+    to_blockchain_id = Column("to_blockchain_id", BIGINT, ForeignKey(BlockChainDBModel.row_id), nullable=False)
     deposit_amount = Column("deposit_amount", DECIMAL(64, 0), nullable=False)
     claim_amount = Column("claim_amount", DECIMAL(64, 0), nullable=False)
     fee_amount = Column("fee_amount", DECIMAL(64, 0), nullable=False)
     status = Column("status", VARCHAR(30), nullable=False)
+    # Order of the status in the history, inserts default it from the status and every update has to set both
+    status_rank = Column("status_rank", INTEGER, default=default_conversion_status_rank, nullable=False)
     claim_signature = Column("claim_signature", VARCHAR(250))
     created_by = Column("created_by", VARCHAR(50), nullable=False)
     created_at = Column("created_at", TIMESTAMP,
@@ -143,6 +175,11 @@ class ConversionDBModel(Base):
                         server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
                         nullable=False)
     wallet_pair = relationship(WalletPairDBModel, foreign_keys=[wallet_pair_id], uselist=False, lazy="select")
+    __table_args__ = (Index("ix_conversion_status_created_at", status, created_at),
+                      Index("ix_conversion_wallet_pair_id_status_rank_created_at", wallet_pair_id, status_rank,
+                            created_at.desc()),
+                      Index("ix_conversion_created_at", created_at),
+                      Index("ix_conversion_updated_at", updated_at), {})
 
 
 class ConversionTransactionDBModel(Base):
@@ -182,6 +219,7 @@ class TransactionDBModel(Base):
                         nullable=False)
     conversion_transaction = relationship(ConversionTransactionDBModel, uselist=False, lazy="select")
     token = relationship(TokenDBModel, foreign_keys=[token_id], uselist=False, lazy="select")
+    __table_args__ = (Index("ix_transaction_transaction_hash", transaction_hash), {})
 
 
 class MessageGroupPoolDBModel(Base):
@@ -198,3 +236,94 @@ class MessageGroupPoolDBModel(Base):
     updated_at = Column("updated_at", TIMESTAMP,
                         server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
                         nullable=False)
+
+
+class AddressStatusCountDBModel(Base):
+    __tablename__ = "address_status_count"
+    row_id = Column("row_id", BIGINT, primary_key=True, autoincrement=True)
+    address = Column("address", VARCHAR(250), nullable=False)
+    status = Column("status", VARCHAR(30), nullable=False)
+    conversion_count = Column("conversion_count", BIGINT, nullable=False, server_default="0")
+    created_at = Column("created_at", TIMESTAMP,
+                        server_default=func.current_timestamp(), nullable=False)
+    updated_at = Column("updated_at", TIMESTAMP,
+                        server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+                        nullable=False)
+    __table_args__ = (UniqueConstraint(address, status), {})
+
+
+class ConversionDailyStatsDBModel(Base):
+    __tablename__ = "conversion_daily_stats"
+    row_id = Column("row_id", BIGINT, primary_key=True, autoincrement=True)
+    day = Column("day", DATE, nullable=False)
+    token = Column("token", VARCHAR(30), nullable=False)
+    from_blockchain = Column("from_blockchain", VARCHAR(30), nullable=False)
+    to_blockchain = Column("to_blockchain", VARCHAR(30), nullable=False)
+    status = Column("status", VARCHAR(30), nullable=False)
+    conversion_count = Column("conversion_count", BIGINT, nullable=False, server_default="0")
+    amount = Column("amount", DECIMAL(64, 0), nullable=False, server_default="0")
+    last_conversion_updated_at = Column("last_conversion_updated_at", TIMESTAMP, nullable=False)
+    created_at = Column("created_at", TIMESTAMP,
+                        server_default=func.current_timestamp(), nullable=False)
+    updated_at = Column("updated_at", TIMESTAMP,
+                        server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+                        nullable=False)
+    __table_args__ = (UniqueConstraint(day, token, from_blockchain, to_blockchain, status),
+                      Index("ix_conversion_daily_stats_last_conversion_updated_at", last_conversion_updated_at), {})
+
+
+class TokenPairLiquidityDBModel(Base):
+    __tablename__ = "token_pair_liquidity"
+    row_id = Column("row_id", BIGINT, primary_key=True, autoincrement=True)
+    token_pair_id = Column("token_pair_id", BIGINT, ForeignKey(TokenPairDBModel.row_id), unique=True, nullable=False)
+    locked_amount = Column("locked_amount", DECIMAL(64, 0), nullable=False, server_default="0")
+    created_at = Column("created_at", TIMESTAMP,
+                        server_default=func.current_timestamp(), nullable=False)
+    updated_at = Column("updated_at", TIMESTAMP,
+                        server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+                        nullable=False)
+
+
+class TokenPairFrozenLiquidityDBModel(Base):
+    __tablename__ = "token_pair_frozen_liquidity"
+    row_id = Column("row_id", BIGINT, primary_key=True, autoincrement=True)
+    token_pair_id = Column("token_pair_id", BIGINT, ForeignKey(TokenPairDBModel.row_id), nullable=False)
+    bucket_start = Column("bucket_start", TIMESTAMP, nullable=False)
+    frozen_amount = Column("frozen_amount", DECIMAL(64, 0), nullable=False, server_default="0")
+    created_at = Column("created_at", TIMESTAMP,
+                        server_default=func.current_timestamp(), nullable=False)
+    updated_at = Column("updated_at", TIMESTAMP,
+                        server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+                        nullable=False)
+    __table_args__ = (UniqueConstraint(token_pair_id, bucket_start),
+                      Index("ix_token_pair_frozen_liquidity_bucket_start", bucket_start), {})
+
+
+class PendingSubmissionDBModel(Base):
+    __tablename__ = "pending_submission"
+    row_id = Column("row_id", BIGINT, primary_key=True, autoincrement=True)
+    transaction_hash = Column("transaction_hash", VARCHAR(250), nullable=False, unique=True)
+    chain_id = Column("chain_id", INTEGER, nullable=False)
+    status = Column("status", VARCHAR(30), nullable=False)
+    created_at = Column("created_at", TIMESTAMP,
+                        server_default=func.current_timestamp(), nullable=False)
+    updated_at = Column("updated_at", TIMESTAMP,
+                        server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+                        nullable=False)
+    __table_args__ = (Index("ix_pending_submission_status_created_at", status, created_at), {})
+
+
+class ConsumerEventLedgerDBModel(Base):
+    __tablename__ = "consumer_event_ledger"
+    row_id = Column("row_id", BIGINT, primary_key=True, autoincrement=True)
+    blockchain_name = Column("blockchain_name", VARCHAR(30), nullable=False)
+    transaction_hash = Column("transaction_hash", VARCHAR(250), nullable=False)
+    event_type = Column("event_type", VARCHAR(50), nullable=False)
+    outcome = Column("outcome", VARCHAR(30), nullable=False)
+    created_at = Column("created_at", TIMESTAMP,
+                        server_default=func.current_timestamp(), nullable=False)
+    updated_at = Column("updated_at", TIMESTAMP,
+                        server_default=text("CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+                        nullable=False)
+    __table_args__ = (UniqueConstraint(blockchain_name, transaction_hash, event_type, outcome),
+                      Index("ix_consumer_event_ledger_created_at", created_at), {})
@@ -1,9 +1,12 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.engine.url import URL
+from functools import lru_cache
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import NullPool
 
 from config import NETWORK
-from utils.database import update_in_db
+from constants.general import DatabasePoolMode
+from utils.database import update_in_db, in_read, unit_of_work, count_commit, get_read_session, read_from_primary
 
 driver = NETWORK['db']['DB_DRIVER']
 host = NETWORK['db']['DB_HOST']
@@ -12,17 +15,69 @@ db_name = NETWORK['db']["DB_NAME"]
 password = NETWORK['db']["DB_PASSWORD"]
 port = NETWORK['db']["DB_PORT"]
 db_logging = NETWORK['db']["DB_LOGGING"]
+replica_host = NETWORK['db']["DB_REPLICA_HOST"]
+db_replica_lag = NETWORK['db']["DB_REPLICA_LAG_SECONDS"]
 
 connection_string = f"{driver}://{user}:{password}@{host}:{port}/{db_name}"
-engine = create_engine(connection_string, pool_pre_ping=True, echo=db_logging)
+# Replica shares the primary credentials, reads are routed to it only when a replica host is configured
+replica_connection_string = f"{driver}://{user}:{password}@{replica_host}:{port}/{db_name}"
+
+
+def get_pool_options():
+    if NETWORK['db']["DB_POOL_MODE"] == DatabasePoolMode.NULL.value:
+        return {"poolclass": NullPool}
+
+    # A lambda container serves one invocation at a time, the pool only has to keep its connection warm between them
+    return {"pool_size": NETWORK['db']["DB_POOL_SIZE"], "max_overflow": NETWORK['db']["DB_MAX_OVERFLOW"],
+            "pool_timeout": NETWORK['db']["DB_POOL_TIMEOUT"], "pool_recycle": NETWORK['db']["DB_POOL_RECYCLE"],
+            "pool_pre_ping": NETWORK['db']["DB_POOL_PRE_PING"]}
+
+
+# Engines are built on the first session use, handlers failing before any query never load the driver
+@lru_cache(maxsize=None)
+def get_engine():
+    return create_engine(connection_string, echo=db_logging, **get_pool_options())
+
+
+# Reads outside a unit of work need no transaction, autocommit saves the COMMIT and pool reset round trips
+@lru_cache(maxsize=None)
+def get_read_engine():
+    return create_engine(connection_string, echo=db_logging, isolation_level="AUTOCOMMIT", pool_reset_on_return=None,
+                         **get_pool_options())
 
-Session = sessionmaker(bind=engine)
-default_session = Session()
+
+@lru_cache(maxsize=None)
+def get_replica_engine():
+    return create_engine(replica_connection_string, echo=db_logging, isolation_level="AUTOCOMMIT",
+                         pool_reset_on_return=None, **get_pool_options())
+
+
+Session = sessionmaker()
+ReadSession = sessionmaker()
+ReplicaSession = sessionmaker()
+event.listen(Session, "after_commit", count_commit)
+
+default_session = scoped_session(lambda: Session(bind=get_engine()))
+default_read_session = scoped_session(lambda: ReadSession(bind=get_read_engine()))
+default_replica_session = scoped_session(lambda: ReplicaSession(bind=get_replica_engine())) if replica_host else None
 
 
 class BaseRepository:
-    def __init__(self):
-        self.session = default_session
+    write_session = default_session
+    read_session = default_read_session
+    replica_session = default_replica_session
+    replica_lag = db_replica_lag
+
+    @property
+    def session(self):
+        return get_read_session() if in_read() else self.write_session
+
+    def unit_of_work(self):
+        return unit_of_work(self.write_session)
+
+    @staticmethod
+    def read_from_primary():
+        return read_from_primary()
 
     @update_in_db()
     def add_item(self, item):
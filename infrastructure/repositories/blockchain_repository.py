@@ -1,12 +1,16 @@
+from config import REFERENCE_DATA_CACHE
 from domain.factory.blockchain_factory import BlockchainFactory
 from infrastructure.models import BlockChainDBModel, TokenDBModel, TokenPairDBModel
 from infrastructure.repositories.base_repository import BaseRepository
+from utils.cache import TTLCache, cached
 from utils.database import read_from_db
 
+blockchain_cache = TTLCache(name="blockchain", ttl_seconds=REFERENCE_DATA_CACHE["TTL_SECONDS"])
+
 
 class BlockchainRepository(BaseRepository):
 
-    @read_from_db()
+    @read_from_db(replica_lag_tolerance=300)
     def get_all_blockchain(self):
         blockchains = self.session.query(BlockChainDBModel.id, BlockChainDBModel.name, BlockChainDBModel.description,
                                          BlockChainDBModel.symbol, BlockChainDBModel.logo, BlockChainDBModel.chain_id,
@@ -24,7 +28,8 @@ class BlockchainRepository(BaseRepository):
                                              updated_at=blockchain.updated_at)
                 for blockchain in blockchains]
 
-    @read_from_db()
+    @cached(blockchain_cache)
+    @read_from_db(replica_lag_tolerance=300)
     def get_blockchain(self, name):
         blockchain = self.session.query(BlockChainDBModel) \
             .filter(BlockChainDBModel.name.ilike(name)).first()
@@ -40,7 +45,7 @@ class BlockchainRepository(BaseRepository):
                                             created_by=blockchain.created_by, created_at=blockchain.created_at,
                                             updated_at=blockchain.updated_at)
 
-    @read_from_db()
+    @read_from_db(replica_lag_tolerance=300)
     def get_to_token_data_by_token_pair_id(self, token_pair_id):
         chain_data = self.session.query(
             BlockChainDBModel.name,
@@ -1,31 +1,137 @@
-from sqlalchemy import or_, case, func, and_
-from sqlalchemy.orm import joinedload, aliased
+from collections import namedtuple
+from decimal import Decimal
 
-from constants.general import CreatedBy, BlockchainName, ConversionOn, ConversionHistoryOrder
-from constants.status import ConversionStatus, ConversionTransactionStatus
+from sqlalchemy import or_, func, and_, select, union, distinct
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.orm import joinedload, aliased, contains_eager
+
+from constants.general import CreatedBy, ConversionOn, ConversionHistoryOrder
+from constants.status import ConversionStatus, ConversionTransactionStatus, LIQUIDITY_LOCKED_CONVERSION_STATUSES, \
+    LIQUIDITY_FROZEN_CONVERSION_STATUS, LIQUIDITY_FROZEN_MINUTES
 from constants.lambdas import PaginationDefaults
 from domain.factory.conversion_factory import ConversionFactory
 from infrastructure.models import ConversionDBModel, WalletPairDBModel, TokenPairDBModel, TokenDBModel, \
-    ConversionTransactionDBModel, TransactionDBModel, BlockChainDBModel
+    ConversionTransactionDBModel, TransactionDBModel, BlockChainDBModel, AddressStatusCountDBModel, \
+    ConversionDailyStatsDBModel, TokenPairLiquidityDBModel, TokenPairFrozenLiquidityDBModel, WalletPairAddressDBModel, \
+    get_conversion_status_rank
 from infrastructure.repositories.base_repository import BaseRepository
 from utils.database import read_from_db, update_in_db
 from utils.general import get_uuid, datetime_in_utcnow
 from datetime import datetime, timedelta
 
 
+# Conversion state before and after a write, old_status is None for a new conversion
+ConversionChange = namedtuple("ConversionChange", ["from_address", "to_address", "token_pair_id", "created_at",
+                                                   "old_status", "old_claim_amount", "new_status",
+                                                   "new_claim_amount"])
+
+
+def frozen_liquidity_bucket(created_at):
+    return created_at.replace(second=0, microsecond=0)
+
+
+def get_address_status_counts(conversion_changes):
+    count_deltas = dict()
+    for change in conversion_changes:
+        if change.old_status == change.new_status:
+            continue
+
+        # Same address on both sides counts the conversion once, addresses are compared case-insensitively
+        addresses = {address.lower(): address for address in [change.from_address, change.to_address]}.values()
+        for address in addresses:
+            if change.old_status:
+                count_deltas[(address, change.old_status)] = count_deltas.get((address, change.old_status), 0) - 1
+            if change.new_status:
+                count_deltas[(address, change.new_status)] = count_deltas.get((address, change.new_status), 0) + 1
+
+    # Every writer locks the counter rows in the same order, opposite status changes cannot deadlock
+    return [{"address": address, "status": status, "conversion_count": delta}
+            for (address, status), delta in sorted(count_deltas.items(),
+                                                   key=lambda item: (item[0][0].lower(), item[0][1]))
+            if delta]
+
+
 class ConversionRepository(BaseRepository):
 
-    @read_from_db()
+    def __apply_conversion_changes(self, conversion_changes):
+        self.__apply_address_status_counts(conversion_changes)
+        self.__apply_token_pair_liquidity(conversion_changes)
+
+    def __apply_address_status_counts(self, conversion_changes):
+        address_status_counts = get_address_status_counts(conversion_changes)
+        if not address_status_counts:
+            return
+
+        upsert_query = insert(AddressStatusCountDBModel).values(address_status_counts)
+        upsert_query = upsert_query.on_duplicate_key_update(
+            conversion_count=AddressStatusCountDBModel.conversion_count + upsert_query.inserted.conversion_count)
+        self.session.execute(upsert_query)
+
+    def __apply_token_pair_liquidity(self, conversion_changes):
+        locked_deltas = dict()
+        frozen_deltas = dict()
+        for change in conversion_changes:
+            bucket_key = (change.token_pair_id, frozen_liquidity_bucket(change.created_at))
+            # Amounts set by the consumer can still be strings on the ORM instance
+            old_claim_amount = Decimal(change.old_claim_amount) if change.old_status else 0
+            new_claim_amount = Decimal(change.new_claim_amount) if change.new_status else 0
+            if change.old_status in LIQUIDITY_LOCKED_CONVERSION_STATUSES:
+                locked_deltas[change.token_pair_id] = locked_deltas.get(change.token_pair_id, 0) - old_claim_amount
+            if change.new_status in LIQUIDITY_LOCKED_CONVERSION_STATUSES:
+                locked_deltas[change.token_pair_id] = locked_deltas.get(change.token_pair_id, 0) + new_claim_amount
+            if change.old_status == LIQUIDITY_FROZEN_CONVERSION_STATUS:
+                frozen_deltas[bucket_key] = frozen_deltas.get(bucket_key, 0) - old_claim_amount
+            if change.new_status == LIQUIDITY_FROZEN_CONVERSION_STATUS:
+                frozen_deltas[bucket_key] = frozen_deltas.get(bucket_key, 0) + new_claim_amount
+
+        locked_amounts = [{"token_pair_id": token_pair_id, "locked_amount": delta}
+                          for token_pair_id, delta in sorted(locked_deltas.items()) if delta]
+        if locked_amounts:
+            upsert_query = insert(TokenPairLiquidityDBModel).values(locked_amounts)
+            upsert_query = upsert_query.on_duplicate_key_update(
+                locked_amount=TokenPairLiquidityDBModel.locked_amount + upsert_query.inserted.locked_amount)
+            self.session.execute(upsert_query)
+
+        frozen_amounts = [{"token_pair_id": token_pair_id, "bucket_start": bucket_start, "frozen_amount": delta}
+                          for (token_pair_id, bucket_start), delta in sorted(frozen_deltas.items()) if delta]
+        if frozen_amounts:
+            upsert_query = insert(TokenPairFrozenLiquidityDBModel).values(frozen_amounts)
+            upsert_query = upsert_query.on_duplicate_key_update(
+                frozen_amount=TokenPairFrozenLiquidityDBModel.frozen_amount + upsert_query.inserted.frozen_amount)
+            self.session.execute(upsert_query)
+
+    @read_from_db(replica_lag_tolerance=30)
     def get_conversion_count_by_status(self, address):
-        status_counts = self.session.query(ConversionDBModel.status, func.count(ConversionDBModel.id).label("count")) \
-            .join(WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
-            .filter(or_(WalletPairDBModel.from_address == address, WalletPairDBModel.to_address == address)) \
-            .group_by(ConversionDBModel.status) \
+        status_counts = self.session.query(AddressStatusCountDBModel.status,
+                                           AddressStatusCountDBModel.conversion_count.label("count")) \
+            .filter(AddressStatusCountDBModel.address == address, AddressStatusCountDBModel.conversion_count > 0) \
             .all()
 
         return ConversionFactory.conversion_status_count(status_counts)
 
-    @read_from_db()
+    @update_in_db()
+    def rebuild_address_status_count(self):
+        from_address_conversions = select(WalletPairDBModel.from_address.label("address"),
+                                          ConversionDBModel.status.label("status"),
+                                          ConversionDBModel.row_id.label("row_id")) \
+            .join_from(ConversionDBModel, WalletPairDBModel,
+                       WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id)
+        to_address_conversions = select(WalletPairDBModel.to_address.label("address"),
+                                        ConversionDBModel.status.label("status"),
+                                        ConversionDBModel.row_id.label("row_id")) \
+            .join_from(ConversionDBModel, WalletPairDBModel,
+                       WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id)
+        # Union removes the second row of conversions having the same address on both sides
+        address_conversions = union(from_address_conversions, to_address_conversions).subquery()
+        address_status_counts = select(address_conversions.c.address, address_conversions.c.status,
+                                       func.count(address_conversions.c.row_id)) \
+            .group_by(address_conversions.c.address, address_conversions.c.status)
+
+        self.session.query(AddressStatusCountDBModel).delete()
+        self.session.execute(insert(AddressStatusCountDBModel).from_select(
+            ["address", "status", "conversion_count"], address_status_counts))
+
+    @read_from_db(replica_lag_tolerance=5)
     def get_conversion_only(self, conversion_id):
         conversion = self.session.query(ConversionDBModel.row_id, ConversionDBModel.id,
                                         ConversionDBModel.wallet_pair_id, ConversionDBModel.deposit_amount,
@@ -48,70 +154,114 @@ class ConversionRepository(BaseRepository):
                                             created_at=conversion.created_at,
                                             updated_at=conversion.updated_at)
 
-    @read_from_db()
-    def get_conversion_detail(self, conversion_id):
-        conversion_detail_query = self.session.query(ConversionDBModel) \
-            .join(WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
-            .join(TokenPairDBModel, TokenPairDBModel.row_id == WalletPairDBModel.token_pair_id) \
-            .filter(ConversionDBModel.id == conversion_id)
-
-        conversion_detail = conversion_detail_query.options(joinedload(ConversionDBModel.wallet_pair)) \
-            .options(joinedload(ConversionDBModel.wallet_pair).joinedload(WalletPairDBModel.token_pair)).first()
+    @read_from_db(replica_lag_tolerance=5)
+    def get_conversion_complete_detail(self, conversion_id):
+        # Conversion with its wallet pair, token pair, tokens and transactions in a single statement, a conversion
+        # without transactions comes back as one row having no transaction
+        conversion_transactions = self.session.query(ConversionDBModel, TransactionDBModel) \
+            .outerjoin(ConversionTransactionDBModel,
+                       and_(ConversionTransactionDBModel.conversion_id == ConversionDBModel.row_id,
+                            ConversionTransactionDBModel.status != ConversionTransactionStatus.FAILED.value)) \
+            .outerjoin(TransactionDBModel,
+                       TransactionDBModel.conversion_transaction_id == ConversionTransactionDBModel.row_id) \
+            .filter(ConversionDBModel.id == conversion_id) \
+            .order_by(TransactionDBModel.row_id, TransactionDBModel.created_at.asc()) \
+            .options(joinedload(ConversionDBModel.wallet_pair).joinedload(WalletPairDBModel.token_pair)) \
+            .options(joinedload(TransactionDBModel.token).joinedload(TokenDBModel.blockchain_detail)) \
+            .options(contains_eager(TransactionDBModel.conversion_transaction)
+                     .noload(ConversionTransactionDBModel.conversion)).all()
 
-        if conversion_detail is None:
+        if not conversion_transactions:
             return None
 
-        return ConversionFactory.conversion_detail(conversion=conversion_detail)
+        conversion = conversion_transactions[0][0]
+        transactions = [transaction for _, transaction in conversion_transactions if transaction is not None]
+        return ConversionFactory.conversion_complete_detail(conversion=conversion, transactions=transactions)
 
-    @read_from_db()
+    @read_from_db(replica_lag_tolerance=0)
     def get_processing_claim_amount_for_token_pair(self, target_token_pair_id: str):
-        statuses = [
-            ConversionStatus.PROCESSING.value,
-            ConversionStatus.WAITING_FOR_CLAIM.value,
-            ConversionStatus.CLAIM_INITIATED.value
-        ]
-
-        total_claim_amount_query = self.session.query(
-            func.sum(ConversionDBModel.claim_amount)
-        ).join(
-            WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id
-        ).join(
-            TokenPairDBModel, TokenPairDBModel.row_id == WalletPairDBModel.token_pair_id
-        ).filter(
-            ConversionDBModel.status.in_(statuses),
-            TokenPairDBModel.id == target_token_pair_id
-        )
-
-        total_claim_amount = total_claim_amount_query.scalar()
-        return int(total_claim_amount) if total_claim_amount is not None else 0
-
-    @read_from_db()
+        locked_amount = self.session.query(TokenPairLiquidityDBModel.locked_amount) \
+            .join(TokenPairDBModel, TokenPairDBModel.row_id == TokenPairLiquidityDBModel.token_pair_id) \
+            .filter(TokenPairDBModel.id == target_token_pair_id).scalar()
+
+        return int(locked_amount) if locked_amount is not None else 0
+
+    @read_from_db(replica_lag_tolerance=0)
     def get_initiated_claim_amount_for_token_pair(self, target_token_pair_id: str):
-        date_now = datetime.utcnow()
-        five_minutes_ago = date_now - timedelta(minutes=5)
-
-        total_claim_amount_query = self.session.query(
-            func.sum(ConversionDBModel.claim_amount)
-        ).join(
-            WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id
-        ).join(
-            TokenPairDBModel, TokenPairDBModel.row_id == WalletPairDBModel.token_pair_id
-        ).filter(
-            ConversionDBModel.status == ConversionStatus.USER_INITIATED.value,
-            ConversionDBModel.created_at.between(five_minutes_ago, date_now),
-            TokenPairDBModel.id == target_token_pair_id
-        )
-
-        total_claim_amount = total_claim_amount_query.scalar()
-        return int(total_claim_amount) if total_claim_amount is not None else 0
+        # Whole minute buckets may freeze the claim amount up to a minute longer than the window
+        window_start = frozen_liquidity_bucket(datetime.utcnow() - timedelta(minutes=LIQUIDITY_FROZEN_MINUTES))
+
+        frozen_amount = self.session.query(func.sum(TokenPairFrozenLiquidityDBModel.frozen_amount)) \
+            .join(TokenPairDBModel, TokenPairDBModel.row_id == TokenPairFrozenLiquidityDBModel.token_pair_id) \
+            .filter(TokenPairDBModel.id == target_token_pair_id,
+                    TokenPairFrozenLiquidityDBModel.bucket_start >= window_start).scalar()
 
+        return int(frozen_amount) if frozen_amount is not None else 0
+
+    @update_in_db()
+    def delete_expired_frozen_liquidity(self):
+        # Buckets behind the window are never read again, a late decrement on them only recreates a stale bucket
+        window_start = frozen_liquidity_bucket(datetime.utcnow() - timedelta(minutes=LIQUIDITY_FROZEN_MINUTES))
+        self.session.query(TokenPairFrozenLiquidityDBModel) \
+            .filter(TokenPairFrozenLiquidityDBModel.bucket_start < window_start) \
+            .delete(synchronize_session=False)
+
+    @update_in_db()
+    def rebuild_token_pair_liquidity(self):
+        window_start = frozen_liquidity_bucket(datetime.utcnow() - timedelta(minutes=LIQUIDITY_FROZEN_MINUTES))
+        bucket_start = func.date_format(ConversionDBModel.created_at, "%Y-%m-%d %H:%i:00")
+
+        locked_amounts = select(WalletPairDBModel.token_pair_id, func.sum(ConversionDBModel.claim_amount)) \
+            .join_from(ConversionDBModel, WalletPairDBModel,
+                       WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
+            .filter(ConversionDBModel.status.in_(LIQUIDITY_LOCKED_CONVERSION_STATUSES)) \
+            .group_by(WalletPairDBModel.token_pair_id)
+        frozen_amounts = select(WalletPairDBModel.token_pair_id, bucket_start,
+                                func.sum(ConversionDBModel.claim_amount)) \
+            .join_from(ConversionDBModel, WalletPairDBModel,
+                       WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
+            .filter(ConversionDBModel.status == LIQUIDITY_FROZEN_CONVERSION_STATUS,
+                    ConversionDBModel.created_at >= window_start) \
+            .group_by(WalletPairDBModel.token_pair_id, bucket_start)
+
+        self.session.query(TokenPairLiquidityDBModel).delete()
+        self.session.query(TokenPairFrozenLiquidityDBModel).delete()
+        self.session.execute(insert(TokenPairLiquidityDBModel).from_select(["token_pair_id", "locked_amount"],
+                                                                           locked_amounts))
+        self.session.execute(insert(TokenPairFrozenLiquidityDBModel).from_select(
+            ["token_pair_id", "bucket_start", "frozen_amount"], frozen_amounts))
+
+    @update_in_db()
     def create_conversion(self, wallet_pair_id, deposit_amount, fee_amount, claim_amount, created_by):
-        conversion_item = ConversionDBModel(id=get_uuid(), wallet_pair_id=wallet_pair_id, deposit_amount=deposit_amount,
-                                            claim_amount=claim_amount, fee_amount=fee_amount,
-                                            status=ConversionStatus.USER_INITIATED.value, claim_signature=None,
-                                            created_by=created_by, created_at=datetime_in_utcnow(),
-                                            updated_at=datetime_in_utcnow())
-        self.add_item(conversion_item)
+        from_token = aliased(TokenDBModel)
+        to_token = aliased(TokenDBModel)
+        wallet_pair = self.session.query(WalletPairDBModel.from_address, WalletPairDBModel.to_address,
+                                         WalletPairDBModel.token_pair_id, from_token.row_id.label("from_token_id"),
+                                         to_token.row_id.label("to_token_id"),
+                                         from_token.blockchain_id.label("from_blockchain_id"),
+                                         to_token.blockchain_id.label("to_blockchain_id")) \
+            .join(TokenPairDBModel, TokenPairDBModel.row_id == WalletPairDBModel.token_pair_id) \
+            .join(from_token, from_token.row_id == TokenPairDBModel.from_token_id) \
+            .join(to_token, to_token.row_id == TokenPairDBModel.to_token_id) \
+            .filter(WalletPairDBModel.row_id == wallet_pair_id).one()
+        conversion_item = ConversionDBModel(id=get_uuid(), wallet_pair_id=wallet_pair_id,
+                                            from_token_id=wallet_pair.from_token_id,
+                                            to_token_id=wallet_pair.to_token_id,
+                                            from_blockchain_id=wallet_pair.from_blockchain_id,
+                                            to_blockchain_id=wallet_pair.to_blockchain_id,
+                                            deposit_amount=deposit_amount, claim_amount=claim_amount,
+                                            fee_amount=fee_amount, status=ConversionStatus.USER_INITIATED.value,
+                                            claim_signature=None, created_by=created_by,
+                                            created_at=datetime_in_utcnow(), updated_at=datetime_in_utcnow())
+        self.__apply_conversion_changes([ConversionChange(from_address=wallet_pair.from_address,
+                                                          to_address=wallet_pair.to_address,
+                                                          token_pair_id=wallet_pair.token_pair_id,
+                                                          created_at=conversion_item.created_at, old_status=None,
+                                                          old_claim_amount=None, new_status=conversion_item.status,
+                                                          new_claim_amount=conversion_item.claim_amount)])
+        # Flushing assigns row_id, the entity is built before the commit expires the instance
+        self.session.add(conversion_item)
+        self.session.flush()
         return ConversionFactory.conversion(row_id=conversion_item.row_id, id=conversion_item.id,
                                             wallet_pair_id=conversion_item.wallet_pair_id,
                                             deposit_amount=conversion_item.deposit_amount,
@@ -123,13 +273,15 @@ class ConversionRepository(BaseRepository):
                                             created_at=conversion_item.created_at,
                                             updated_at=conversion_item.updated_at)
 
+    @update_in_db()
     def create_conversion_transaction(self, conversion_id, created_by):
         conversion_transaction_item = ConversionTransactionDBModel(id=get_uuid(), conversion_id=conversion_id,
                                                                    status=ConversionTransactionStatus.PROCESSING.value,
                                                                    created_by=created_by,
                                                                    created_at=datetime_in_utcnow(),
                                                                    updated_at=datetime_in_utcnow())
-        self.add_item(conversion_transaction_item)
+        self.session.add(conversion_transaction_item)
+        self.session.flush()
         return ConversionFactory.conversion_transaction(row_id=conversion_transaction_item.row_id,
                                                         id=conversion_transaction_item.id,
                                                         conversion_id=conversion_transaction_item.conversion_id,
@@ -138,6 +290,7 @@ class ConversionRepository(BaseRepository):
                                                         created_at=conversion_transaction_item.created_at,
                                                         updated_at=conversion_transaction_item.updated_at)
 
+    @update_in_db()
     def create_transaction(self, conversion_transaction_id, token_id, transaction_visibility,
                            transaction_operation, transaction_hash, transaction_amount, confirmation, status,
                            created_by):
@@ -150,7 +303,8 @@ class ConversionRepository(BaseRepository):
                                               transaction_hash=transaction_hash, transaction_amount=transaction_amount,
                                               confirmation=confirmation, status=status, created_by=created_by,
                                               created_at=datetime_in_utcnow(), updated_at=datetime_in_utcnow())
-        self.add_item(transaction_item)
+        self.session.add(transaction_item)
+        self.session.flush()
         return ConversionFactory.transaction(row_id=transaction_item.row_id,
                                              id=transaction_item.id,
                                              conversion_transaction_id=transaction_item.conversion_transaction_id,
@@ -166,7 +320,7 @@ class ConversionRepository(BaseRepository):
                                              updated_at=transaction_item.updated_at, conversion_transaction_obj=None,
                                              token_obj=None)
 
-    @read_from_db()
+    @read_from_db(replica_lag_tolerance=0)
     def get_latest_user_pending_conversion_request(self, wallet_pair_id, status):
         conversion = self.session.query(ConversionDBModel.row_id, ConversionDBModel.id,
                                         ConversionDBModel.wallet_pair_id, ConversionDBModel.deposit_amount,
@@ -191,15 +345,28 @@ class ConversionRepository(BaseRepository):
     @update_in_db()
     def update_conversion_status(self, conversion_id, status):
         conversion = self.session.query(ConversionDBModel) \
-            .filter(ConversionDBModel.id == conversion_id).one()
+            .options(joinedload(ConversionDBModel.wallet_pair)) \
+            .filter(ConversionDBModel.id == conversion_id) \
+            .with_for_update(of=ConversionDBModel).one()
+        self.__apply_conversion_changes([ConversionChange(from_address=conversion.wallet_pair.from_address,
+                                                          to_address=conversion.wallet_pair.to_address,
+                                                          token_pair_id=conversion.wallet_pair.token_pair_id,
+                                                          created_at=conversion.created_at,
+                                                          old_status=conversion.status,
+                                                          old_claim_amount=conversion.claim_amount, new_status=status,
+                                                          new_claim_amount=conversion.claim_amount)])
         conversion.status = status
+        conversion.status_rank = get_conversion_status_rank(status)
         conversion.updated_at = datetime_in_utcnow()
-        self.session.commit()
 
     @update_in_db()
     def update_conversion(self, conversion_id, deposit_amount, claim_amount, fee_amount, status, claim_signature):
         conversion = self.session.query(ConversionDBModel) \
-            .filter(ConversionDBModel.id == conversion_id).first()
+            .options(joinedload(ConversionDBModel.wallet_pair)) \
+            .filter(ConversionDBModel.id == conversion_id) \
+            .with_for_update(of=ConversionDBModel).first()
+        old_status = conversion.status
+        old_claim_amount = conversion.claim_amount
         if deposit_amount:
             conversion.deposit_amount = deposit_amount
         if claim_amount:
@@ -208,11 +375,19 @@ class ConversionRepository(BaseRepository):
             conversion.fee_amount = fee_amount
         if status:
             conversion.status = status
+            conversion.status_rank = get_conversion_status_rank(status)
         if claim_signature:
             conversion.claim_signature = claim_signature
 
+        self.__apply_conversion_changes([ConversionChange(from_address=conversion.wallet_pair.from_address,
+                                                          to_address=conversion.wallet_pair.to_address,
+                                                          token_pair_id=conversion.wallet_pair.token_pair_id,
+                                                          created_at=conversion.created_at, old_status=old_status,
+                                                          old_claim_amount=old_claim_amount,
+                                                          new_status=conversion.status,
+                                                          new_claim_amount=conversion.claim_amount)])
+
         conversion.updated_at = datetime_in_utcnow()
-        self.session.commit()
 
         return ConversionFactory.conversion(row_id=conversion.row_id, id=conversion.id,
                                             wallet_pair_id=conversion.wallet_pair_id,
@@ -229,9 +404,8 @@ class ConversionRepository(BaseRepository):
 
         conversion_transaction.status = status
         conversion_transaction.updated_at = datetime_in_utcnow()
-        self.session.commit()
 
-    @read_from_db()
+    @read_from_db(replica_lag_tolerance=5)
     def get_token_contract_address_for_conversion_id(self, conversion_on, conversion_id):
         query = self.session.query(TokenDBModel.contract_address)
         if conversion_on == ConversionOn.FROM.value:
@@ -250,124 +424,159 @@ class ConversionRepository(BaseRepository):
 
         return contract_address[0]
 
-    @read_from_db()
-    def get_conversion_history_count(self, address, blockchain_name, token_symbol, conversion_status):
-
-        from_token = aliased(TokenDBModel)
-        to_token = aliased(TokenDBModel)
-        from_blockchain = aliased(BlockChainDBModel)
-        to_blockchain = aliased(BlockChainDBModel)
-
-        query = self.session.query(func.count(ConversionDBModel.id)) \
-            .join(ConversionDBModel.wallet_pair) \
-            .join(WalletPairDBModel.token_pair) \
-            .join(from_token, TokenPairDBModel.from_token) \
-            .join(to_token, TokenPairDBModel.to_token) \
-            .join(from_blockchain, from_token.blockchain_detail) \
-            .join(to_blockchain, to_token.blockchain_detail)
-
+    @staticmethod
+    def __filter_conversion_history(query, address, blockchain_name, token_symbol, conversion_status):
         # Filtering
         if address:
-            query = query.filter(
-                or_(WalletPairDBModel.from_address == address,
-                    WalletPairDBModel.to_address == address)
-            )
+            # Semi-join on wallet_pair_address, a wallet pair having the address on both sides is matched once
+            wallet_pair_ids = select(WalletPairAddressDBModel.wallet_pair_id) \
+                .where(WalletPairAddressDBModel.address == address)
+            query = query.filter(ConversionDBModel.wallet_pair_id.in_(wallet_pair_ids))
         if blockchain_name:
+            blockchain_row_id = select(BlockChainDBModel.row_id) \
+                .where(BlockChainDBModel.name == blockchain_name).scalar_subquery()
             query = query.filter(
-                or_(from_blockchain.name == blockchain_name,
-                    to_blockchain.name == blockchain_name)
+                or_(ConversionDBModel.from_blockchain_id == blockchain_row_id,
+                    ConversionDBModel.to_blockchain_id == blockchain_row_id)
             )
         if token_symbol:
+            token_row_ids = select(TokenDBModel.row_id).where(TokenDBModel.symbol == token_symbol)
             query = query.filter(
-                or_(from_token.symbol == token_symbol,
-                    to_token.symbol == token_symbol)
+                or_(ConversionDBModel.from_token_id.in_(token_row_ids),
+                    ConversionDBModel.to_token_id.in_(token_row_ids))
             )
         if conversion_status:
             query = query.filter(ConversionDBModel.status == conversion_status)
 
-        count = query.first()
-
-        return count[0]
-
-    @read_from_db()
-    def get_conversion_history(self, address, blockchain_name, token_symbol, conversion_status,
-                               order=ConversionHistoryOrder.DEFAULT,
-                               offset=0, limit=PaginationDefaults.PAGE_SIZE.value):
+        return query
 
+    def __conversion_history_query(self, *columns):
+        # Plain rows with only the columns of the history response, no ORM objects are hydrated
         from_token = aliased(TokenDBModel)
         to_token = aliased(TokenDBModel)
         from_blockchain = aliased(BlockChainDBModel)
         to_blockchain = aliased(BlockChainDBModel)
+        return self.session.query(
+            ConversionDBModel.row_id, ConversionDBModel.id, ConversionDBModel.deposit_amount,
+            ConversionDBModel.claim_amount, ConversionDBModel.fee_amount, ConversionDBModel.status,
+            ConversionDBModel.status_rank, ConversionDBModel.created_at, ConversionDBModel.updated_at,
+            WalletPairDBModel.from_address, WalletPairDBModel.to_address, WalletPairDBModel.deposit_address,
+            from_token.name.label("from_token_name"), from_token.symbol.label("from_token_symbol"),
+            from_token.logo.label("from_token_logo"), from_token.allowed_decimal.label("from_token_allowed_decimal"),
+            from_blockchain.name.label("from_blockchain_name"), from_blockchain.symbol.label("from_blockchain_symbol"),
+            from_blockchain.logo.label("from_blockchain_logo"),
+            from_blockchain.chain_id.label("from_blockchain_chain_id"),
+            to_token.name.label("to_token_name"), to_token.symbol.label("to_token_symbol"),
+            to_token.logo.label("to_token_logo"), to_token.allowed_decimal.label("to_token_allowed_decimal"),
+            to_blockchain.name.label("to_blockchain_name"), to_blockchain.symbol.label("to_blockchain_symbol"),
+            to_blockchain.logo.label("to_blockchain_logo"), to_blockchain.chain_id.label("to_blockchain_chain_id"),
+            *columns) \
+            .select_from(ConversionDBModel) \
+            .join(WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
+            .join(from_token, from_token.row_id == ConversionDBModel.from_token_id) \
+            .join(to_token, to_token.row_id == ConversionDBModel.to_token_id) \
+            .join(from_blockchain, from_blockchain.row_id == ConversionDBModel.from_blockchain_id) \
+            .join(to_blockchain, to_blockchain.row_id == ConversionDBModel.to_blockchain_id)
+
+    @read_from_db(replica_lag_tolerance=30)
+    def get_conversion_history_count(self, address, blockchain_name, token_symbol, conversion_status):
+        query = self.__filter_conversion_history(self.session.query(func.count(ConversionDBModel.id)),
+                                                 address=address, blockchain_name=blockchain_name,
+                                                 token_symbol=token_symbol, conversion_status=conversion_status)
+        count = query.first()
 
-        query = self.session.query(ConversionDBModel) \
-            .join(ConversionDBModel.wallet_pair) \
-            .join(WalletPairDBModel.token_pair) \
-            .join(from_token, TokenPairDBModel.from_token) \
-            .join(to_token, TokenPairDBModel.to_token) \
-            .join(from_blockchain, from_token.blockchain_detail) \
-            .join(to_blockchain, to_token.blockchain_detail)
+        return count[0]
 
-        # Filtering
-        if address:
-            query = query.filter(
-                or_(WalletPairDBModel.from_address == address,
-                    WalletPairDBModel.to_address == address)
-            )
-        if blockchain_name:
-            query = query.filter(
-                or_(from_blockchain.name == blockchain_name,
-                    to_blockchain.name == blockchain_name)
-            )
-        if token_symbol:
-            query = query.filter(
-                or_(from_token.symbol == token_symbol,
-                    to_token.symbol == token_symbol)
-            )
-        if conversion_status:
-            query = query.filter(ConversionDBModel.status == conversion_status)
+    @read_from_db(replica_lag_tolerance=30)
+    def get_conversion_history_page(self, address, blockchain_name, token_symbol, conversion_status,
+                                    order=ConversionHistoryOrder.DEFAULT,
+                                    offset=0, limit=PaginationDefaults.PAGE_SIZE.value):
+        # The window count is evaluated over the filtered rows before the limit is applied
+        query = self.__filter_conversion_history(self.__conversion_history_query(
+                                                     func.count().over().label("total_records")),
+                                                 address=address, blockchain_name=blockchain_name,
+                                                 token_symbol=token_symbol, conversion_status=conversion_status)
 
         # Ordering
         if order == ConversionHistoryOrder.STATUS:
-            query = query.order_by(
-                case(
-                    [
-                        (ConversionDBModel.status == ConversionStatus.WAITING_FOR_CLAIM.value, 1),
-                        (ConversionDBModel.status == ConversionStatus.USER_INITIATED.value, 2),
-                        (ConversionDBModel.status == ConversionStatus.CLAIM_INITIATED.value, 3),
-                        (ConversionDBModel.status == ConversionStatus.PROCESSING.value, 4),
-                        (ConversionDBModel.status == ConversionStatus.SUCCESS.value, 5),
-                        (ConversionDBModel.status == ConversionStatus.EXPIRED.value, 6),
-                        (ConversionDBModel.status == ConversionStatus.CANCELED.value, 7)
-                    ],
-                    else_=8
-                ).asc(),
-                ConversionDBModel.created_at.desc()
-            )
+            query = query.order_by(ConversionDBModel.status_rank.asc(), ConversionDBModel.created_at.desc())
         elif order == ConversionHistoryOrder.DATE:
             query = query.order_by(ConversionDBModel.created_at.desc())
 
-        conversions_details = query.options(joinedload(ConversionDBModel.wallet_pair)) \
-            .options(joinedload(ConversionDBModel.wallet_pair).joinedload(WalletPairDBModel.token_pair)) \
-            .offset(offset) \
-            .limit(limit) \
-            .all()
+        conversions_details = query.offset(offset).limit(limit).all()
 
-        return [ConversionFactory.conversion_detail(conversion_detail) for conversion_detail in conversions_details]
+        if conversions_details:
+            total_records = conversions_details[0].total_records
+        elif offset:
+            # Page past the end returns no row to carry the window count
+            total_records = self.__filter_conversion_history(self.session.query(func.count(ConversionDBModel.id)),
+                                                             address=address, blockchain_name=blockchain_name,
+                                                             token_symbol=token_symbol,
+                                                             conversion_status=conversion_status).scalar()
+        else:
+            total_records = 0
+
+        return conversions_details, total_records
+
+    @read_from_db(replica_lag_tolerance=30)
+    def get_conversion_history_by_cursor(self, address, blockchain_name, token_symbol, conversion_status,
+                                         order=ConversionHistoryOrder.DEFAULT, position=None,
+                                         limit=PaginationDefaults.PAGE_SIZE.value):
+        query = self.__filter_conversion_history(self.__conversion_history_query(),
+                                                 address=address, blockchain_name=blockchain_name,
+                                                 token_symbol=token_symbol, conversion_status=conversion_status)
+        status_rank = ConversionDBModel.status_rank
+
+        # Seek past the last row of the previous page, position is (status_rank, created_at, row_id)
+        if position:
+            last_status_rank, last_created_at, last_row_id = position
+            after_date = or_(ConversionDBModel.created_at < last_created_at,
+                             and_(ConversionDBModel.created_at == last_created_at,
+                                  ConversionDBModel.row_id < last_row_id))
+            if order == ConversionHistoryOrder.STATUS:
+                query = query.filter(or_(status_rank > last_status_rank,
+                                         and_(status_rank == last_status_rank, after_date)))
+            else:
+                query = query.filter(after_date)
 
-    @read_from_db()
-    def get_transactions_for_conversion_row_ids(self, conversion_row_ids):
-        transactions = self.session.query(TransactionDBModel) \
+        if order == ConversionHistoryOrder.STATUS:
+            query = query.order_by(status_rank.asc(), ConversionDBModel.created_at.desc(),
+                                   ConversionDBModel.row_id.desc())
+        else:
+            query = query.order_by(ConversionDBModel.created_at.desc(), ConversionDBModel.row_id.desc())
+
+        # One extra row tells whether there is a next page without counting
+        conversions_details = query.limit(limit + 1).all()
+
+        next_position = None
+        if len(conversions_details) > limit:
+            conversions_details = conversions_details[:limit]
+            last_conversion = conversions_details[-1]
+            next_position = (last_conversion.status_rank,
+                             last_conversion.created_at, last_conversion.row_id)
+
+        return conversions_details, next_position
+
+    @read_from_db(replica_lag_tolerance=30)
+    def get_transaction_rows_for_conversion_row_ids(self, conversion_row_ids):
+        # Plain rows with only the columns of the transaction response, no ORM objects are hydrated
+        return self.session.query(
+            TransactionDBModel.id, TransactionDBModel.conversion_transaction_id,
+            TransactionDBModel.transaction_operation, TransactionDBModel.transaction_hash,
+            TransactionDBModel.transaction_amount, TransactionDBModel.confirmation, TransactionDBModel.status,
+            TransactionDBModel.created_at, TransactionDBModel.updated_at,
+            TokenDBModel.row_id.label("token_row_id"), TokenDBModel.name.label("token_name"),
+            TokenDBModel.symbol.label("token_symbol"), TokenDBModel.logo.label("token_logo"),
+            TokenDBModel.allowed_decimal.label("token_allowed_decimal"),
+            BlockChainDBModel.name.label("blockchain_name"), BlockChainDBModel.symbol.label("blockchain_symbol"),
+            BlockChainDBModel.logo.label("blockchain_logo"), BlockChainDBModel.chain_id.label("blockchain_chain_id")) \
             .join(ConversionTransactionDBModel,
                   ConversionTransactionDBModel.row_id == TransactionDBModel.conversion_transaction_id) \
+            .outerjoin(TokenDBModel, TokenDBModel.row_id == TransactionDBModel.token_id) \
+            .outerjoin(BlockChainDBModel, BlockChainDBModel.row_id == TokenDBModel.blockchain_id) \
             .filter(ConversionTransactionDBModel.conversion_id.in_(conversion_row_ids),
-                    ConversionTransactionDBModel.status != ConversionTransactionStatus.FAILED.value, ) \
-            .order_by(TransactionDBModel.row_id, TransactionDBModel.created_at.asc()) \
-            .options(joinedload(TransactionDBModel.token)) \
-            .options(joinedload(TransactionDBModel.token).joinedload(TokenDBModel.blockchain_detail)) \
-            .options(
-            joinedload(TransactionDBModel.conversion_transaction).noload(ConversionTransactionDBModel.conversion)).all()
-
-        return [ConversionFactory.transaction_detail(transaction=transaction) for transaction in transactions]
+                    ConversionTransactionDBModel.status != ConversionTransactionStatus.FAILED.value) \
+            .order_by(TransactionDBModel.row_id, TransactionDBModel.created_at.asc()).all()
 
     @update_in_db()
     def update_transaction_by_id(self, tx_id, tx_operation, tx_visibility, tx_amount, confirmation, tx_status,
@@ -387,9 +596,8 @@ class ConversionRepository(BaseRepository):
         if created_by:
             transaction.created_by = created_by
         transaction.updated_at = datetime_in_utcnow()
-        self.session.commit()
 
-    @read_from_db()
+    @read_from_db(replica_lag_tolerance=0)
     def get_transaction_by_hash(self, tx_hash):
         transaction = self.session.query(TransactionDBModel) \
             .filter(TransactionDBModel.transaction_hash == tx_hash).first()
@@ -410,7 +618,7 @@ class ConversionRepository(BaseRepository):
                                              updated_at=transaction.updated_at, conversion_transaction_obj=None,
                                              token_obj=None)
 
-    @read_from_db()
+    @read_from_db(replica_lag_tolerance=0)
     def get_conversion_detail_by_tx_id(self, tx_id):
         conversion = self.session.query(ConversionDBModel) \
             .join(ConversionTransactionDBModel, ConversionTransactionDBModel.conversion_id == ConversionDBModel.row_id) \
@@ -426,81 +634,116 @@ class ConversionRepository(BaseRepository):
                                             created_by=conversion.created_by, created_at=conversion.created_at,
                                             updated_at=conversion.updated_at)
 
-    @read_from_db()
-    def get_expiring_conversion(self, ethereum_expire_datetime, cardano_expire_datetime, binance_expire_datetime):
-        from_token = aliased(TokenDBModel)
-        to_token = aliased(TokenDBModel)
-        from_blockchain = aliased(BlockChainDBModel)
-        to_blockchain = aliased(BlockChainDBModel)
+    @read_from_db(replica_lag_tolerance=300)
+    def get_blockchain_row_ids_by_name(self):
+        blockchains = self.session.query(BlockChainDBModel.row_id, BlockChainDBModel.name).all()
+        return {blockchain.name.lower(): blockchain.row_id for blockchain in blockchains}
 
-        conversions = self.session.query(ConversionDBModel.row_id, ConversionDBModel.id,
-                                         ConversionDBModel.wallet_pair_id, ConversionDBModel.deposit_amount,
-                                         ConversionDBModel.claim_amount, ConversionDBModel.fee_amount,
-                                         ConversionDBModel.status, ConversionDBModel.claim_signature,
-                                         ConversionDBModel.created_by, ConversionDBModel.created_at,
-                                         ConversionDBModel.updated_at) \
+    @update_in_db()
+    def expire_conversions_chunk(self, expire_datetime_by_blockchain, watermark, chunk_size):
+        # Walks ix_conversion_status_created_at in (created_at, row_id) order, resuming after the watermark row
+        expire_till = max(expire_datetime_by_blockchain.values())
+        query = self.session.query(ConversionDBModel.row_id, ConversionDBModel.status, ConversionDBModel.claim_amount,
+                                   ConversionDBModel.created_at, WalletPairDBModel.from_address,
+                                   WalletPairDBModel.to_address, WalletPairDBModel.token_pair_id) \
             .join(WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
-            .join(TokenPairDBModel, TokenPairDBModel.row_id == WalletPairDBModel.token_pair_id) \
-            .join(from_token, from_token.row_id == TokenPairDBModel.from_token_id) \
-            .join(to_token, to_token.row_id == TokenPairDBModel.to_token_id) \
-            .join(from_blockchain, from_blockchain.row_id == from_token.blockchain_id) \
-            .join(to_blockchain, to_blockchain.row_id == to_token.blockchain_id) \
             .filter(ConversionDBModel.status == ConversionStatus.USER_INITIATED.value,
-                    or_(and_(func.lower(from_blockchain.name) == BlockchainName.ETHEREUM.value.lower(),
-                             ConversionDBModel.created_at <= str(ethereum_expire_datetime)),
-                        and_(func.lower(from_blockchain.name) == BlockchainName.BINANCE.value.lower(),
-                             ConversionDBModel.created_at <= str(binance_expire_datetime)),
-                        and_(func.lower(from_blockchain.name) == BlockchainName.CARDANO.value.lower(),
-                             ConversionDBModel.created_at <= str(cardano_expire_datetime)))).all()
-
-        return [ConversionFactory.conversion(row_id=conversion.row_id, id=conversion.id,
-                                             wallet_pair_id=conversion.wallet_pair_id,
-                                             deposit_amount=conversion.deposit_amount,
-                                             claim_amount=conversion.claim_amount, fee_amount=conversion.fee_amount,
-                                             status=conversion.status, claim_signature=conversion.claim_signature,
-                                             created_by=conversion.created_by, created_at=conversion.created_at,
-                                             updated_at=conversion.updated_at) for conversion in conversions]
-
-    @update_in_db()
-    def set_conversions_to_expire(self, conversion_ids):
+                    ConversionDBModel.created_at <= str(expire_till),
+                    or_(*[and_(ConversionDBModel.from_blockchain_id == blockchain_row_id,
+                               ConversionDBModel.created_at <= str(expire_datetime))
+                          for blockchain_row_id, expire_datetime in expire_datetime_by_blockchain.items()]))
+        if watermark:
+            query = query.filter(or_(ConversionDBModel.created_at > watermark["created_at"],
+                                     and_(ConversionDBModel.created_at == watermark["created_at"],
+                                          ConversionDBModel.row_id > watermark["row_id"])))
+        # Rows locked by the consumer are left for the next run instead of waiting on them
+        conversions = query.order_by(ConversionDBModel.created_at, ConversionDBModel.row_id).limit(chunk_size) \
+            .with_for_update(of=ConversionDBModel, skip_locked=True).all()
+        if not conversions:
+            return 0, watermark
+
+        self.__apply_conversion_changes([ConversionChange(from_address=conversion.from_address,
+                                                          to_address=conversion.to_address,
+                                                          token_pair_id=conversion.token_pair_id,
+                                                          created_at=conversion.created_at,
+                                                          old_status=conversion.status,
+                                                          old_claim_amount=conversion.claim_amount,
+                                                          new_status=ConversionStatus.EXPIRED.value,
+                                                          new_claim_amount=conversion.claim_amount)
+                                         for conversion in conversions])
         self.session.query(ConversionDBModel) \
-            .filter(ConversionDBModel.id.in_(conversion_ids)) \
-            .update({ConversionDBModel.status: ConversionStatus.EXPIRED.value}, synchronize_session=False)
+            .filter(ConversionDBModel.row_id.in_([conversion.row_id for conversion in conversions])) \
+            .update({ConversionDBModel.status: ConversionStatus.EXPIRED.value,
+                     ConversionDBModel.status_rank: get_conversion_status_rank(ConversionStatus.EXPIRED.value)},
+                    synchronize_session=False)
 
-        self.session.commit()
+        last_conversion = conversions[-1]
+        return len(conversions), {"created_at": str(last_conversion.created_at), "row_id": last_conversion.row_id}
 
-    @read_from_db()
+    @read_from_db(replica_lag_tolerance=300)
     def generate_conversion_report(self, start_date, end_date):
-        from_token = aliased(TokenDBModel)
-        to_token = aliased(TokenDBModel)
-        from_blockchain = aliased(BlockChainDBModel)
-        to_blockchain = aliased(BlockChainDBModel)
-
-        conversion_status_counts_query = self.session.query(from_token.symbol.label("token"),
-                                                            from_blockchain.symbol.label("from_blockchain"),
-                                                            to_blockchain.symbol.label("to_blockchain"),
-                                                            ConversionDBModel.status.label("status"),
-                                                            func.count(ConversionDBModel.id).label("count"),
-                                                            func.sum(ConversionDBModel.claim_amount).label("amount")) \
-            .join(WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
-            .join(TokenPairDBModel, TokenPairDBModel.row_id == WalletPairDBModel.token_pair_id) \
-            .join(from_token, from_token.row_id == TokenPairDBModel.from_token_id) \
-            .join(to_token, to_token.row_id == TokenPairDBModel.to_token_id) \
-            .join(from_blockchain, from_blockchain.row_id == from_token.blockchain_id) \
-            .join(to_blockchain, to_blockchain.row_id == to_token.blockchain_id)
+        conversion_status_counts_query = self.session.query(
+            ConversionDailyStatsDBModel.token.label("token"),
+            ConversionDailyStatsDBModel.from_blockchain.label("from_blockchain"),
+            ConversionDailyStatsDBModel.to_blockchain.label("to_blockchain"),
+            ConversionDailyStatsDBModel.status.label("status"),
+            func.sum(ConversionDailyStatsDBModel.conversion_count).label("count"),
+            func.sum(ConversionDailyStatsDBModel.amount).label("amount"))
 
         if start_date:
             conversion_status_counts_query = conversion_status_counts_query.filter(
-                func.date(ConversionDBModel.created_at) >= start_date)
+                ConversionDailyStatsDBModel.day >= start_date)
 
         if end_date:
             conversion_status_counts_query = conversion_status_counts_query.filter(
-                func.date(ConversionDBModel.created_at) <= end_date)
+                ConversionDailyStatsDBModel.day <= end_date)
 
-        conversion_status_counts = conversion_status_counts_query.group_by(from_token.id, from_token.symbol,
-                                                                           from_blockchain.symbol,
-                                                                           to_blockchain.symbol,
-                                                                           ConversionDBModel.status) \
-            .order_by(from_token.symbol.asc()).all()
+        conversion_status_counts = conversion_status_counts_query.group_by(ConversionDailyStatsDBModel.token,
+                                                                           ConversionDailyStatsDBModel.from_blockchain,
+                                                                           ConversionDailyStatsDBModel.to_blockchain,
+                                                                           ConversionDailyStatsDBModel.status) \
+            .order_by(ConversionDailyStatsDBModel.token.asc()).all()
 
         return ConversionFactory.generate_conversion_report(conversion_status_counts=conversion_status_counts)
+
+    @read_from_db(replica_lag_tolerance=300)
+    def get_first_conversion_created_at(self):
+        return self.session.query(func.min(ConversionDBModel.created_at)).scalar()
+
+    @read_from_db(replica_lag_tolerance=0)
+    def get_conversion_daily_stats_watermark(self):
+        return self.session.query(func.max(ConversionDailyStatsDBModel.last_conversion_updated_at)).scalar()
+
+    @read_from_db(replica_lag_tolerance=0)
+    def get_conversion_days_updated_since(self, updated_at):
+        days = self.session.query(distinct(func.date(ConversionDBModel.created_at))) \
+            .filter(ConversionDBModel.updated_at >= updated_at).all()
+
+        return sorted(day for day, in days)
+
+    @update_in_db()
+    def refresh_conversion_daily_stats(self, start_date, end_date):
+        # Recomputes the buckets of every day from start_date to end_date both inclusive, statuses of a day keep
+        # moving after it is over so its buckets are always replaced as a whole
+        from_blockchain = aliased(BlockChainDBModel)
+        to_blockchain = aliased(BlockChainDBModel)
+        start_datetime = datetime.combine(start_date, datetime.min.time())
+        end_datetime = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+
+        conversion_daily_stats = select(func.date(ConversionDBModel.created_at), TokenDBModel.symbol,
+                                        from_blockchain.symbol, to_blockchain.symbol, ConversionDBModel.status,
+                                        func.count(ConversionDBModel.row_id), func.sum(ConversionDBModel.claim_amount),
+                                        func.max(ConversionDBModel.updated_at)) \
+            .join_from(ConversionDBModel, TokenDBModel, TokenDBModel.row_id == ConversionDBModel.from_token_id) \
+            .join(from_blockchain, from_blockchain.row_id == ConversionDBModel.from_blockchain_id) \
+            .join(to_blockchain, to_blockchain.row_id == ConversionDBModel.to_blockchain_id) \
+            .filter(ConversionDBModel.created_at >= start_datetime, ConversionDBModel.created_at < end_datetime) \
+            .group_by(func.date(ConversionDBModel.created_at), TokenDBModel.symbol, from_blockchain.symbol,
+                      to_blockchain.symbol, ConversionDBModel.status)
+
+        self.session.query(ConversionDailyStatsDBModel) \
+            .filter(ConversionDailyStatsDBModel.day >= start_date, ConversionDailyStatsDBModel.day <= end_date) \
+            .delete(synchronize_session=False)
+        self.session.execute(insert(ConversionDailyStatsDBModel).from_select(
+            ["day", "token", "from_blockchain", "to_blockchain", "status", "conversion_count", "amount",
+             "last_conversion_updated_at"], conversion_daily_stats))
@@ -0,0 +1,33 @@
+from sqlalchemy.dialects.mysql import insert
+
+from infrastructure.models import ConsumerEventLedgerDBModel
+from infrastructure.repositories.base_repository import BaseRepository
+from utils.database import read_from_db, update_in_db
+from utils.general import datetime_in_utcnow
+
+
+class EventLedgerRepository(BaseRepository):
+
+    @read_from_db(replica_lag_tolerance=0)
+    def has_event_outcome(self, blockchain_name, transaction_hash, event_type, outcome):
+        return self.session.query(ConsumerEventLedgerDBModel.row_id) \
+            .filter(ConsumerEventLedgerDBModel.blockchain_name == blockchain_name) \
+            .filter(ConsumerEventLedgerDBModel.transaction_hash == transaction_hash) \
+            .filter(ConsumerEventLedgerDBModel.event_type == event_type) \
+            .filter(ConsumerEventLedgerDBModel.outcome == outcome) \
+            .first() is not None
+
+    @update_in_db()
+    def record_event_outcome(self, blockchain_name, transaction_hash, event_type, outcome):
+        # A redelivered copy processed in parallel may have recorded it first
+        upsert_query = insert(ConsumerEventLedgerDBModel).values(
+            blockchain_name=blockchain_name, transaction_hash=transaction_hash, event_type=event_type, outcome=outcome,
+            created_at=datetime_in_utcnow(), updated_at=datetime_in_utcnow())
+        upsert_query = upsert_query.on_duplicate_key_update(updated_at=upsert_query.inserted.updated_at)
+        self.session.execute(upsert_query)
+
+    @update_in_db()
+    def delete_events_created_before(self, created_before):
+        self.session.query(ConsumerEventLedgerDBModel) \
+            .filter(ConsumerEventLedgerDBModel.created_at < created_before) \
+            .delete(synchronize_session=False)
@@ -8,7 +8,7 @@ from utils.database import read_from_db, update_in_db
 
 class PoolingRepository(BaseRepository):
 
-    @read_from_db()
+    @read_from_db(replica_lag_tolerance=0)
     def get_message_group_pool(self):
         message_pool = self.session.query(MessageGroupPoolDBModel.row_id, MessageGroupPoolDBModel.id,
                                           MessageGroupPoolDBModel.name, MessageGroupPoolDBModel.message_group_id,
@@ -34,4 +34,3 @@ class PoolingRepository(BaseRepository):
         else:
             message_pool.trigger_count = 1
         message_pool.updated_at = datetime.now()
-        self.session.commit()
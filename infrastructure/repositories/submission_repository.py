@@ -0,0 +1,33 @@
+from infrastructure.models import PendingSubmissionDBModel
+from infrastructure.repositories.base_repository import BaseRepository
+from utils.database import read_from_db, update_in_db
+from utils.general import datetime_in_utcnow
+
+
+class SubmissionRepository(BaseRepository):
+
+    @update_in_db()
+    def create_pending_submission(self, transaction_hash, chain_id, status):
+        self.session.add(PendingSubmissionDBModel(transaction_hash=transaction_hash, chain_id=chain_id, status=status,
+                                                  created_at=datetime_in_utcnow(), updated_at=datetime_in_utcnow()))
+
+    @read_from_db(replica_lag_tolerance=0)
+    def get_submissions_by_status(self, status, limit):
+        return self.session.query(PendingSubmissionDBModel.row_id, PendingSubmissionDBModel.transaction_hash,
+                                  PendingSubmissionDBModel.chain_id, PendingSubmissionDBModel.created_at) \
+            .filter(PendingSubmissionDBModel.status == status) \
+            .order_by(PendingSubmissionDBModel.created_at.asc()) \
+            .limit(limit).all()
+
+    @update_in_db()
+    def delete_submissions(self, row_ids):
+        self.session.query(PendingSubmissionDBModel) \
+            .filter(PendingSubmissionDBModel.row_id.in_(row_ids)) \
+            .delete(synchronize_session=False)
+
+    @update_in_db()
+    def update_submissions_status(self, row_ids, status):
+        self.session.query(PendingSubmissionDBModel) \
+            .filter(PendingSubmissionDBModel.row_id.in_(row_ids)) \
+            .update({PendingSubmissionDBModel.status: status, PendingSubmissionDBModel.updated_at: datetime_in_utcnow()},
+                    synchronize_session=False)
@@ -1,16 +1,21 @@
 from sqlalchemy.orm import joinedload
 
+from config import REFERENCE_DATA_CACHE
 from constants.error_details import ErrorCode, ErrorDetails
 from domain.factory.token_factory import TokenFactory
 from infrastructure.models import ConversionFeeDBModel, TokenPairDBModel
 from infrastructure.repositories.base_repository import BaseRepository
+from utils.cache import TTLCache, cached
 from utils.database import read_from_db
 from utils.exceptions import TokenPairIdNotExitsException
 
+token_pair_cache = TTLCache(name="token_pair", ttl_seconds=REFERENCE_DATA_CACHE["TTL_SECONDS"])
+
 
 class TokenRepository(BaseRepository):
 
-    @read_from_db()
+    @cached(token_pair_cache)
+    @read_from_db(replica_lag_tolerance=300)
     def get_all_token_pair(self):
         token_pairs = self.session.query(TokenPairDBModel).filter(TokenPairDBModel.is_enabled.is_(True)) \
             .options(joinedload(TokenPairDBModel.from_token)).options(joinedload(TokenPairDBModel.to_token)) \
@@ -26,7 +31,8 @@ class TokenRepository(BaseRepository):
                 token_pair
                 in token_pairs]
 
-    @read_from_db()
+    @cached(token_pair_cache)
+    @read_from_db(replica_lag_tolerance=300)
     def get_token_pair(self, token_pair_id, token_pair_row_id=None):
         token_pair_query = self.session.query(TokenPairDBModel).filter(TokenPairDBModel.is_enabled.is_(True)) \
             .options(joinedload(TokenPairDBModel.from_token)).options(joinedload(TokenPairDBModel.to_token)) \
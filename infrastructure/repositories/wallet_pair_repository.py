@@ -1,17 +1,18 @@
-from sqlalchemy import or_
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 
-from constants.general import CreatedBy
+from constants.general import CreatedBy, WalletPairAddressSide
 from constants.status import ConversionStatus
 from domain.factory.wallet_pair_factory import WalletPairFactory
-from infrastructure.models import WalletPairDBModel, ConversionDBModel
+from infrastructure.models import WalletPairDBModel, ConversionDBModel, WalletPairAddressDBModel
 from infrastructure.repositories.base_repository import BaseRepository
-from utils.database import read_from_db
+from utils.database import read_from_db, update_in_db, is_duplicate_entry_error
 from utils.general import get_uuid, datetime_in_utcnow
 
 
 class WalletPairRepository(BaseRepository):
 
-    @read_from_db()
+    @read_from_db(replica_lag_tolerance=0)
     def get_wallet_pair_by_addresses(self, from_address, to_address, token_pair_id):
         wallet_pair = self.session.query(WalletPairDBModel.row_id, WalletPairDBModel.id,
                                          WalletPairDBModel.token_pair_id, WalletPairDBModel.from_address,
@@ -20,10 +21,8 @@ class WalletPairRepository(BaseRepository):
                                          WalletPairDBModel.signature_metadata, WalletPairDBModel.signature_expiry,
                                          WalletPairDBModel.created_by, WalletPairDBModel.created_at,
                                          WalletPairDBModel.updated_at).filter(
-            or_(WalletPairDBModel.from_address == from_address, WalletPairDBModel.from_address == to_address),
-            or_(WalletPairDBModel.to_address == from_address, WalletPairDBModel.to_address == to_address),
-            WalletPairDBModel.token_pair_id == token_pair_id,
-            WalletPairDBModel.signature is not None).first()
+            WalletPairDBModel.token_pair_id == token_pair_id, WalletPairDBModel.from_address == from_address,
+            WalletPairDBModel.to_address == to_address).first()
 
         if wallet_pair is None:
             return None
@@ -40,6 +39,7 @@ class WalletPairRepository(BaseRepository):
                                              created_by=wallet_pair.created_by, created_at=wallet_pair.created_at,
                                              updated_at=wallet_pair.updated_at)
 
+    @update_in_db()
     def create_wallet_pair(self, from_address, to_address, token_pair_id, signature, signature_expiry,
                            signature_metadata, deposit_address, deposit_address_detail):
 
@@ -49,7 +49,14 @@ class WalletPairRepository(BaseRepository):
                                              signature=signature, signature_metadata=signature_metadata,
                                              signature_expiry=signature_expiry, created_by=CreatedBy.DAPP.value,
                                              created_at=datetime_in_utcnow(), updated_at=datetime_in_utcnow())
-        self.add_item(wallet_pair_item)
+        self.session.add(wallet_pair_item)
+        self.session.flush()
+        # Both addresses are indexed in one table, lookups by either side avoid an OR over two columns
+        self.session.execute(insert(WalletPairAddressDBModel), [
+            {"address": wallet_pair_item.from_address, "wallet_pair_id": wallet_pair_item.row_id,
+             "side": WalletPairAddressSide.FROM.value, "wallet_pair_created_at": wallet_pair_item.created_at},
+            {"address": wallet_pair_item.to_address, "wallet_pair_id": wallet_pair_item.row_id,
+             "side": WalletPairAddressSide.TO.value, "wallet_pair_created_at": wallet_pair_item.created_at}])
 
         return WalletPairFactory.wallet_pair(row_id=wallet_pair_item.row_id, id=wallet_pair_item.id,
                                              token_pair_id=wallet_pair_item.token_pair_id,
@@ -64,7 +71,40 @@ class WalletPairRepository(BaseRepository):
                                              created_at=wallet_pair_item.created_at,
                                              updated_at=wallet_pair_item.updated_at)
 
-    @read_from_db()
+    @update_in_db()
+    def get_or_create_wallet_pair(self, from_address, to_address, token_pair_id, signature, signature_expiry,
+                                  signature_metadata, deposit_address, deposit_address_detail):
+        try:
+            # Insert the complete row first and let the unique key arbitrate concurrent requests for the same pair
+            with self.session.begin_nested():
+                wallet_pair = self.create_wallet_pair(from_address=from_address, to_address=to_address,
+                                                      token_pair_id=token_pair_id, signature=signature,
+                                                      signature_expiry=signature_expiry,
+                                                      signature_metadata=signature_metadata,
+                                                      deposit_address=deposit_address,
+                                                      deposit_address_detail=deposit_address_detail)
+            return wallet_pair, True
+        except IntegrityError as e:
+            if not is_duplicate_entry_error(e):
+                raise e
+            # Locking read, a consistent read could miss the row the other transaction has just committed
+            wallet_pair = self.session.query(WalletPairDBModel).filter(
+                WalletPairDBModel.token_pair_id == token_pair_id, WalletPairDBModel.from_address == from_address,
+                WalletPairDBModel.to_address == to_address).with_for_update(read=True).one()
+
+        return WalletPairFactory.wallet_pair(row_id=wallet_pair.row_id, id=wallet_pair.id,
+                                             token_pair_id=wallet_pair.token_pair_id,
+                                             from_address=wallet_pair.from_address,
+                                             to_address=wallet_pair.to_address,
+                                             deposit_address=wallet_pair.deposit_address,
+                                             deposit_address_detail=wallet_pair.deposit_address_detail,
+                                             signature=wallet_pair.signature,
+                                             signature_metadata=wallet_pair.signature_metadata,
+                                             signature_expiry=wallet_pair.signature_expiry,
+                                             created_by=wallet_pair.created_by, created_at=wallet_pair.created_at,
+                                             updated_at=wallet_pair.updated_at), False
+
+    @read_from_db(replica_lag_tolerance=0)
     def get_wallet_pair_by_deposit_address(self, deposit_address):
         wallet_pair = self.session.query(WalletPairDBModel.row_id, WalletPairDBModel.id,
                                          WalletPairDBModel.token_pair_id, WalletPairDBModel.from_address,
@@ -91,7 +131,7 @@ class WalletPairRepository(BaseRepository):
                                              created_by=wallet_pair.created_by, created_at=wallet_pair.created_at,
                                              updated_at=wallet_pair.updated_at)
 
-    @read_from_db()
+    @read_from_db(replica_lag_tolerance=5)
     def get_wallet_pair_by_conversion_id(self, conversion_id):
         wallet_pair = self.session.query(WalletPairDBModel.row_id, WalletPairDBModel.id,
                                          WalletPairDBModel.token_pair_id, WalletPairDBModel.from_address,
@@ -118,36 +158,22 @@ class WalletPairRepository(BaseRepository):
                                              created_by=wallet_pair.created_by, created_at=wallet_pair.created_at,
                                              updated_at=wallet_pair.updated_at)
 
-    @read_from_db()
+    @read_from_db(replica_lag_tolerance=5)
     def get_all_deposit_address(self):
-        wallet_pairs = self.session.query(WalletPairDBModel.row_id, WalletPairDBModel.id,
-                                          WalletPairDBModel.token_pair_id, WalletPairDBModel.from_address,
-                                          WalletPairDBModel.to_address, WalletPairDBModel.deposit_address,
-                                          WalletPairDBModel.deposit_address_detail, WalletPairDBModel.signature,
-                                          WalletPairDBModel.signature_metadata, WalletPairDBModel.signature_expiry,
-                                          WalletPairDBModel.created_by, WalletPairDBModel.created_at,
-                                          WalletPairDBModel.updated_at) \
+        # Plain rows with only the columns the listener and the deposit address cache need
+        return self.session.query(WalletPairDBModel.row_id, WalletPairDBModel.id, WalletPairDBModel.token_pair_id,
+                                  WalletPairDBModel.deposit_address) \
             .join(ConversionDBModel, ConversionDBModel.wallet_pair_id == WalletPairDBModel.row_id) \
             .filter(ConversionDBModel.status == ConversionStatus.USER_INITIATED.value) \
             .filter(WalletPairDBModel.deposit_address.isnot(None)).all()
 
-        return [WalletPairFactory.wallet_pair(row_id=wallet_pair.row_id, id=wallet_pair.id,
-                                              token_pair_id=wallet_pair.token_pair_id,
-                                              from_address=wallet_pair.from_address,
-                                              to_address=wallet_pair.to_address,
-                                              deposit_address=wallet_pair.deposit_address,
-                                              deposit_address_detail=wallet_pair.deposit_address_detail,
-                                              signature=wallet_pair.signature,
-                                              signature_metadata=wallet_pair.signature_metadata,
-                                              signature_expiry=wallet_pair.signature_expiry,
-                                              created_by=wallet_pair.created_by, created_at=wallet_pair.created_at,
-                                              updated_at=wallet_pair.updated_at) for wallet_pair in wallet_pairs]
-
-    @read_from_db()
+    @read_from_db(replica_lag_tolerance=30)
     def get_wallets_address_by_address(self, address):
+        latest_wallet_pair_id = self.session.query(WalletPairAddressDBModel.wallet_pair_id) \
+            .filter(WalletPairAddressDBModel.address == address) \
+            .order_by(WalletPairAddressDBModel.wallet_pair_created_at.desc()).limit(1).scalar_subquery()
         wallet_pair = self.session.query(WalletPairDBModel) \
-            .filter(or_(WalletPairDBModel.from_address == address, WalletPairDBModel.to_address == address)) \
-            .order_by(WalletPairDBModel.created_at.desc()).first()
+            .filter(WalletPairDBModel.row_id == latest_wallet_pair_id).first()
 
         if not wallet_pair:
             return None
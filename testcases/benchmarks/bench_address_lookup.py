@@ -0,0 +1,86 @@
+"""
+Compares the address lookups filtering from_address OR to_address on wallet_pair with the wallet_pair_address
+semi-join, for the latest wallet pair of an address and the conversion history count. The per address indexes
+on wallet_pair are dropped along with the OR lookups, so the OR queries scan wallet_pair.
+
+Runs against the database configured in config.py and deletes every row of the conversion tables,
+never point it at a shared database.
+
+    python -m testcases.benchmarks.bench_address_lookup --wallet-pairs 1000000
+"""
+import argparse
+
+from sqlalchemy import or_, func
+
+from infrastructure.models import WalletPairDBModel, ConversionDBModel
+from infrastructure.repositories.conversion_repository import ConversionRepository
+from infrastructure.repositories.wallet_pair_repository import WalletPairRepository
+from testcases.benchmarks.seed import seed_reference_data, seed_wallet_pairs, seed_conversions, delete_all_tables, \
+    measure
+
+ADDRESS = "0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1"
+OTHER_ADDRESS = "addr_test1qza8485avt2xn3vy63plawqt0gk3ykpf98wusc4qrml2avu0pkm5rp3pkz6q4n3kf8znlf3y749lll8lfmg5x86kgt8qju7vx8"
+ADDRESS_PAIRS_PER_BATCH = 50000
+
+conversion_repo = ConversionRepository()
+wallet_pair_repo = WalletPairRepository()
+
+
+def or_latest_wallet_pair(session):
+    session.query(WalletPairDBModel) \
+        .filter(or_(WalletPairDBModel.from_address == ADDRESS, WalletPairDBModel.to_address == ADDRESS)) \
+        .order_by(WalletPairDBModel.created_at.desc()).first()
+    session.commit()
+
+
+def or_history_count(session):
+    session.query(func.count(ConversionDBModel.id)) \
+        .join(WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
+        .filter(or_(WalletPairDBModel.from_address == ADDRESS, WalletPairDBModel.to_address == ADDRESS)).scalar()
+    session.commit()
+
+
+def seed(session, wallet_pairs):
+    variables = seed_reference_data(session)
+    token_pair_ids = [variables.token_pair_row_id_1, variables.token_pair_row_id_2]
+    target_wallet_pair_ids = seed_wallet_pairs(session, addresses=[(ADDRESS, OTHER_ADDRESS), (OTHER_ADDRESS, ADDRESS)],
+                                               token_pair_ids=token_pair_ids)
+    seed_conversions(session, wallet_pair_ids=target_wallet_pair_ids, count=100)
+
+    # Every other wallet pair belongs to its own pair of addresses
+    row_id = len(target_wallet_pair_ids) + 1
+    address_pairs = (wallet_pairs - len(target_wallet_pair_ids)) // len(token_pair_ids)
+    for batch_start in range(0, address_pairs, ADDRESS_PAIRS_PER_BATCH):
+        addresses = [(f"0x{index:040x}", f"addr_test1{index:0100d}")
+                     for index in range(batch_start, min(batch_start + ADDRESS_PAIRS_PER_BATCH, address_pairs))]
+        row_id += len(seed_wallet_pairs(session, addresses=addresses, token_pair_ids=token_pair_ids,
+                                        start_row_id=row_id))
+    session.execute("ANALYZE TABLE wallet_pair, wallet_pair_address, conversion")
+    session.commit()
+
+
+def main(wallet_pairs, repeat):
+    session = conversion_repo.session
+    delete_all_tables(session)
+    seed(session, wallet_pairs)
+
+    print(f"{'lookup':>24} {'OR ms':>8} {'address table ms':>17}")
+    or_ms = measure(lambda: or_latest_wallet_pair(session), repeat=repeat)
+    address_table_ms = measure(lambda: wallet_pair_repo.get_wallets_address_by_address(address=ADDRESS),
+                               repeat=repeat)
+    print(f"{'latest wallet pair':>24} {or_ms:>8.1f} {address_table_ms:>17.1f}")
+
+    or_ms = measure(lambda: or_history_count(session), repeat=repeat)
+    address_table_ms = measure(lambda: conversion_repo.get_conversion_history_count(
+        address=ADDRESS, blockchain_name=None, token_symbol=None, conversion_status=None), repeat=repeat)
+    print(f"{'history count':>24} {or_ms:>8.1f} {address_table_ms:>17.1f}")
+
+    delete_all_tables(session)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wallet-pairs", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    main(wallet_pairs=arguments.wallet_pairs, repeat=arguments.repeat)
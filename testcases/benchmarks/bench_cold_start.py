@@ -0,0 +1,59 @@
+"""
+Measures the cold start cost of the repository layer for each DB_POOL_MODE.
+
+Every sample runs in a fresh interpreter, like a new lambda container, and reports the handler import time,
+the first query (engine construction plus connect) and a second query on the warm container.
+Runs read-only queries against the database configured in config.py.
+
+    python -m testcases.benchmarks.bench_cold_start --modes queue null --repeat 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from constants.general import DatabasePoolMode
+
+COLD_START_SCRIPT = """
+import json
+import time
+
+start = time.perf_counter()
+import config
+config.NETWORK["db"]["DB_POOL_MODE"] = "{mode}"
+config.NETWORK["db"]["DB_LOGGING"] = False
+from application.handler import conversion_handlers
+from infrastructure.repositories.token_repository import TokenRepository
+imported = time.perf_counter()
+TokenRepository().get_all_token_pair()
+first_query = time.perf_counter()
+TokenRepository().get_all_token_pair()
+second_query = time.perf_counter()
+print(json.dumps({{"import": (imported - start) * 1000, "first_query": (first_query - imported) * 1000,
+                  "second_query": (second_query - first_query) * 1000}}))
+"""
+
+
+def cold_start(mode):
+    output = subprocess.run([sys.executable, "-c", COLD_START_SCRIPT.format(mode=mode)], capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(modes, repeat):
+    print(f"{'mode':>6} {'import ms':>10} {'first query ms':>15} {'second query ms':>16}")
+    for mode in modes:
+        samples = [cold_start(mode) for _ in range(repeat)]
+        import_ms = statistics.median(sample["import"] for sample in samples)
+        first_query_ms = statistics.median(sample["first_query"] for sample in samples)
+        second_query_ms = statistics.median(sample["second_query"] for sample in samples)
+        print(f"{mode:>6} {import_ms:>10.1f} {first_query_ms:>15.1f} {second_query_ms:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modes", nargs="+", default=[mode.value for mode in DatabasePoolMode])
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    main(modes=arguments.modes, repeat=arguments.repeat)
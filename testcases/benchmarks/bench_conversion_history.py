@@ -0,0 +1,99 @@
+"""
+Compares the two-query (COUNT + page) and the one-query (COUNT(*) OVER()) conversion history paths.
+The two-query page is kept here, the repository only serves the one-query path.
+
+Runs against the database configured in config.py and deletes every row of the conversion tables,
+never point it at a shared database.
+
+    python -m testcases.benchmarks.bench_conversion_history --sizes 10000 100000 1000000
+"""
+import argparse
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from constants.general import ConversionHistoryOrder
+from infrastructure.models import ConversionDBModel, WalletPairDBModel, WalletPairAddressDBModel, TokenDBModel, \
+    BlockChainDBModel
+from infrastructure.repositories.conversion_repository import ConversionRepository
+from testcases.benchmarks.seed import seed_reference_data, seed_wallet_pairs, seed_conversions, delete_all_tables, \
+    measure
+
+ADDRESS = "0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1"
+OTHER_ADDRESS = "addr_test1qza8485avt2xn3vy63plawqt0gk3ykpf98wusc4qrml2avu0pkm5rp3pkz6q4n3kf8znlf3y749lll8lfmg5x86kgt8qju7vx8"
+PAGE_SIZE = 15
+
+conversion_repo = ConversionRepository()
+
+
+def history_page(offset):
+    # Same joins and columns as the repository history query, without the window count
+    from_token = aliased(TokenDBModel)
+    to_token = aliased(TokenDBModel)
+    from_blockchain = aliased(BlockChainDBModel)
+    to_blockchain = aliased(BlockChainDBModel)
+    wallet_pair_ids = select(WalletPairAddressDBModel.wallet_pair_id) \
+        .where(WalletPairAddressDBModel.address == ADDRESS)
+    session = conversion_repo.session
+    rows = session.query(
+        ConversionDBModel.row_id, ConversionDBModel.id, ConversionDBModel.deposit_amount,
+        ConversionDBModel.claim_amount, ConversionDBModel.fee_amount, ConversionDBModel.status,
+        ConversionDBModel.status_rank, ConversionDBModel.created_at, ConversionDBModel.updated_at,
+        WalletPairDBModel.from_address, WalletPairDBModel.to_address, WalletPairDBModel.deposit_address,
+        from_token.name, from_token.symbol, from_token.logo, from_token.allowed_decimal,
+        from_blockchain.name, from_blockchain.symbol, from_blockchain.logo, from_blockchain.chain_id,
+        to_token.name, to_token.symbol, to_token.logo, to_token.allowed_decimal,
+        to_blockchain.name, to_blockchain.symbol, to_blockchain.logo, to_blockchain.chain_id) \
+        .select_from(ConversionDBModel) \
+        .join(WalletPairDBModel, WalletPairDBModel.row_id == ConversionDBModel.wallet_pair_id) \
+        .join(from_token, from_token.row_id == ConversionDBModel.from_token_id) \
+        .join(to_token, to_token.row_id == ConversionDBModel.to_token_id) \
+        .join(from_blockchain, from_blockchain.row_id == ConversionDBModel.from_blockchain_id) \
+        .join(to_blockchain, to_blockchain.row_id == ConversionDBModel.to_blockchain_id) \
+        .filter(ConversionDBModel.wallet_pair_id.in_(wallet_pair_ids)) \
+        .order_by(ConversionDBModel.status_rank.asc(), ConversionDBModel.created_at.desc()) \
+        .offset(offset).limit(PAGE_SIZE).all()
+    session.commit()
+    return rows
+
+
+def two_query_path(offset):
+    total = conversion_repo.get_conversion_history_count(address=ADDRESS, blockchain_name=None, token_symbol=None,
+                                                         conversion_status=None)
+    if total > offset:
+        history_page(offset)
+
+
+def one_query_path(offset):
+    conversion_repo.get_conversion_history_page(address=ADDRESS, blockchain_name=None, token_symbol=None,
+                                                conversion_status=None, order=ConversionHistoryOrder.STATUS,
+                                                offset=offset, limit=PAGE_SIZE)
+
+
+def main(sizes, repeat):
+    session = conversion_repo.session
+    print(f"{'conversions':>12} {'offset':>8} {'two queries ms':>15} {'one query ms':>13}")
+    for size in sizes:
+        delete_all_tables(session)
+        variables = seed_reference_data(session)
+        wallet_pair_ids = seed_wallet_pairs(session, addresses=[(ADDRESS, OTHER_ADDRESS), (OTHER_ADDRESS, ADDRESS)],
+                                            token_pair_ids=[variables.token_pair_row_id_1,
+                                                            variables.token_pair_row_id_2])
+        seed_conversions(session, wallet_pair_ids=wallet_pair_ids, count=size)
+        session.execute("ANALYZE TABLE conversion, wallet_pair")
+        session.commit()
+
+        for offset in [0, size // 2]:
+            two_query_ms = measure(lambda: two_query_path(offset), repeat=repeat)
+            one_query_ms = measure(lambda: one_query_path(offset), repeat=repeat)
+            print(f"{size:>12} {offset:>8} {two_query_ms:>15.1f} {one_query_ms:>13.1f}")
+
+    delete_all_tables(session)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    main(sizes=arguments.sizes, repeat=arguments.repeat)
@@ -0,0 +1,83 @@
+"""
+Compares the slotted conversion entity, which keeps the raw Decimal and datetime values and formats them when read,
+with the previous entity shape, a plain class formatting every field in __init__. Reports the memory held by the
+built entities and the time to build them, to read only their status and to serialize them with to_dict.
+
+Builds the entities in memory, no database is needed.
+
+    python -m testcases.benchmarks.bench_entity_slots --entities 10000 --repeat 5
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+
+from domain.entities.conversion import Conversion
+from utils.general import datetime_to_str
+
+CREATED_AT = datetime(2022, 1, 12, 4, 10, 54)
+
+
+class EagerConversion:
+    # The conversion entity before the slots, every field is formatted when the entity is built
+
+    def __init__(self, row_id, id, wallet_pair_id, deposit_amount, claim_amount, fee_amount, status,
+                 claim_signature, created_by, created_at, updated_at):
+        self.row_id = int(row_id)
+        self.id = id
+        self.wallet_pair_id = int(wallet_pair_id)
+        self.deposit_amount = str(deposit_amount.normalize())
+        self.claim_amount = str(claim_amount.normalize())
+        self.fee_amount = str(fee_amount.normalize())
+        self.status = status
+        self.claim_signature = claim_signature
+        self.created_by = created_by
+        self.created_at = datetime_to_str(created_at)
+        self.updated_at = datetime_to_str(updated_at)
+
+    def to_dict(self):
+        return {"row_id": self.row_id, "id": self.id, "wallet_pair_id": self.wallet_pair_id,
+                "deposit_amount": self.deposit_amount, "claim_amount": self.claim_amount,
+                "fee_amount": self.fee_amount, "status": self.status, "claim_signature": self.claim_signature,
+                "created_by": self.created_by, "created_at": self.created_at, "updated_at": self.updated_at}
+
+
+def build(entity_class, entities):
+    return [entity_class(row_id=row_id, id=f"conversion_{row_id}", wallet_pair_id=row_id,
+                         deposit_amount=Decimal("1333.000000"), claim_amount=Decimal("1316.000000"),
+                         fee_amount=Decimal("17.000000"), status="USER_INITIATED", claim_signature=None,
+                         created_by="TestCase", created_at=CREATED_AT, updated_at=CREATED_AT)
+            for row_id in range(1, entities + 1)]
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main(entities, repeat):
+    assert [conversion.to_dict() for conversion in build(Conversion, 10)] == \
+           [conversion.to_dict() for conversion in build(EagerConversion, 10)]
+
+    print(f"{'entity':>8} {'held KiB':>9} {'build ms':>9} {'status ms':>10} {'to_dict ms':>11}")
+    for name, entity_class in [("eager", EagerConversion), ("slotted", Conversion)]:
+        tracemalloc.start()
+        conversions = build(entity_class, entities)
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        build_ms = timed(lambda: build(entity_class, entities), repeat)
+        status_ms = timed(lambda: [conversion.status for conversion in conversions], repeat)
+        to_dict_ms = timed(lambda: [conversion.to_dict() for conversion in conversions], repeat)
+        print(f"{name:>8} {held / 1024:>9.1f} {build_ms:>9.1f} {status_ms:>10.2f} {to_dict_ms:>11.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entities", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    main(entities=arguments.entities, repeat=arguments.repeat)
@@ -0,0 +1,149 @@
+"""
+Compares serializing a conversion history page through to_dict and the dict response builders with the
+row path mapping the selected columns straight to the response, in time and in memory allocated per page.
+
+Builds the entities in memory, no database is needed.
+
+    python -m testcases.benchmarks.bench_history_serialization --rows 20 --repeat 1000
+"""
+import argparse
+import time
+from collections import namedtuple
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+
+from application.service.conversion_response import get_conversion_history_rows_response, \
+    get_conversion_history_for_conversion_response, get_wallet_pair_response, get_token_response
+from constants.entity import ConversionDetailEntities
+from domain.entities.blockchain import Blockchain
+from domain.entities.conversion import Conversion
+from domain.entities.conversion_detail import ConversionDetail
+from domain.entities.conversion_fee import ConversionFee
+from domain.entities.token import Token
+from domain.entities.token_pair import TokenPair
+from domain.entities.trading_view import TradingView
+from domain.entities.wallet_pair import WalletPair
+from utils.general import get_response_from_entities
+
+CREATED_AT = datetime(2022, 1, 12, 4, 10, 54)
+HistoryRow = namedtuple("HistoryRow", [
+    "row_id", "id", "deposit_amount", "claim_amount", "fee_amount", "status", "status_rank", "created_at",
+    "updated_at", "from_address", "to_address", "deposit_address", "from_token_name", "from_token_symbol",
+    "from_token_logo", "from_token_allowed_decimal", "from_blockchain_name", "from_blockchain_symbol",
+    "from_blockchain_logo", "from_blockchain_chain_id", "to_token_name", "to_token_symbol", "to_token_logo",
+    "to_token_allowed_decimal", "to_blockchain_name", "to_blockchain_symbol", "to_blockchain_logo",
+    "to_blockchain_chain_id"])
+
+
+def token(row_id, name, symbol, blockchain_name, chain_id):
+    blockchain = Blockchain(id=f"blockchain_{row_id}", name=blockchain_name, description=blockchain_name,
+                            symbol=symbol, logo="https://ropsten.etherscan.io/images/main/empty-token.png",
+                            chain_id=chain_id, block_confirmation=25, is_extension_available=True,
+                            created_by="TestCase", created_at=CREATED_AT, updated_at=CREATED_AT)
+    trading_view = TradingView(row_id=row_id, id_=f"trading_view_{row_id}", symbol=symbol, alt_text=symbol,
+                               created_at=CREATED_AT, updated_at=CREATED_AT)
+    return Token(row_id=row_id, id_=f"token_{row_id}", name=name, description=name, symbol=symbol,
+                 logo="https://ropsten.etherscan.io/images/main/empty-token.png", allowed_decimal=8,
+                 token_address="0xA1e841e8F770E5c9507E2f8cfd0aA6f73009715d",
+                 contract_address="0xacontractaddress", created_by="TestCase", created_at=CREATED_AT,
+                 updated_at=CREATED_AT, blockchain_obj=blockchain, trading_view_obj=trading_view)
+
+
+def history_page(rows):
+    from_token = token(row_id=1, name="Singularity Ethereum", symbol="AGIX", blockchain_name="Ethereum",
+                       chain_id=5)
+    to_token = token(row_id=2, name="Singularity Cardano", symbol="AGIX", blockchain_name="Cardano", chain_id=2)
+    conversion_fee = ConversionFee(id="conversion_fee", percentage_from_source=Decimal("1.5"), token_obj=from_token,
+                                   created_by="TestCase", created_at=CREATED_AT, updated_at=CREATED_AT)
+    history = []
+    for row_id in range(1, rows + 1):
+        token_pair = TokenPair(row_id=1, id_="token_pair", min_value=Decimal("10"), max_value=Decimal("100000000"),
+                               created_by="TestCase", created_at=CREATED_AT, updated_at=CREATED_AT,
+                               from_token_obj=from_token, to_token_obj=to_token, conversion_fee_obj=conversion_fee,
+                               conversion_ratio=Decimal("1"), is_liquid=False, ada_threshold=None)
+        wallet_pair = WalletPair(row_id=row_id, id=f"wallet_pair_{row_id}", token_pair_id=1,
+                                 from_address="0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1",
+                                 to_address="addr_test1qza8485avt2xn3vy63plawqt0gk3ykpf98wusc4qrml2avu0pkm5rp3pkz6q4",
+                                 deposit_address=None, deposit_address_detail=None, signature="signature",
+                                 signature_metadata={}, signature_expiry=None, created_by="TestCase",
+                                 created_at=CREATED_AT, updated_at=CREATED_AT)
+        conversion = Conversion(row_id=row_id, id=f"conversion_{row_id}", wallet_pair_id=row_id,
+                                deposit_amount=Decimal("1333.000000"), claim_amount=Decimal("1316.000000"),
+                                fee_amount=Decimal("17.000000"), status="USER_INITIATED", claim_signature=None,
+                                created_by="TestCase", created_at=CREATED_AT, updated_at=CREATED_AT)
+        history.append(ConversionDetail(conversion_obj=conversion, wallet_pair_obj=wallet_pair,
+                                        from_token_obj=from_token, to_token_obj=to_token, token_pair_obj=token_pair))
+    return history
+
+
+def history_rows(history):
+    # The columns the history query selects for the same page
+    rows = []
+    for conversion_detail in history:
+        conversion = conversion_detail.conversion_obj
+        wallet_pair = conversion_detail.wallet_pair_obj
+        from_token = conversion_detail.from_token_obj
+        to_token = conversion_detail.to_token_obj
+        rows.append(HistoryRow(
+            conversion.row_id, conversion.id, Decimal("1333.000000"), Decimal("1316.000000"), Decimal("17.000000"),
+            "USER_INITIATED", 1, CREATED_AT, CREATED_AT, wallet_pair.from_address, wallet_pair.to_address,
+            wallet_pair.deposit_address, from_token.name, from_token.symbol, from_token.logo, 8,
+            from_token.blockchain_obj.name, from_token.blockchain_obj.symbol, from_token.blockchain_obj.logo,
+            from_token.blockchain_obj.chain_id, to_token.name, to_token.symbol, to_token.logo, 8,
+            to_token.blockchain_obj.name, to_token.blockchain_obj.symbol, to_token.blockchain_obj.logo,
+            to_token.blockchain_obj.chain_id))
+    return rows
+
+
+def to_dict_path(history):
+    return [{
+        ConversionDetailEntities.CONVERSION.value: get_conversion_history_for_conversion_response(
+            conversion[ConversionDetailEntities.CONVERSION.value]),
+        ConversionDetailEntities.WALLET_PAIR.value: get_wallet_pair_response(
+            conversion[ConversionDetailEntities.WALLET_PAIR.value]),
+        ConversionDetailEntities.FROM_TOKEN.value: get_token_response(
+            conversion[ConversionDetailEntities.FROM_TOKEN.value]),
+        ConversionDetailEntities.TO_TOKEN.value: get_token_response(
+            conversion[ConversionDetailEntities.TO_TOKEN.value])
+    } for conversion in get_response_from_entities(history)]
+
+
+def row_path(rows):
+    return get_conversion_history_rows_response(rows)
+
+
+def measure(func, page, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(page)
+    elapsed_us = (time.perf_counter() - start) * 1000000 / repeat
+
+    tracemalloc.start()
+    func(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_us, peak
+
+
+def main(rows, repeat):
+    tracemalloc.start()
+    history = history_page(rows)
+    entities_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    page_rows = history_rows(history)
+    assert to_dict_path(history) == row_path(page_rows)
+    print(f"{rows} rows of entities hold {entities_size / 1024:.1f} KiB")
+
+    print(f"{'path':>10} {'us per page':>12} {'peak KiB':>9}")
+    for name, func, page in [("to_dict", to_dict_path, history), ("row", row_path, page_rows)]:
+        elapsed_us, peak = measure(func, page, repeat)
+        print(f"{name:>10} {elapsed_us:>12.1f} {peak / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=1000)
+    arguments = parser.parse_args()
+    main(rows=arguments.rows, repeat=arguments.repeat)
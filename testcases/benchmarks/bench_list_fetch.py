@@ -0,0 +1,200 @@
+"""
+Compares the ORM path (joinedload graphs hydrated into domain entities, then to the response) with the row path
+(only the response columns, mapped straight to the response) for the read-only list queries: conversion history,
+transactions of conversions and all deposit addresses. Reports rows/sec and the peak memory of one call.
+
+Runs against the database configured in config.py and deletes every row of the conversion tables,
+never point it at a shared database.
+
+    python -m testcases.benchmarks.bench_list_fetch --conversions 10000 --page-size 500
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+
+from application.service.conversion_response import get_conversion_history_for_conversion_response, \
+    get_wallet_pair_response, get_token_response, get_conversion_history_rows_response, get_transaction_response, \
+    get_transaction_rows_response
+from constants.entity import ConversionDetailEntities
+from constants.status import ConversionStatus, TransactionVisibility, TransactionOperation, TransactionStatus, \
+    ConversionTransactionStatus
+from domain.factory.conversion_factory import ConversionFactory
+from domain.factory.wallet_pair_factory import WalletPairFactory
+from infrastructure.models import WalletPairDBModel, ConversionDBModel, WalletPairAddressDBModel, \
+    ConversionTransactionDBModel, TransactionDBModel, TokenDBModel, get_conversion_status_rank
+from infrastructure.repositories.conversion_repository import ConversionRepository
+from infrastructure.repositories.wallet_pair_repository import WalletPairRepository
+from testcases.benchmarks.seed import seed_reference_data, seed_wallet_pairs, seed_conversions, delete_all_tables, \
+    insert_in_chunks, BENCHMARK_CREATED_BY
+from utils.general import get_response_from_entities, get_uuid
+
+ADDRESS = "0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1"
+OTHER_ADDRESS = "addr_test1qza8485avt2xn3vy63plawqt0gk3ykpf98wusc4qrml2avu0pkm5rp3pkz6q4n3kf8znlf3y749lll8lfmg5x86kgt8qju7vx8"
+
+conversion_repo = ConversionRepository()
+wallet_pair_repo = WalletPairRepository()
+
+
+def orm_conversion_history(session, page_size):
+    wallet_pair_ids = select(WalletPairAddressDBModel.wallet_pair_id) \
+        .where(WalletPairAddressDBModel.address == ADDRESS)
+    conversions = session.query(ConversionDBModel) \
+        .filter(ConversionDBModel.wallet_pair_id.in_(wallet_pair_ids)) \
+        .order_by(ConversionDBModel.created_at.desc()) \
+        .options(joinedload(ConversionDBModel.wallet_pair)) \
+        .options(joinedload(ConversionDBModel.wallet_pair).joinedload(WalletPairDBModel.token_pair)) \
+        .limit(page_size).all()
+    history = get_response_from_entities([ConversionFactory.conversion_detail(conversion)
+                                          for conversion in conversions])
+    response = [{
+        ConversionDetailEntities.CONVERSION.value: get_conversion_history_for_conversion_response(
+            conversion[ConversionDetailEntities.CONVERSION.value]),
+        ConversionDetailEntities.WALLET_PAIR.value: get_wallet_pair_response(
+            conversion[ConversionDetailEntities.WALLET_PAIR.value]),
+        ConversionDetailEntities.FROM_TOKEN.value: get_token_response(
+            conversion[ConversionDetailEntities.FROM_TOKEN.value]),
+        ConversionDetailEntities.TO_TOKEN.value: get_token_response(
+            conversion[ConversionDetailEntities.TO_TOKEN.value])
+    } for conversion in history]
+    session.commit()
+    return len(response)
+
+
+def row_conversion_history(session, page_size):
+    rows, _ = conversion_repo.get_conversion_history_page(address=ADDRESS, blockchain_name=None, token_symbol=None,
+                                                          conversion_status=None, limit=page_size)
+    return len(get_conversion_history_rows_response(rows))
+
+
+def orm_transactions(session, conversion_row_ids):
+    transactions = session.query(TransactionDBModel) \
+        .join(ConversionTransactionDBModel,
+              ConversionTransactionDBModel.row_id == TransactionDBModel.conversion_transaction_id) \
+        .filter(ConversionTransactionDBModel.conversion_id.in_(conversion_row_ids),
+                ConversionTransactionDBModel.status != ConversionTransactionStatus.FAILED.value) \
+        .order_by(TransactionDBModel.row_id, TransactionDBModel.created_at.asc()) \
+        .options(joinedload(TransactionDBModel.token).joinedload(TokenDBModel.blockchain_detail)) \
+        .options(joinedload(TransactionDBModel.conversion_transaction)
+                 .noload(ConversionTransactionDBModel.conversion)).all()
+    response = get_transaction_response(get_response_from_entities(
+        [ConversionFactory.transaction_detail(transaction=transaction) for transaction in transactions]))
+    session.commit()
+    return len(response)
+
+
+def row_transactions(session, conversion_row_ids):
+    rows = conversion_repo.get_transaction_rows_for_conversion_row_ids(conversion_row_ids=conversion_row_ids)
+    return len(get_transaction_rows_response(rows))
+
+
+def orm_deposit_addresses(session):
+    wallet_pairs = session.query(WalletPairDBModel.row_id, WalletPairDBModel.id,
+                                 WalletPairDBModel.token_pair_id, WalletPairDBModel.from_address,
+                                 WalletPairDBModel.to_address, WalletPairDBModel.deposit_address,
+                                 WalletPairDBModel.deposit_address_detail, WalletPairDBModel.signature,
+                                 WalletPairDBModel.signature_metadata, WalletPairDBModel.signature_expiry,
+                                 WalletPairDBModel.created_by, WalletPairDBModel.created_at,
+                                 WalletPairDBModel.updated_at) \
+        .join(ConversionDBModel, ConversionDBModel.wallet_pair_id == WalletPairDBModel.row_id) \
+        .filter(ConversionDBModel.status == ConversionStatus.USER_INITIATED.value) \
+        .filter(WalletPairDBModel.deposit_address.isnot(None)).all()
+    addresses = [WalletPairFactory.wallet_pair(**wallet_pair._asdict()).to_dict()["deposit_address"]
+                 for wallet_pair in wallet_pairs]
+    session.commit()
+    return len(addresses)
+
+
+def row_deposit_addresses(session):
+    return len([wallet_pair.deposit_address for wallet_pair in wallet_pair_repo.get_all_deposit_address()])
+
+
+def seed_transactions(session, conversion_row_ids, token_id):
+    now = datetime.utcnow()
+    conversion_transactions = [{"row_id": row_id, "id": get_uuid(), "conversion_id": row_id,
+                                "status": ConversionTransactionStatus.PROCESSING.value,
+                                "created_by": BENCHMARK_CREATED_BY, "created_at": now, "updated_at": now}
+                               for row_id in conversion_row_ids]
+    insert_in_chunks(session, ConversionTransactionDBModel.__table__, conversion_transactions)
+    transactions = [{"id": get_uuid(), "conversion_transaction_id": row_id, "token_id": token_id,
+                     "transaction_visibility": TransactionVisibility.EXTERNAL.value,
+                     "transaction_operation": TransactionOperation.TOKEN_RECEIVED.value,
+                     "transaction_hash": get_uuid(), "transaction_amount": 1000, "confirmation": 0,
+                     "status": TransactionStatus.WAITING_FOR_CONFIRMATION.value, "created_by": BENCHMARK_CREATED_BY,
+                     "created_at": now, "updated_at": now}
+                    for row_id in conversion_row_ids for _ in range(2)]
+    insert_in_chunks(session, TransactionDBModel.__table__, transactions)
+
+
+def seed(session, conversions, page_size):
+    variables = seed_reference_data(session)
+    wallet_pair_ids = seed_wallet_pairs(session, addresses=[(ADDRESS, OTHER_ADDRESS)],
+                                        token_pair_ids=[variables.token_pair_row_id_1])
+    other_wallet_pair_ids = seed_wallet_pairs(session, addresses=[(f"0x{index:040x}", f"addr_test1{index:0100d}")
+                                                                  for index in range(page_size)],
+                                              token_pair_ids=[variables.token_pair_row_id_1],
+                                              start_row_id=len(wallet_pair_ids) + 1)
+    session.query(WalletPairDBModel).update({WalletPairDBModel.deposit_address: func.concat(
+        "addr_deposit_", WalletPairDBModel.row_id)}, synchronize_session=False)
+    session.commit()
+    seed_conversions(session, wallet_pair_ids=wallet_pair_ids, count=conversions)
+    # One USER_INITIATED conversion for every other wallet pair to list their deposit addresses
+    seed_conversions(session, wallet_pair_ids=other_wallet_pair_ids, count=len(other_wallet_pair_ids),
+                     start_row_id=conversions + 1)
+    session.query(ConversionDBModel).filter(ConversionDBModel.row_id > conversions) \
+        .update({ConversionDBModel.status: ConversionStatus.USER_INITIATED.value,
+                 ConversionDBModel.status_rank: get_conversion_status_rank(ConversionStatus.USER_INITIATED.value)},
+                synchronize_session=False)
+    session.commit()
+
+    conversion_row_ids = list(range(1, page_size + 1))
+    seed_transactions(session, conversion_row_ids=conversion_row_ids, token_id=variables.token_row_id_1)
+    session.execute("ANALYZE TABLE wallet_pair, wallet_pair_address, conversion, conversion_transaction, "
+                    "transaction")
+    session.commit()
+    return conversion_row_ids
+
+
+def measure(func, repeat):
+    rows = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows += func()
+    rows_per_second = rows / (time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows_per_second, peak
+
+
+def main(conversions, page_size, repeat):
+    session = conversion_repo.session
+    delete_all_tables(session)
+    conversion_row_ids = seed(session, conversions, page_size)
+
+    print(f"{'query':>20} {'path':>5} {'rows/sec':>10} {'peak KiB':>9}")
+    for name, orm_path, row_path in [
+        ("conversion history", lambda: orm_conversion_history(session, page_size),
+         lambda: row_conversion_history(session, page_size)),
+        ("transactions", lambda: orm_transactions(session, conversion_row_ids),
+         lambda: row_transactions(session, conversion_row_ids)),
+        ("deposit addresses", lambda: orm_deposit_addresses(session), lambda: row_deposit_addresses(session))]:
+        for path, func in [("orm", orm_path), ("row", row_path)]:
+            rows_per_second, peak = measure(func, repeat=repeat)
+            print(f"{name:>20} {path:>5} {rows_per_second:>10.0f} {peak / 1024:>9.1f}")
+
+    delete_all_tables(session)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--conversions", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    main(conversions=arguments.conversions, page_size=arguments.page_size, repeat=arguments.repeat)
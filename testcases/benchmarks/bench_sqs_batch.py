@@ -0,0 +1,74 @@
+"""
+Feeds synthetic SQS batches of cardano events to converter_event_consumer and reports messages/sec for each batch
+size, with a fixed overhead added per invocation to stand in for the lambda invoke and poll round trip.
+A share of the records is malformed to check that only those come back in batchItemFailures.
+
+Runs against the database configured in config.py and deletes every row of the conversion tables,
+never point it at a shared database.
+
+    python -m testcases.benchmarks.bench_sqs_batch --messages 1000 --batch-sizes 1 5 10 --invocation-overhead-ms 20
+"""
+import argparse
+import time
+from unittest.mock import patch
+
+from application.handler.consumer_handlers import converter_event_consumer
+from application.service.wallet_pair_service import deposit_address_cache
+from infrastructure.repositories.conversion_repository import ConversionRepository
+from testcases.benchmarks.seed import seed_reference_data, delete_all_tables
+from testcases.functional_testcases.test_variables import prepare_consumer_cardano_event_format
+
+conversion_repo = ConversionRepository()
+
+
+def message(index, failure_every):
+    if failure_every and index % failure_every == 0:
+        return {"hack": "test"}
+    return {"tx_hash": f"tx_hash_{index}", "address": f"addr_unknown_{index}",
+            "transaction_detail": {"tx_type": "TOKEN_RECEIVED", "tx_amount": "10000"}}
+
+
+def batches(messages, batch_size, failure_every):
+    records = [dict(prepare_consumer_cardano_event_format(message(index, failure_every))["Records"][0],
+                    messageId=f"message_id_{index}") for index in range(1, messages + 1)]
+    return [{"Records": records[index:index + batch_size]} for index in range(0, len(records), batch_size)]
+
+
+def measure(events, invocation_overhead):
+    failures = 0
+    start = time.perf_counter()
+    for event in events:
+        time.sleep(invocation_overhead)
+        try:
+            response = converter_event_consumer(event, {})
+            failures += len(response["batchItemFailures"])
+        except Exception:
+            failures += len(event["Records"])
+    return time.perf_counter() - start, failures
+
+
+def main(messages, batch_sizes, invocation_overhead_ms, failure_every):
+    session = conversion_repo.session
+    delete_all_tables(session)
+    seed_reference_data(session)
+    deposit_address_cache.invalidate()
+
+    print(f"{'batch size':>10} {'invocations':>11} {'messages/sec':>12} {'failures':>8}")
+    with patch("common.utils.Utils.report_slack"):
+        for batch_size in batch_sizes:
+            events = batches(messages, batch_size, failure_every)
+            elapsed, failures = measure(events, invocation_overhead_ms / 1000)
+            print(f"{batch_size:>10} {len(events):>11} {messages / elapsed:>12.0f} {failures:>8}")
+
+    delete_all_tables(session)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--invocation-overhead-ms", type=float, default=20)
+    parser.add_argument("--failure-every", type=int, default=50)
+    arguments = parser.parse_args()
+    main(messages=arguments.messages, batch_sizes=arguments.batch_sizes,
+         invocation_overhead_ms=arguments.invocation_overhead_ms, failure_every=arguments.failure_every)
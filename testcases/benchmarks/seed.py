@@ -0,0 +1,108 @@
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import aliased
+
+from constants.general import WalletPairAddressSide
+from constants.status import ConversionStatus
+from infrastructure.models import TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, \
+    WalletPairDBModel, ConversionDBModel, TransactionDBModel, ConversionTransactionDBModel, WalletPairAddressDBModel, \
+    ConsumerEventLedgerDBModel
+from testcases.functional_testcases.test_variables import TestVariables
+from utils.general import get_uuid
+
+INSERT_CHUNK_SIZE = 10000
+BENCHMARK_CREATED_BY = "Benchmark"
+STATUSES = [status.value for status in ConversionStatus]
+
+
+def seed_reference_data(session):
+    variables = TestVariables()
+    for records in [variables.blockchain, variables.token, variables.conversion_fee, variables.token_pair]:
+        session.add_all(records)
+        session.commit()
+    return variables
+
+
+def insert_in_chunks(session, table, rows):
+    for index in range(0, len(rows), INSERT_CHUNK_SIZE):
+        session.execute(table.insert(), rows[index:index + INSERT_CHUNK_SIZE])
+        session.commit()
+
+
+def seed_wallet_pairs(session, addresses, token_pair_ids, start_row_id=1):
+    rows = []
+    row_id = start_row_id
+    for from_address, to_address in addresses:
+        for token_pair_id in token_pair_ids:
+            rows.append({"row_id": row_id, "id": get_uuid(), "token_pair_id": token_pair_id,
+                         "from_address": from_address, "to_address": to_address, "signature": "0x",
+                         "signature_metadata": {}, "created_by": BENCHMARK_CREATED_BY,
+                         "created_at": datetime(2022, 1, 1) + timedelta(seconds=row_id),
+                         "updated_at": datetime(2022, 1, 1) + timedelta(seconds=row_id)})
+            row_id += 1
+    insert_in_chunks(session, WalletPairDBModel.__table__, rows)
+    seed_wallet_pair_addresses(session, rows)
+    return [row["row_id"] for row in rows]
+
+
+def seed_wallet_pair_addresses(session, wallet_pair_rows):
+    rows = []
+    for wallet_pair in wallet_pair_rows:
+        for address, side in [(wallet_pair["from_address"], WalletPairAddressSide.FROM.value),
+                              (wallet_pair["to_address"], WalletPairAddressSide.TO.value)]:
+            rows.append({"address": address, "wallet_pair_id": wallet_pair["row_id"], "side": side,
+                         "wallet_pair_created_at": wallet_pair["created_at"]})
+    insert_in_chunks(session, WalletPairAddressDBModel.__table__, rows)
+
+
+def get_conversion_chain_columns(session, wallet_pair_ids):
+    from_token = aliased(TokenDBModel)
+    to_token = aliased(TokenDBModel)
+    wallet_pairs = session.query(WalletPairDBModel.row_id, from_token.row_id.label("from_token_id"),
+                                 to_token.row_id.label("to_token_id"),
+                                 from_token.blockchain_id.label("from_blockchain_id"),
+                                 to_token.blockchain_id.label("to_blockchain_id")) \
+        .join(TokenPairDBModel, TokenPairDBModel.row_id == WalletPairDBModel.token_pair_id) \
+        .join(from_token, from_token.row_id == TokenPairDBModel.from_token_id) \
+        .join(to_token, to_token.row_id == TokenPairDBModel.to_token_id) \
+        .filter(WalletPairDBModel.row_id.in_(wallet_pair_ids)).all()
+    return {wallet_pair.row_id: {"from_token_id": wallet_pair.from_token_id, "to_token_id": wallet_pair.to_token_id,
+                                 "from_blockchain_id": wallet_pair.from_blockchain_id,
+                                 "to_blockchain_id": wallet_pair.to_blockchain_id} for wallet_pair in wallet_pairs}
+
+
+def seed_conversions(session, wallet_pair_ids, count, start_row_id=1):
+    rows = []
+    start = datetime(2022, 1, 1)
+    chain_columns = get_conversion_chain_columns(session, wallet_pair_ids)
+    for offset in range(count):
+        created_at = start + timedelta(seconds=offset * 7)
+        wallet_pair_id = wallet_pair_ids[offset % len(wallet_pair_ids)]
+        rows.append({"row_id": start_row_id + offset, "id": get_uuid(), "wallet_pair_id": wallet_pair_id,
+                     **chain_columns[wallet_pair_id],
+                     "deposit_amount": 1000 + offset, "claim_amount": 1000 + offset, "fee_amount": 0,
+                     "status": STATUSES[offset % len(STATUSES)], "created_by": BENCHMARK_CREATED_BY,
+                     "created_at": created_at, "updated_at": created_at})
+        if len(rows) == INSERT_CHUNK_SIZE:
+            insert_in_chunks(session, ConversionDBModel.__table__, rows)
+            rows = []
+    insert_in_chunks(session, ConversionDBModel.__table__, rows)
+
+
+def delete_all_tables(session):
+    for model in [TransactionDBModel, ConversionTransactionDBModel, ConversionDBModel, WalletPairAddressDBModel,
+                  WalletPairDBModel, TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel,
+                  ConsumerEventLedgerDBModel]:
+        session.query(model).delete()
+        session.commit()
+
+
+def measure(func, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
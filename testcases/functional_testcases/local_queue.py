@@ -0,0 +1,31 @@
+from constants.lambdas import SQSBatchParamType
+
+
+class LocalQueue:
+    # Stands in for the SQS queues on a fake clock, a message is received only once its delay has passed
+
+    def __init__(self):
+        self.now = 0
+        self.messages = []
+        self.sent = 0
+
+    def send_message_to_queue(self, queue, message, message_group_id, delay_seconds=None):
+        self.sent += 1
+        record = {SQSBatchParamType.MESSAGE_ID.value: f"message_id_{self.sent}", "body": message,
+                  SQSBatchParamType.ATTRIBUTES.value: {}}
+        if message_group_id:
+            record[SQSBatchParamType.ATTRIBUTES.value][SQSBatchParamType.MESSAGE_GROUP_ID.value] = message_group_id
+        self.messages.append({"queue": queue, "visible_at": self.now + (delay_seconds or 0), "record": record})
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def receive(self, queue, batch_size=10):
+        visible = [message for message in self.messages
+                   if message["queue"] == queue and message["visible_at"] <= self.now][:batch_size]
+        for message in visible:
+            self.messages.remove(message)
+        return {SQSBatchParamType.RECORDS.value: [message["record"] for message in visible]}
+
+    def pending(self, queue):
+        return [message for message in self.messages if message["queue"] == queue]
@@ -4,8 +4,10 @@ from unittest.mock import patch
 
 from application.handler.blockchain_handlers import get_all_blockchain
 from infrastructure.models import BlockChainDBModel, TransactionDBModel, ConversionTransactionDBModel, \
-    ConversionDBModel, WalletPairDBModel, TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, MessageGroupPoolDBModel
-from infrastructure.repositories.blockchain_repository import BlockchainRepository
+    ConversionDBModel, WalletPairDBModel, TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, MessageGroupPoolDBModel, \
+    WalletPairAddressDBModel
+from infrastructure.repositories.blockchain_repository import BlockchainRepository, blockchain_cache
+from infrastructure.repositories.token_repository import token_pair_cache
 from testcases.functional_testcases.test_variables import TestVariables
 
 blockchain_repo = BlockchainRepository()
@@ -46,12 +48,16 @@ class TestBlockchain(unittest.TestCase):
         self.assertEqual(body, success_response_2)
 
     def tearDown(self):
+        token_pair_cache.clear()
+        blockchain_cache.clear()
         blockchain_repo.session.query(TransactionDBModel).delete()
         blockchain_repo.session.commit()
         blockchain_repo.session.query(ConversionTransactionDBModel).delete()
         blockchain_repo.session.commit()
         blockchain_repo.session.query(ConversionDBModel).delete()
         blockchain_repo.session.commit()
+        blockchain_repo.session.query(WalletPairAddressDBModel).delete()
+        blockchain_repo.session.commit()
         blockchain_repo.session.query(WalletPairDBModel).delete()
         blockchain_repo.session.commit()
         blockchain_repo.session.query(TokenPairDBModel).delete()
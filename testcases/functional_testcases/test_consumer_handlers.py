@@ -1,18 +1,28 @@
 import json
 import unittest
-from unittest.mock import patch
+from datetime import datetime, timedelta
+from unittest.mock import patch, Mock
+
+from blockfrost.utils import ApiError as BlockfrostApiError
 
 from application.handler.consumer_handlers import converter_event_consumer, converter_bridge, \
-    post_converter_ethereum_events_to_queue
+    post_converter_ethereum_events_to_queue, check_pending_submissions
+from application.service.wallet_pair_service import deposit_address_cache
 from constants.error_details import ErrorCode, ErrorDetails
-from constants.status import ConversionTransactionStatus, TransactionVisibility, TransactionOperation, TransactionStatus
+from constants.status import ConversionTransactionStatus, TransactionVisibility, TransactionOperation, TransactionStatus, \
+    PendingSubmissionStatus, ConsumerEventOutcome
 from infrastructure.models import TransactionDBModel, ConversionTransactionDBModel, ConversionDBModel, \
-    WalletPairDBModel, TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, MessageGroupPoolDBModel
+    WalletPairDBModel, TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, MessageGroupPoolDBModel, \
+    AddressStatusCountDBModel, TokenPairLiquidityDBModel, TokenPairFrozenLiquidityDBModel, WalletPairAddressDBModel, \
+    PendingSubmissionDBModel, ConsumerEventLedgerDBModel
 from infrastructure.repositories.conversion_repository import ConversionRepository
+from infrastructure.repositories.blockchain_repository import blockchain_cache
+from infrastructure.repositories.token_repository import token_pair_cache
+from testcases.functional_testcases.local_queue import LocalQueue
 from testcases.functional_testcases.test_variables import TestVariables, consumer_token_received_event_message, \
     prepare_consumer_cardano_event_format, prepare_converter_bridge_event_format, \
     prepare_consumer_ethereum_event_format, create_conversion_transaction, DAPP_AS_CREATED_BY, create_transaction
-from utils.exceptions import InternalServerErrorException, BlockConfirmationNotEnoughException, BadRequestException
+from utils.exceptions import InternalServerErrorException, BadRequestException
 
 conversion_repo = ConversionRepository()
 
@@ -35,6 +45,8 @@ class TestConsumer(unittest.TestCase):
         conversion_repo.session.commit()
         conversion_repo.session.add_all(TestVariables().wallet_pair)
         conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().wallet_pair_address)
+        conversion_repo.session.commit()
         conversion_repo.session.add_all(TestVariables().conversion)
         conversion_repo.session.commit()
 
@@ -115,7 +127,7 @@ class TestConsumer(unittest.TestCase):
         response = converter_event_consumer(prepare_consumer_cardano_event_format(
             {"tx_hash": "random hash", "address": "random address",
              "transaction_detail": {"tx_type": "TOKEN_RECEIVED", "tx_amount": "10000"}}), {})
-        self.assertEqual(response, None)
+        self.assertEqual(response, {"batchItemFailures": []})
 
         # Policy id and asset name not provided
         response = converter_event_consumer(prepare_consumer_cardano_event_format(
@@ -123,18 +135,31 @@ class TestConsumer(unittest.TestCase):
              "address": "addr_test1qza8485avt2xn3vy63plawqt0gk3ykpf98wusc4qrml2avu0pkm5rp3pkz6q4n3kf8znlf3y749lll8lfmg5x86kgt8qju7vx8",
              "transaction_detail": {"tx_type": "TOKEN_RECEIVED",
                                     "tx_amount": "1E+8"}}), {})
-        self.assertEqual(response, None)
+        self.assertEqual(response, {"batchItemFailures": []})
+
+        # Only the record which failed is reported back when the batch has more than one record
+        records = [dict(record, messageId=message_id) for message_id, message in [
+            ("message_id_1", {"hack": "test"}),
+            ("message_id_2", {"tx_hash": "random hash", "address": "random address",
+                              "transaction_detail": {"tx_type": "TOKEN_RECEIVED", "tx_amount": "10000"}})]
+                   for record in prepare_consumer_cardano_event_format(message)["Records"]]
+        response = converter_event_consumer({"Records": records}, {})
+        self.assertEqual(response, {"batchItemFailures": [{"itemIdentifier": "message_id_1"}]})
 
         # valid request
-        # Blockchain confirmation not enough error  when block confirmation not meet
-        self.assertRaises(BlockConfirmationNotEnoughException, converter_event_consumer,
-                          prepare_consumer_cardano_event_format(
-                              {"tx_hash": "1667dce54e1729aec07ab11342f2464335d6542530102e64f7dc47847f669449",
-                               "address": "addr_test1qza8485avt2xn3vy63plawqt0gk3ykpf98wusc4qrml2avu0pkm5rp3pkz6q4n3kf8znlf3y749lll8lfmg5x86kgt8qju7vx8",
-                               "asset": {"policy_id": "ae8a0b54484418a3db56f4e9b472d51cbc860667489366ba6e150c8a",
-                                         "asset_name": "41474958"},
-                               "transaction_detail": {"tx_type": "TOKEN_RECEIVED",
-                                                      "tx_amount": "1E+8"}}), {})
+        # Event enqueued again with a delay when block confirmation not meet
+        blockchain_event = {"tx_hash": "1667dce54e1729aec07ab11342f2464335d6542530102e64f7dc47847f669449",
+                            "address": "addr_test1qza8485avt2xn3vy63plawqt0gk3ykpf98wusc4qrml2avu0pkm5rp3pkz6q4n3kf8znlf3y749lll8lfmg5x86kgt8qju7vx8",
+                            "asset": {"policy_id": "ae8a0b54484418a3db56f4e9b472d51cbc860667489366ba6e150c8a",
+                                      "asset_name": "41474958"},
+                            "transaction_detail": {"tx_type": "TOKEN_RECEIVED", "tx_amount": "1E+8"}}
+        response = converter_event_consumer(prepare_consumer_cardano_event_format(blockchain_event), {})
+        self.assertEqual(response, {"batchItemFailures": []})
+        mock_send_message_to_queue.assert_called_with(queue="EVENT_CONSUMER",
+                                                      message=json.dumps({"blockchain_name": "Cardano",
+                                                                          "blockchain_event": blockchain_event,
+                                                                          "block_confirmation_attempt": 1}),
+                                                      message_group_id=None, delay_seconds=460)
         transaction = conversion_repo.session.query(TransactionDBModel).filter(
             TransactionDBModel.transaction_hash == "1667dce54e1729aec07ab11342f2464335d6542530102e64f7dc47847f669449").first()
         self.assertEqual(transaction.status, TransactionStatus.WAITING_FOR_CONFIRMATION.value)
@@ -204,7 +229,7 @@ class TestConsumer(unittest.TestCase):
                                                                                                 "event": "ConversionOut",
                                                                                                 "json_str": ""}}}),
                           {})
-        self.assertEqual(response, None)
+        self.assertEqual(response, {"batchItemFailures": []})
 
         mock_get_transaction_receipt_from_blockchain.side_effect = BadRequestException(
             error_code=ErrorCode.TRANSACTION_HASH_NOT_FOUND.value,
@@ -267,18 +292,23 @@ class TestConsumer(unittest.TestCase):
             "conversionId": b'7298bce110974411b260cac758b37ee0'
         }}]
 
-        # Not enough ethereum block confirmation
+        # Not enough ethereum block confirmation, enqueued again with the longest delay
         mock_get_transaction_receipt_from_blockchain.return_value = {"blockNumber": 1234}
         mock_get_current_block_no.return_value = 0
-        self.assertRaises(BlockConfirmationNotEnoughException, converter_event_consumer,
-                          prepare_consumer_ethereum_event_format({'blockchain_name': 'Ethereum',
-                                                                  'blockchain_event': {'name': 'ConversionOut',
-                                                                                       'data': {
-                                                                                           "transactionHash": "0x5a557f3d556601acb3d42b18e364e3389223bedaa645f92953c07277c880047c",
-                                                                                           "event": "ConversionOut",
-                                                                                           "json_str": "{'tokenHolder': '0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1', 'conversionId': b'7298bce110974411b260cac758b37ee0', 'amount': 133305000}"}}}
-                                                                 )
-                          , {})
+        response = converter_event_consumer(
+            prepare_consumer_ethereum_event_format({'blockchain_name': 'Ethereum',
+                                                    'blockchain_event': {'name': 'ConversionOut',
+                                                                         'data': {
+                                                                             "transactionHash": "0x5a557f3d556601acb3d42b18e364e3389223bedaa645f92953c07277c880047c",
+                                                                             "event": "ConversionOut",
+                                                                             "json_str": "{'tokenHolder': '0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1', 'conversionId': b'7298bce110974411b260cac758b37ee0', 'amount': 133305000}"}}}
+                                                   )
+            , {})
+        self.assertEqual(response, {"batchItemFailures": []})
+        self.assertEqual(mock_send_message_to_queue.call_args.kwargs["queue"], "EVENT_CONSUMER")
+        self.assertEqual(mock_send_message_to_queue.call_args.kwargs["delay_seconds"], 900)
+        self.assertEqual(json.loads(mock_send_message_to_queue.call_args.kwargs["message"])
+                         ["block_confirmation_attempt"], 1)
 
         # Received Enough ethereum block confirmation
         mock_get_transaction_receipt_from_blockchain.return_value = {"blockNumber": 1234}
@@ -322,7 +352,7 @@ class TestConsumer(unittest.TestCase):
                                                                                             "json_str": "{'tokenHolder': '0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1', 'conversionId': b'7298bce110974411b260cac758b37ee0', 'amount': 133305000}"}}}
                                                                                    ),
                                             {})
-        self.assertEqual(response, None)
+        self.assertEqual(response, {"batchItemFailures": []})
 
     @patch("utils.cardano_blockchain.CardanoBlockchainUtil.get_block")
     @patch("utils.cardano_blockchain.CardanoBlockchainUtil.get_transaction")
@@ -351,7 +381,7 @@ class TestConsumer(unittest.TestCase):
                                                                                'tx_amount': '1E+8',
                                                                                'tx_operation': 'TOKEN_BURNT'},
                                                                            'blockchain_network_id': 2}), {})
-        self.assertEqual(response, None)
+        self.assertEqual(response, {"batchItemFailures": []})
 
         conversion = conversion_repo.session.query(ConversionDBModel).filter(
             ConversionDBModel.id == "7298bce110974411b260cac758b37ee0").first()
@@ -382,7 +412,7 @@ class TestConsumer(unittest.TestCase):
                                                                                'tx_amount': '1E+8',
                                                                                'tx_operation': 'TOKEN_BURNT'},
                                                                            'blockchain_network_id': 2}), {})
-        self.assertEqual(response, None)
+        self.assertEqual(response, {"batchItemFailures": []})
 
         # valid request
         mock_get_block.return_value = {"confirmations": 0}
@@ -395,8 +425,133 @@ class TestConsumer(unittest.TestCase):
         transactions = conversion_repo.session.query(TransactionDBModel).all()
         self.assertEqual(len(transactions), 2)
         self.assertNotEqual(transactions[1].status, "SUCCESS")
+        # Submitted hash left to the pending submission check instead of being waited for
+        submission = conversion_repo.session.query(PendingSubmissionDBModel).one()
+        self.assertEqual((submission.transaction_hash, submission.chain_id, submission.status),
+                         ("some hash", 2, PendingSubmissionStatus.PENDING.value))
+
+    @patch("utils.cardano_blockchain.CardanoBlockchainUtil.get_transaction")
+    @patch("common.utils.Utils.report_slack")
+    def test_check_pending_submissions(self, mock_report_slack, mock_get_transaction):
+        conversion_repo.session.add_all([
+            PendingSubmissionDBModel(transaction_hash="present hash", chain_id=2,
+                                     status=PendingSubmissionStatus.PENDING.value),
+            PendingSubmissionDBModel(transaction_hash="recent hash", chain_id=2,
+                                     status=PendingSubmissionStatus.PENDING.value),
+            PendingSubmissionDBModel(transaction_hash="old hash", chain_id=2,
+                                     status=PendingSubmissionStatus.PENDING.value,
+                                     created_at=datetime.utcnow() - timedelta(hours=2)),
+            PendingSubmissionDBModel(transaction_hash="rate limited hash", chain_id=2,
+                                     status=PendingSubmissionStatus.PENDING.value,
+                                     created_at=datetime.utcnow() - timedelta(hours=2))])
+        conversion_repo.session.commit()
+
+        def api_error(status_code):
+            return BlockfrostApiError(Mock(json=lambda: {"status_code": status_code, "error": "error",
+                                                         "message": "message"}))
+
+        def get_transaction(hash):
+            if hash == "rate limited hash":
+                raise api_error(429)
+            if hash != "present hash":
+                raise api_error(404)
+            return {"hash": hash}
+
+        mock_get_transaction.side_effect = get_transaction
+        check_pending_submissions({}, {})
+
+        submissions = conversion_repo.session.query(PendingSubmissionDBModel) \
+            .order_by(PendingSubmissionDBModel.transaction_hash).all()
+        # Only a not found answer counts as absent, the rate limited submission is left pending
+        self.assertEqual([(submission.transaction_hash, submission.status) for submission in submissions],
+                         [("old hash", PendingSubmissionStatus.MISSING.value),
+                          ("rate limited hash", PendingSubmissionStatus.PENDING.value),
+                          ("recent hash", PendingSubmissionStatus.PENDING.value)])
+        self.assertEqual(mock_report_slack.call_count, 1)
+
+        # Missing submissions are not checked again
+        mock_get_transaction.reset_mock()
+        check_pending_submissions({}, {})
+        self.assertEqual(sorted(call.kwargs["hash"] for call in mock_get_transaction.call_args_list),
+                         ["rate limited hash", "recent hash"])
+
+        # A run past its time budget leaves the rest to the next run
+        mock_get_transaction.reset_mock()
+        with patch.dict("application.service.submission_service.PENDING_SUBMISSION", {"MAX_RUN_SECONDS": 0}):
+            check_pending_submissions({}, {})
+        mock_get_transaction.assert_not_called()
+
+    @patch("utils.blockchain.get_cardano_transaction_details")
+    @patch("utils.cardano_blockchain.CardanoBlockchainUtil.get_block")
+    @patch("utils.cardano_blockchain.CardanoBlockchainUtil.get_transaction")
+    @patch("utils.blockchain.validate_cardano_address")
+    @patch("common.utils.Utils.report_slack")
+    def test_block_confirmation_wait(self, mock_report_slack, mock_validate_cardano_address, mock_get_transaction,
+                                     mock_get_block, mock_get_cardano_transaction_details):
+        local_queue = LocalQueue()
+        with patch("application.service.notification_service.NotificationService.send_message_to_queue",
+                   new=local_queue.send_message_to_queue):
+            # 10 confirmations short, the progress is recorded and the event comes back after 10 cardano blocks
+            mock_get_block.return_value = {"confirmations": 13}
+            response = converter_event_consumer(
+                prepare_consumer_cardano_event_format(consumer_token_received_event_message), {})
+            self.assertEqual(response, {"batchItemFailures": []})
+            transaction = conversion_repo.session.query(TransactionDBModel).filter(
+                TransactionDBModel.transaction_hash == consumer_token_received_event_message["tx_hash"]).first()
+            self.assertEqual(transaction.status, TransactionStatus.WAITING_FOR_CONFIRMATION.value)
+            self.assertEqual(transaction.confirmation, 13)
+            conversion_repo.session.commit()
+
+            local_queue.advance(199)
+            self.assertEqual(local_queue.receive("EVENT_CONSUMER"), {"Records": []})
+
+            local_queue.advance(1)
+            mock_get_block.return_value = {"confirmations": 26}
+            event = local_queue.receive("EVENT_CONSUMER")
+            self.assertEqual(json.loads(event["Records"][0]["body"])["block_confirmation_attempt"], 1)
+            response = converter_event_consumer(event, {})
+            self.assertEqual(response, {"batchItemFailures": []})
+
+        transaction = conversion_repo.session.query(TransactionDBModel).filter(
+            TransactionDBModel.transaction_hash == consumer_token_received_event_message["tx_hash"]).first()
+        self.assertEqual(transaction.status, TransactionStatus.SUCCESS.value)
+        self.assertEqual(transaction.confirmation, 26)
+        self.assertEqual(local_queue.pending("EVENT_CONSUMER"), [])
+        self.assertEqual(len(local_queue.pending("CONVERTER_BRIDGE")), 1)
+
+    @patch("utils.blockchain.get_cardano_transaction_details")
+    @patch("utils.cardano_blockchain.CardanoBlockchainUtil.get_block")
+    @patch("utils.cardano_blockchain.CardanoBlockchainUtil.get_transaction")
+    @patch("utils.blockchain.validate_cardano_address")
+    @patch("common.utils.Utils.report_slack")
+    def test_completed_event_is_skipped(self, mock_report_slack, mock_validate_cardano_address, mock_get_transaction,
+                                        mock_get_block, mock_get_cardano_transaction_details):
+        local_queue = LocalQueue()
+        event = prepare_consumer_cardano_event_format(consumer_token_received_event_message)
+        with patch("application.service.notification_service.NotificationService.send_message_to_queue",
+                   new=local_queue.send_message_to_queue):
+            mock_get_block.return_value = {"confirmations": 26}
+            response = converter_event_consumer(event, {})
+            self.assertEqual(response, {"batchItemFailures": []})
+            ledger = conversion_repo.session.query(ConsumerEventLedgerDBModel).one()
+            self.assertEqual((ledger.blockchain_name, ledger.transaction_hash, ledger.event_type, ledger.outcome),
+                             ("cardano", consumer_token_received_event_message["tx_hash"], "TOKEN_RECEIVED",
+                              ConsumerEventOutcome.COMPLETED.value))
+            conversion_repo.session.commit()
+
+            # The redelivered event is acknowledged without validating it on chain or sending it on again
+            mock_get_transaction.reset_mock()
+            response = converter_event_consumer(event, {})
+            self.assertEqual(response, {"batchItemFailures": []})
+            mock_get_transaction.assert_not_called()
+
+        self.assertEqual(len(local_queue.pending("CONVERTER_BRIDGE")), 1)
+        self.assertEqual(conversion_repo.session.query(ConsumerEventLedgerDBModel).count(), 1)
 
     def tearDown(self):
+        token_pair_cache.clear()
+        blockchain_cache.clear()
+        deposit_address_cache.invalidate()
         TestConsumer.delete_all_tables()
 
     @staticmethod
@@ -407,8 +562,14 @@ class TestConsumer(unittest.TestCase):
         conversion_repo.session.commit()
         conversion_repo.session.query(ConversionDBModel).delete()
         conversion_repo.session.commit()
+        conversion_repo.session.query(WalletPairAddressDBModel).delete()
+        conversion_repo.session.commit()
         conversion_repo.session.query(WalletPairDBModel).delete()
         conversion_repo.session.commit()
+        conversion_repo.session.query(TokenPairLiquidityDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(TokenPairFrozenLiquidityDBModel).delete()
+        conversion_repo.session.commit()
         conversion_repo.session.query(TokenPairDBModel).delete()
         conversion_repo.session.commit()
         conversion_repo.session.query(ConversionFeeDBModel).delete()
@@ -419,3 +580,9 @@ class TestConsumer(unittest.TestCase):
         conversion_repo.session.commit()
         conversion_repo.session.query(MessageGroupPoolDBModel).delete()
         conversion_repo.session.commit()
+        conversion_repo.session.query(AddressStatusCountDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(PendingSubmissionDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(ConsumerEventLedgerDBModel).delete()
+        conversion_repo.session.commit()
@@ -4,18 +4,28 @@ from decimal import Decimal
 from unittest.mock import patch, Mock
 
 from sqlalchemy import distinct
+from sqlalchemy.orm import joinedload
 
 from application.handler.conversion_handlers import create_conversion_request, get_conversion_history, \
     create_transaction_for_conversion, claim_conversion, get_conversion, get_conversion_count_by_status, \
-    expire_conversion, get_transaction_by_conversion_id, generate_conversion_report
+    expire_conversion, get_transaction_by_conversion_id, generate_conversion_report, refresh_conversion_daily_stats
 from constants.error_details import ErrorCode, ErrorDetails
 from constants.lambdas import LambdaResponseStatus
-from constants.status import ConversionStatus
+from constants.status import ConversionStatus, CONVERSION_STATUS_RANK, ConversionTransactionStatus
+from domain.factory.conversion_factory import ConversionFactory
 from infrastructure.models import TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, \
-    WalletPairDBModel, ConversionDBModel, TransactionDBModel, ConversionTransactionDBModel, MessageGroupPoolDBModel
+    WalletPairDBModel, ConversionDBModel, TransactionDBModel, ConversionTransactionDBModel, MessageGroupPoolDBModel, \
+    AddressStatusCountDBModel, ConversionDailyStatsDBModel, TokenPairLiquidityDBModel, \
+    TokenPairFrozenLiquidityDBModel, WalletPairAddressDBModel, ConsumerEventLedgerDBModel
+from application.service.conversion_service import ConversionService
+from application.service.wallet_pair_service import deposit_address_cache
 from infrastructure.repositories.conversion_repository import ConversionRepository
+from infrastructure.repositories.blockchain_repository import blockchain_cache
+from infrastructure.repositories.token_repository import token_pair_cache
 from testcases.functional_testcases.test_variables import TestVariables
+from utils.database import get_commit_count
 from utils.exceptions import BadRequestException, InternalServerErrorException
+from utils.general import datetime_in_utcnow, relative_date
 
 conversion_repo = ConversionRepository()
 
@@ -38,12 +48,16 @@ class TestConversion(unittest.TestCase):
         conversion_repo.session.commit()
         conversion_repo.session.add_all(TestVariables().wallet_pair)
         conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().wallet_pair_address)
+        conversion_repo.session.commit()
         conversion_repo.session.add_all(TestVariables().conversion)
         conversion_repo.session.commit()
         conversion_repo.session.add_all(TestVariables().conversion_transaction)
         conversion_repo.session.commit()
         conversion_repo.session.add_all(TestVariables().transaction)
         conversion_repo.session.commit()
+        conversion_repo.rebuild_address_status_count()
+        conversion_repo.rebuild_token_pair_liquidity()
 
     @patch("common.blockchain_util.BlockChainUtil.get_current_block_no")
     @patch("application.service.cardano_service.CardanoService.get_deposit_address",
@@ -61,6 +75,8 @@ class TestConversion(unittest.TestCase):
         conversion_repo.session.commit()
         conversion_repo.session.query(ConversionDBModel).delete()
         conversion_repo.session.commit()
+        conversion_repo.session.query(WalletPairAddressDBModel).delete()
+        conversion_repo.session.commit()
         conversion_repo.session.query(WalletPairDBModel).delete()
         conversion_repo.session.commit()
 
@@ -542,6 +558,58 @@ class TestConversion(unittest.TestCase):
         body = json.loads(response["body"])
         self.assertEqual(body, success_response_with_no_history)
 
+    @patch("common.utils.Utils.report_slack")
+    def test_get_conversion_history_by_cursor(self, mock_report_slack):
+        bad_request_invalid_cursor = {'status': 'failed', 'data': None,
+                                      'error': {'code': 'E0084', 'message': 'BAD_REQUEST',
+                                                'details': 'Invalid pagination cursor provided'}}
+
+        event = {"queryStringParameters": {"address": "0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1",
+                                           "cursor": "random cursor"}}
+        response = get_conversion_history(event, {})
+        body = json.loads(response["body"])
+        self.assertEqual(body, bad_request_invalid_cursor)
+
+        # first page
+        event = {"queryStringParameters": {"address": "0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1",
+                                           "page_size": "2", "cursor": ""}}
+        response = get_conversion_history(event, {})
+        body = json.loads(response["body"])
+        self.assertEqual([item["conversion"]["id"] for item in body["data"]["items"]],
+                         ["7298bce110974411b260cac758b37ee0", "5086b5245cd046a68363d9ca8ed0027e"])
+        self.assertEqual(body["data"]["meta"]["page_size"], 2)
+        next_cursor = body["data"]["meta"]["next_cursor"]
+        self.assertIsNotNone(next_cursor)
+
+        # cursor issued for another order
+        event["queryStringParameters"].update({"cursor": next_cursor, "order_by": "date"})
+        response = get_conversion_history(event, {})
+        body = json.loads(response["body"])
+        self.assertEqual(body, bad_request_invalid_cursor)
+
+        # last page
+        event["queryStringParameters"].pop("order_by")
+        response = get_conversion_history(event, {})
+        body = json.loads(response["body"])
+        self.assertEqual([item["conversion"]["id"] for item in body["data"]["items"]],
+                         ["51769f201e46446fb61a9c197cb0706b"])
+        self.assertIsNone(body["data"]["meta"]["next_cursor"])
+
+        # ordered by date
+        event = {"queryStringParameters": {"address": "0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1",
+                                           "page_size": "2", "cursor": "", "order_by": "date"}}
+        response = get_conversion_history(event, {})
+        body = json.loads(response["body"])
+        self.assertEqual([item["conversion"]["id"] for item in body["data"]["items"]],
+                         ["7298bce110974411b260cac758b37ee0", "5086b5245cd046a68363d9ca8ed0027e"])
+
+        event["queryStringParameters"]["cursor"] = body["data"]["meta"]["next_cursor"]
+        response = get_conversion_history(event, {})
+        body = json.loads(response["body"])
+        self.assertEqual([item["conversion"]["id"] for item in body["data"]["items"]],
+                         ["51769f201e46446fb61a9c197cb0706b"])
+        self.assertIsNone(body["data"]["meta"]["next_cursor"])
+
     @patch("common.utils.Utils.report_slack")
     def test_get_conversion(self, mock_report_slack):
         event = dict()
@@ -711,11 +779,14 @@ class TestConversion(unittest.TestCase):
         body = json.loads(response["body"])
         self.assertEqual(body["status"], LambdaResponseStatus.SUCCESS.value)
         self.assertIsNotNone(body["data"]["id"])
+        # Conversion transaction, transaction and conversion status are written in one unit of work
+        self.assertEqual(get_commit_count(), 1)
 
         response = create_transaction_for_conversion(event, {})
         body = json.loads(response["body"])
         self.assertEqual(body["status"], LambdaResponseStatus.FAILED.value)
         self.assertEqual(body, bad_request_transaction_already_created)
+        self.assertEqual(get_commit_count(), 0)
 
     @patch("application.service.conversion_service.get_signature")
     @patch("common.utils.Utils.report_slack")
@@ -891,12 +962,46 @@ class TestConversion(unittest.TestCase):
             ConversionDBModel.status == ConversionStatus.EXPIRED.value).all()
         self.assertEqual(len(conversions), 0)
 
-        expire_conversion({}, {})
+        # A chunk of one conversion expires the backlog over several transactions
+        with patch.dict("application.service.conversion_service.EXPIRE_CONVERSION_SWEEP", {"CHUNK_SIZE": 1}):
+            response = ConversionService().expire_conversion()
+        self.assertEqual(response["expired"], 2)
+        self.assertTrue(response["completed"])
+        self.assertEqual(response["watermark"], {"created_at": "2022-01-12 04:10:54", "row_id": 1})
+
+        conversions = conversion_repo.session.query(ConversionDBModel).filter(
+            ConversionDBModel.status == ConversionStatus.EXPIRED.value).all()
+        self.assertEqual(len(conversions), 2)
 
+        self.assertEqual([conversion.status_rank for conversion in conversions],
+                         [CONVERSION_STATUS_RANK[ConversionStatus.EXPIRED.value]] * 2)
+
+        expire_conversion({"watermark": response["watermark"]}, {})
         conversions = conversion_repo.session.query(ConversionDBModel).filter(
             ConversionDBModel.status == ConversionStatus.EXPIRED.value).all()
         self.assertEqual(len(conversions), 2)
 
+        # the status counts move along with the expired conversions
+        event = {"queryStringParameters": {"address": "0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1"}}
+        response = get_conversion_count_by_status(event, {})
+        body = json.loads(response["body"])
+        self.assertEqual(body["data"], {'overall_count': 3, 'each': {'EXPIRED': 2, 'PROCESSING': 1}})
+
+    @patch("common.utils.Utils.report_slack")
+    def test_expire_conversion_deletes_expired_consumer_events(self, mock_report_slack):
+        current_datetime = datetime_in_utcnow()
+        conversion_repo.session.add_all([
+            ConsumerEventLedgerDBModel(blockchain_name="ethereum", transaction_hash=transaction_hash,
+                                       event_type="DepositToken", outcome="COMPLETED", created_at=created_at,
+                                       updated_at=created_at)
+            for transaction_hash, created_at in [("0xexpired", relative_date(date_time=current_datetime, days=15)),
+                                                 ("0xkept", relative_date(date_time=current_datetime, days=13))]])
+        conversion_repo.session.commit()
+
+        ConversionService().expire_conversion()
+        ledger = conversion_repo.session.query(ConsumerEventLedgerDBModel.transaction_hash).all()
+        self.assertEqual([row.transaction_hash for row in ledger], ["0xkept"])
+
     @patch("common.utils.Utils.report_slack")
     def test_get_transaction_by_conversion_id(self, mock_report_slack):
         bad_request_schema_not_matching = {'status': 'failed', 'data': None,
@@ -963,7 +1068,94 @@ class TestConversion(unittest.TestCase):
         event = dict()
         generate_conversion_report(event, {})
 
+        # The first run backfills the buckets of the whole history
+        conversion_daily_stats = conversion_repo.session.query(ConversionDailyStatsDBModel).all()
+        self.assertEqual(sum(stats.conversion_count for stats in conversion_daily_stats), 3)
+
+        report = conversion_repo.generate_conversion_report(start_date=None, end_date=None)
+        self.assertEqual(report["AGIX_ETH_ADA"]["total_conversion"], 2)
+        self.assertEqual(report["AGIX_ADA_ETH"], {"token": "AGIX", "from_blockchain": "ADA", "to_blockchain": "ETH",
+                                                  "total_conversion": 1,
+                                                  "each_conversion": [{"status": "USER_INITIATED", "count": 1,
+                                                                       "amount": "1333050000000000000"}]})
+
+        # Status changes of conversions created on an older day are picked up by the incremental refresh
+        conversion_repo.expire_conversions_chunk(
+            expire_datetime_by_blockchain={TestVariables().blockchain_row_id_2: datetime_in_utcnow()}, watermark=None,
+            chunk_size=500)
+        refresh_conversion_daily_stats(event, {})
+        report = conversion_repo.generate_conversion_report(start_date=None, end_date=None)
+        self.assertEqual(report["AGIX_ADA_ETH"]["each_conversion"],
+                         [{"status": "EXPIRED", "count": 1, "amount": "1333050000000000000"}])
+
+    def test_get_conversion_complete_detail(self):
+        variables = TestVariables()
+        conversion_service = ConversionService()
+        conversion_id = "51769f201e46446fb61a9c197cb0706b"
+        loader = conversion_service.conversion_repo.get_conversion_complete_detail
+
+        with patch.object(conversion_service.conversion_repo, "get_conversion_complete_detail",
+                          wraps=loader) as mock_loader:
+            conversion_detail = conversion_service.get_conversion_complete_detail(conversion_id=conversion_id)
+            transactions = conversion_repo.session.query(TransactionDBModel) \
+                .join(ConversionTransactionDBModel,
+                      ConversionTransactionDBModel.row_id == TransactionDBModel.conversion_transaction_id) \
+                .filter(ConversionTransactionDBModel.conversion_id == variables.conversion_id_3,
+                        ConversionTransactionDBModel.status != ConversionTransactionStatus.FAILED.value) \
+                .order_by(TransactionDBModel.row_id) \
+                .options(joinedload(TransactionDBModel.token).joinedload(TokenDBModel.blockchain_detail)).all()
+            transactions = [ConversionFactory.transaction_detail(transaction=transaction) for transaction in transactions]
+            self.assertEqual(conversion_detail["conversion"]["id"], conversion_id)
+            self.assertEqual(conversion_detail["transactions"],
+                             [transaction.to_dict() for transaction in transactions])
+
+            # Repeated reads reuse the loaded detail until the conversion is written
+            conversion_service.get_conversion_complete_detail(conversion_id=conversion_id)
+            self.assertEqual(mock_loader.call_count, 1)
+            conversion_service.update_conversion_status(conversion_id=conversion_id,
+                                                        status=ConversionStatus.WAITING_FOR_CLAIM.value)
+            conversion_detail = conversion_service.get_conversion_complete_detail(conversion_id=conversion_id)
+            self.assertEqual(mock_loader.call_count, 2)
+            self.assertEqual(conversion_detail["conversion"]["status"], ConversionStatus.WAITING_FOR_CLAIM.value)
+
+        self.assertIsNone(conversion_service.get_conversion_complete_detail(conversion_id="invalid"))
+
+    def test_token_pair_liquidity(self):
+        variables = TestVariables()
+        token_pair_id = "22477fd4ea994689a04646cbbaafd133"
+        self.assertEqual(conversion_repo.get_processing_claim_amount_for_token_pair(token_pair_id),
+                         1638104000000000000)
+        self.assertEqual(conversion_repo.get_initiated_claim_amount_for_token_pair(token_pair_id), 0)
+
+        # A new conversion freezes its claim amount, and locks it once processing
+        conversion = conversion_repo.create_conversion(wallet_pair_id=variables.wallet_pair_id_1,
+                                                       deposit_amount=Decimal("1000"), fee_amount=Decimal("10"),
+                                                       claim_amount=Decimal("990"), created_by="TestCase")
+        self.assertEqual(conversion_repo.get_processing_claim_amount_for_token_pair(token_pair_id),
+                         1638104000000000000)
+        self.assertEqual(conversion_repo.get_initiated_claim_amount_for_token_pair(token_pair_id), 990)
+
+        conversion_repo.update_conversion(conversion_id=conversion.id, deposit_amount=None, claim_amount="980",
+                                          fee_amount=None, status=ConversionStatus.PROCESSING.value,
+                                          claim_signature=None)
+        self.assertEqual(conversion_repo.get_processing_claim_amount_for_token_pair(token_pair_id),
+                         1638104000000000980)
+        self.assertEqual(conversion_repo.get_initiated_claim_amount_for_token_pair(token_pair_id), 0)
+
+        conversion_repo.update_conversion_status(conversion_id=conversion.id, status=ConversionStatus.SUCCESS.value)
+        self.assertEqual(conversion_repo.get_processing_claim_amount_for_token_pair(token_pair_id),
+                         1638104000000000000)
+
+        # Rebuilding from the conversions gives the same ledger
+        conversion_repo.rebuild_token_pair_liquidity()
+        self.assertEqual(conversion_repo.get_processing_claim_amount_for_token_pair(token_pair_id),
+                         1638104000000000000)
+        self.assertEqual(conversion_repo.get_initiated_claim_amount_for_token_pair(token_pair_id), 0)
+
     def tearDown(self):
+        token_pair_cache.clear()
+        blockchain_cache.clear()
+        deposit_address_cache.invalidate()
         TestConversion.delete_all_tables()
 
     @staticmethod
@@ -974,8 +1166,14 @@ class TestConversion(unittest.TestCase):
         conversion_repo.session.commit()
         conversion_repo.session.query(ConversionDBModel).delete()
         conversion_repo.session.commit()
+        conversion_repo.session.query(WalletPairAddressDBModel).delete()
+        conversion_repo.session.commit()
         conversion_repo.session.query(WalletPairDBModel).delete()
         conversion_repo.session.commit()
+        conversion_repo.session.query(TokenPairLiquidityDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(TokenPairFrozenLiquidityDBModel).delete()
+        conversion_repo.session.commit()
         conversion_repo.session.query(TokenPairDBModel).delete()
         conversion_repo.session.commit()
         conversion_repo.session.query(ConversionFeeDBModel).delete()
@@ -986,3 +1184,9 @@ class TestConversion(unittest.TestCase):
         conversion_repo.session.commit()
         conversion_repo.session.query(MessageGroupPoolDBModel).delete()
         conversion_repo.session.commit()
+        conversion_repo.session.query(AddressStatusCountDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(ConversionDailyStatsDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(ConsumerEventLedgerDBModel).delete()
+        conversion_repo.session.commit()
@@ -0,0 +1,201 @@
+import re
+import unittest
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from constants.general import ConversionOn
+from constants.status import ConversionStatus, ConversionTransactionStatus, TransactionVisibility, \
+    TransactionOperation, TransactionStatus
+from infrastructure.models import TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, \
+    WalletPairDBModel, ConversionDBModel, TransactionDBModel, ConversionTransactionDBModel, WalletPairAddressDBModel
+from infrastructure.repositories.base_repository import get_engine
+from infrastructure.repositories.conversion_repository import ConversionRepository
+from infrastructure.repositories.wallet_pair_repository import WalletPairRepository
+from testcases.benchmarks.seed import seed_wallet_pairs, seed_conversions, insert_in_chunks
+from testcases.functional_testcases.test_variables import TestVariables
+from utils.general import get_uuid
+
+conversion_repo = ConversionRepository()
+wallet_pair_repo = WalletPairRepository()
+
+# Tables which grow with every conversion, a full scan on any of them is a regression
+GROWING_TABLES = ["conversion", "conversion_transaction", "transaction", "wallet_pair"]
+
+ETHEREUM_ADDRESS = "0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1"
+CARDANO_ADDRESS = "addr_test1qza8485avt2xn3vy63plawqt0gk3ykpf98wusc4qrml2avu0pkm5rp3pkz6q4n3kf8znlf3y749lll8lfmg5x86kgt8qju7vx8"
+
+# Other users' rows, on a handful of fixture rows the optimizer prefers a full scan over any index
+FILLER_WALLET_PAIRS = 200
+FILLER_CONVERSIONS = 2000
+FILLER_START_ROW_ID = 1000
+
+
+class TestQueryPlans(unittest.TestCase):
+    maxDiff = None
+
+    @classmethod
+    def setUpClass(cls):
+        TestQueryPlans.delete_all_tables()
+
+    def setUp(self):
+        conversion_repo.session.add_all(TestVariables().blockchain)
+        conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().token)
+        conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().conversion_fee)
+        conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().token_pair)
+        conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().wallet_pair)
+        conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().wallet_pair_address)
+        conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().conversion)
+        conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().conversion_transaction)
+        conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().transaction)
+        conversion_repo.session.commit()
+        TestQueryPlans.seed_filler_rows()
+
+    @staticmethod
+    def seed_filler_rows():
+        variables = TestVariables()
+        session = conversion_repo.session
+        wallet_pair_ids = seed_wallet_pairs(session, addresses=[(f"0x{index:040x}", f"addr_test1filler{index}")
+                                                                for index in range(FILLER_WALLET_PAIRS)],
+                                            token_pair_ids=[variables.token_pair_row_id_1],
+                                            start_row_id=FILLER_START_ROW_ID)
+        seed_conversions(session, wallet_pair_ids=wallet_pair_ids, count=FILLER_CONVERSIONS,
+                         start_row_id=FILLER_START_ROW_ID)
+        now = datetime.utcnow()
+        conversion_row_ids = range(FILLER_START_ROW_ID, FILLER_START_ROW_ID + FILLER_CONVERSIONS)
+        insert_in_chunks(session, ConversionTransactionDBModel.__table__, [
+            {"row_id": row_id, "id": get_uuid(), "conversion_id": row_id,
+             "status": ConversionTransactionStatus.PROCESSING.value, "created_by": "TestCase", "created_at": now,
+             "updated_at": now} for row_id in conversion_row_ids])
+        insert_in_chunks(session, TransactionDBModel.__table__, [
+            {"row_id": row_id, "id": get_uuid(), "conversion_transaction_id": row_id,
+             "token_id": variables.token_row_id_1, "transaction_visibility": TransactionVisibility.EXTERNAL.value,
+             "transaction_operation": TransactionOperation.TOKEN_RECEIVED.value, "transaction_hash": get_uuid(),
+             "transaction_amount": 1000, "confirmation": 0, "status": TransactionStatus.SUCCESS.value,
+             "created_by": "TestCase", "created_at": now, "updated_at": now} for row_id in conversion_row_ids])
+        session.execute("ANALYZE TABLE wallet_pair, wallet_pair_address, conversion, conversion_transaction, "
+                        "transaction")
+        session.commit()
+
+    @staticmethod
+    def capture_select_statements(method, *args, **kwargs):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append((statement, parameters))
+
+        # Reads and writes run on different engines
+        event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            method(*args, **kwargs)
+        finally:
+            event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+        return statements
+
+    @staticmethod
+    def explain(statement, parameters):
+        connection = get_engine().raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"EXPLAIN {statement}", parameters)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            connection.close()
+
+    def assert_no_full_table_scan(self, method, *args, **kwargs):
+        statements = TestQueryPlans.capture_select_statements(method, *args, **kwargs)
+        self.assertNotEqual(len(statements), 0, f"{method.__name__} did not run any query")
+
+        for statement, parameters in statements:
+            for plan in TestQueryPlans.explain(statement, parameters):
+                table = plan.get("table")
+                if not table:
+                    continue
+
+                # Joined and eager loaded tables are aliased as <table>_<n>
+                table_name = re.sub(r"_\d+$", "", table)
+                if table_name not in GROWING_TABLES:
+                    continue
+
+                # A usable index the optimizer passed over is as much a regression as a missing one
+                self.assertNotEqual(plan["type"], "ALL",
+                                    f"{method.__name__} scans the whole {table_name} table\n{statement}")
+                self.assertIsNotNone(plan["key"], f"{method.__name__} uses no index on {table_name}\n{statement}")
+
+    def test_conversion_repository_query_plans(self):
+        variables = TestVariables()
+        now = datetime.utcnow()
+
+        self.assert_no_full_table_scan(conversion_repo.get_conversion_count_by_status, ETHEREUM_ADDRESS)
+        self.assert_no_full_table_scan(conversion_repo.get_conversion_only, "51769f201e46446fb61a9c197cb0706b")
+        self.assert_no_full_table_scan(conversion_repo.get_conversion_complete_detail,
+                                       "51769f201e46446fb61a9c197cb0706b")
+        self.assert_no_full_table_scan(conversion_repo.get_processing_claim_amount_for_token_pair,
+                                       "22477fd4ea994689a04646cbbaafd133")
+        self.assert_no_full_table_scan(conversion_repo.get_initiated_claim_amount_for_token_pair,
+                                       "22477fd4ea994689a04646cbbaafd133")
+        self.assert_no_full_table_scan(conversion_repo.get_latest_user_pending_conversion_request,
+                                       variables.wallet_pair_id_1, ConversionStatus.USER_INITIATED.value)
+        self.assert_no_full_table_scan(conversion_repo.get_token_contract_address_for_conversion_id,
+                                       ConversionOn.FROM.value, "51769f201e46446fb61a9c197cb0706b")
+        self.assert_no_full_table_scan(conversion_repo.get_conversion_history_count, ETHEREUM_ADDRESS, None, None,
+                                       None)
+        self.assert_no_full_table_scan(conversion_repo.get_conversion_history_page, ETHEREUM_ADDRESS, None, None,
+                                       None)
+        self.assert_no_full_table_scan(conversion_repo.get_transaction_rows_for_conversion_row_ids,
+                                       [variables.conversion_id_3])
+        self.assert_no_full_table_scan(conversion_repo.get_transaction_by_hash, "22477fd4ea994689a04646cbbaafd133")
+        self.assert_no_full_table_scan(conversion_repo.get_conversion_detail_by_tx_id,
+                                       "391be6385abf4b608bdd20a44acd6abc")
+        self.assert_no_full_table_scan(conversion_repo.expire_conversions_chunk,
+                                       {variables.blockchain_row_id_1: now, variables.blockchain_row_id_2: now},
+                                       {"created_at": str(now), "row_id": 0}, 500)
+        self.assert_no_full_table_scan(conversion_repo.get_first_conversion_created_at)
+        self.assert_no_full_table_scan(conversion_repo.get_conversion_days_updated_since, now)
+
+    def test_wallet_pair_repository_query_plans(self):
+        variables = TestVariables()
+
+        self.assert_no_full_table_scan(wallet_pair_repo.get_wallet_pair_by_addresses, ETHEREUM_ADDRESS,
+                                       CARDANO_ADDRESS, variables.token_pair_row_id_1)
+        self.assert_no_full_table_scan(wallet_pair_repo.get_wallet_pair_by_deposit_address, CARDANO_ADDRESS)
+        self.assert_no_full_table_scan(wallet_pair_repo.get_wallet_pair_by_conversion_id,
+                                       "51769f201e46446fb61a9c197cb0706b")
+        self.assert_no_full_table_scan(wallet_pair_repo.get_all_deposit_address)
+        self.assert_no_full_table_scan(wallet_pair_repo.get_wallets_address_by_address, ETHEREUM_ADDRESS)
+
+    def tearDown(self):
+        TestQueryPlans.delete_all_tables()
+
+    @staticmethod
+    def delete_all_tables():
+        conversion_repo.session.query(TransactionDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(ConversionTransactionDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(ConversionDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(WalletPairAddressDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(WalletPairDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(TokenPairDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(ConversionFeeDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(TokenDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(BlockChainDBModel).delete()
+        conversion_repo.session.commit()
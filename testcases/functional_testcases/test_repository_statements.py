@@ -0,0 +1,172 @@
+import unittest
+from decimal import Decimal
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker, scoped_session
+
+from constants.status import ConversionStatus, TransactionVisibility, TransactionOperation, TransactionStatus
+from infrastructure.models import TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, \
+    WalletPairDBModel, ConversionDBModel, TransactionDBModel, ConversionTransactionDBModel, \
+    AddressStatusCountDBModel, TokenPairLiquidityDBModel, TokenPairFrozenLiquidityDBModel, WalletPairAddressDBModel
+from infrastructure.repositories.base_repository import get_read_engine
+from infrastructure.repositories.conversion_repository import ConversionRepository
+from infrastructure.repositories.wallet_pair_repository import WalletPairRepository
+from testcases.functional_testcases.test_variables import TestVariables
+
+conversion_repo = ConversionRepository()
+wallet_pair_repo = WalletPairRepository()
+
+
+class TestRepositoryStatements(unittest.TestCase):
+    maxDiff = None
+
+    @classmethod
+    def setUpClass(cls):
+        TestRepositoryStatements.delete_all_tables()
+
+    def setUp(self):
+        conversion_repo.session.add_all(TestVariables().blockchain)
+        conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().token)
+        conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().conversion_fee)
+        conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().token_pair)
+        conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().wallet_pair)
+        conversion_repo.session.commit()
+        conversion_repo.session.add_all(TestVariables().wallet_pair_address)
+        conversion_repo.session.commit()
+
+    @staticmethod
+    def capture_statements(method, *args, **kwargs):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.lstrip().split(" ")[0].upper())
+
+        event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+        return result, statements
+
+    def test_create_statements(self):
+        variables = TestVariables()
+
+        wallet_pair, statements = TestRepositoryStatements.capture_statements(
+            wallet_pair_repo.create_wallet_pair, from_address="0xd1C9246f6A8b9bD5f4E1a8F2b2dFAc2d8F4E2C11",
+            to_address="addr_test1qza8485avt2xn3vy63plawqt0gk3ykpf98wusc4qrml2avu0pkm5rp3pkz6q4n3kf8znlf3y749lll8",
+            token_pair_id=variables.token_pair_row_id_1, signature="signature", signature_expiry=1,
+            signature_metadata={}, deposit_address=None, deposit_address_detail=None)
+        self.assertIsNotNone(wallet_pair.row_id)
+        # The wallet pair and both of its wallet_pair_address rows
+        self.assertEqual(statements, ["INSERT", "INSERT"])
+
+        # Wallet pair lookup, address status counts, frozen liquidity and the conversion itself
+        conversion, statements = TestRepositoryStatements.capture_statements(
+            conversion_repo.create_conversion, wallet_pair_id=wallet_pair.row_id, deposit_amount=Decimal("1000"),
+            fee_amount=Decimal("10"), claim_amount=Decimal("990"), created_by="TestCase")
+        self.assertIsNotNone(conversion.row_id)
+        self.assertEqual(conversion.status, ConversionStatus.USER_INITIATED.value)
+        self.assertEqual(statements, ["SELECT", "INSERT", "INSERT", "INSERT"])
+
+        conversion_transaction, statements = TestRepositoryStatements.capture_statements(
+            conversion_repo.create_conversion_transaction, conversion_id=conversion.row_id, created_by="TestCase")
+        self.assertIsNotNone(conversion_transaction.row_id)
+        self.assertEqual(statements, ["INSERT"])
+
+        transaction, statements = TestRepositoryStatements.capture_statements(
+            conversion_repo.create_transaction, conversion_transaction_id=conversion_transaction.row_id,
+            token_id=variables.token_row_id_1, transaction_visibility=TransactionVisibility.EXTERNAL.value,
+            transaction_operation=TransactionOperation.TOKEN_RECEIVED.value, transaction_hash="hash",
+            transaction_amount=Decimal("1000"), confirmation=0,
+            status=TransactionStatus.WAITING_FOR_CONFIRMATION.value, created_by="TestCase")
+        self.assertIsNotNone(transaction.row_id)
+        self.assertEqual(statements, ["INSERT"])
+
+    def test_get_or_create_wallet_pair(self):
+        variables = TestVariables()
+        wallet_pair_details = {"from_address": "0xd1C9246f6A8b9bD5f4E1a8F2b2dFAc2d8F4E2C11",
+                               "to_address": "addr_test1qza8485avt2xn3vy63plawqt0gk3ykpf98wusc4qrml2avu0pkm5rp3",
+                               "token_pair_id": variables.token_pair_row_id_1, "signature": "signature",
+                               "signature_expiry": None, "signature_metadata": {},
+                               "deposit_address": "addr_test1deposit", "deposit_address_detail": {}}
+
+        (wallet_pair, created), statements = TestRepositoryStatements.capture_statements(
+            wallet_pair_repo.get_or_create_wallet_pair, **wallet_pair_details)
+        self.assertTrue(created)
+        self.assertEqual(wallet_pair.deposit_address, "addr_test1deposit")
+        self.assertEqual(statements, ["SAVEPOINT", "INSERT", "INSERT", "RELEASE"])
+
+        # The duplicate insert rolls back to the savepoint and the committed row is read back
+        (existing_wallet_pair, created), statements = TestRepositoryStatements.capture_statements(
+            wallet_pair_repo.get_or_create_wallet_pair, **wallet_pair_details)
+        self.assertFalse(created)
+        self.assertEqual(existing_wallet_pair.row_id, wallet_pair.row_id)
+        self.assertEqual(statements, ["SAVEPOINT", "INSERT", "ROLLBACK", "SELECT"])
+
+        # Any other integrity error, here an unknown token pair, is not taken for an existing wallet pair
+        with self.assertRaises(IntegrityError):
+            wallet_pair_repo.get_or_create_wallet_pair(**dict(wallet_pair_details, token_pair_id=0))
+
+    def test_replica_routing(self):
+        # Stand in for a replica with a second session on the primary, only the routing is under test
+        replica_queries = []
+        replica_session_factory = sessionmaker(bind=get_read_engine())
+        event.listen(replica_session_factory, "do_orm_execute",
+                     lambda orm_execute_state: replica_queries.append(orm_execute_state.statement))
+        conversion_repo.replica_session = scoped_session(replica_session_factory)
+        conversion_repo.replica_lag = 1
+        try:
+            conversion_repo.get_conversion_count_by_status(address="0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1")
+            self.assertEqual(len(replica_queries), 1)
+
+            conversion_repo.get_processing_claim_amount_for_token_pair(
+                target_token_pair_id="22477fd4ea994689a04646cbbaafd133")
+            self.assertEqual(len(replica_queries), 1)
+
+            with conversion_repo.read_from_primary():
+                conversion_repo.get_conversion_count_by_status(address="0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1")
+            self.assertEqual(len(replica_queries), 1)
+
+            conversion_repo.replica_lag = 60
+            conversion_repo.get_conversion_count_by_status(address="0xa18b95A9371Ac18C233fB024cdAC5ef6300efDa1")
+            self.assertEqual(len(replica_queries), 1)
+        finally:
+            del conversion_repo.replica_session
+            del conversion_repo.replica_lag
+
+    def tearDown(self):
+        TestRepositoryStatements.delete_all_tables()
+
+    @staticmethod
+    def delete_all_tables():
+        conversion_repo.session.query(TransactionDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(ConversionTransactionDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(ConversionDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(WalletPairAddressDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(WalletPairDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(TokenPairLiquidityDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(TokenPairFrozenLiquidityDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(TokenPairDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(ConversionFeeDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(TokenDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(BlockChainDBModel).delete()
+        conversion_repo.session.commit()
+        conversion_repo.session.query(AddressStatusCountDBModel).delete()
+        conversion_repo.session.commit()
@@ -7,7 +7,8 @@ from sqlalchemy.orm import make_transient
 from application.handler.token_handlers import get_all_token_pair
 from infrastructure.models import BlockChainDBModel, TokenDBModel, TokenPairDBModel, ConversionFeeDBModel, \
     MessageGroupPoolDBModel
-from infrastructure.repositories.token_repository import TokenRepository
+from infrastructure.repositories.token_repository import TokenRepository, token_pair_cache
+from infrastructure.repositories.blockchain_repository import blockchain_cache
 from testcases.functional_testcases.test_variables import TestVariables
 
 token_repo = TokenRepository()
@@ -108,6 +109,8 @@ class TestToken(unittest.TestCase):
         self.assertEqual(len(body["data"]), 1)
 
     def tearDown(self):
+        token_pair_cache.clear()
+        blockchain_cache.clear()
         token_repo.session.query(TokenPairDBModel).delete()
         token_repo.session.commit()
         token_repo.session.query(ConversionFeeDBModel).delete()
@@ -1,9 +1,10 @@
 import json
 
+from constants.general import WalletPairAddressSide
 from constants.status import TransactionVisibility, TransactionOperation, TransactionStatus, \
     ConversionTransactionStatus, ConversionStatus
 from infrastructure.models import BlockChainDBModel, TokenDBModel, TokenPairDBModel, ConversionFeeDBModel, \
-    ConversionTransactionDBModel, ConversionDBModel, WalletPairDBModel, TransactionDBModel
+    ConversionTransactionDBModel, ConversionDBModel, WalletPairDBModel, TransactionDBModel, WalletPairAddressDBModel
 
 DAPP_AS_CREATED_BY = "DApp"
 
@@ -47,9 +48,21 @@ def create_wallet_pair(row_id, id, token_pair_id, from_address, to_address, depo
                              created_by=created_by, created_at=created_at, updated_at=updated_at)
 
 
-def create_conversion(row_id, id, wallet_pair_id, deposit_amount, claim_amount, fee_amount, status, claim_signature,
-                      created_by, created_at, updated_at):
-    return ConversionDBModel(row_id=row_id, id=id, wallet_pair_id=wallet_pair_id, deposit_amount=deposit_amount,
+def create_wallet_pair_addresses(wallet_pair):
+    return [WalletPairAddressDBModel(address=wallet_pair.from_address, wallet_pair_id=wallet_pair.row_id,
+                                     side=WalletPairAddressSide.FROM.value,
+                                     wallet_pair_created_at=wallet_pair.created_at),
+            WalletPairAddressDBModel(address=wallet_pair.to_address, wallet_pair_id=wallet_pair.row_id,
+                                     side=WalletPairAddressSide.TO.value,
+                                     wallet_pair_created_at=wallet_pair.created_at)]
+
+
+def create_conversion(row_id, id, wallet_pair_id, from_token_id, to_token_id, from_blockchain_id, to_blockchain_id,
+                      deposit_amount, claim_amount, fee_amount, status, claim_signature, created_by, created_at,
+                      updated_at):
+    return ConversionDBModel(row_id=row_id, id=id, wallet_pair_id=wallet_pair_id, from_token_id=from_token_id,
+                             to_token_id=to_token_id, from_blockchain_id=from_blockchain_id,
+                             to_blockchain_id=to_blockchain_id, deposit_amount=deposit_amount,
                              claim_amount=claim_amount, fee_amount=fee_amount, status=status,
                              claim_signature=claim_signature, created_by=created_by, created_at=created_at,
                              updated_at=updated_at)
@@ -206,8 +219,14 @@ class TestVariables:
                                signature_expiry=None,
                                created_by=DAPP_AS_CREATED_BY, created_at=created_at, updated_at=updated_at)
         ]
+        self.wallet_pair_address = [wallet_pair_address for wallet_pair in self.wallet_pair
+                                    for wallet_pair_address in create_wallet_pair_addresses(wallet_pair)]
         self.conversion = [create_conversion(row_id=self.conversion_id_1, id="7298bce110974411b260cac758b37ee0",
-                                             wallet_pair_id=self.wallet_pair_id_1, deposit_amount=133305000,
+                                             wallet_pair_id=self.wallet_pair_id_1,
+                                             from_token_id=self.token_row_id_1, to_token_id=self.token_row_id_2,
+                                             from_blockchain_id=self.blockchain_row_id_1,
+                                             to_blockchain_id=self.blockchain_row_id_2,
+                                             deposit_amount=133305000,
                                              claim_amount=(133305000 - 1999575), fee_amount=1999575,
                                              status=ConversionStatus.USER_INITIATED.value,
                                              claim_signature=None, created_by=DAPP_AS_CREATED_BY,
@@ -215,6 +234,9 @@ class TestVariables:
                                              updated_at=updated_at),
                            create_conversion(row_id=self.conversion_id_2, id="5086b5245cd046a68363d9ca8ed0027e",
                                              wallet_pair_id=self.wallet_pair_id_2,
+                                             from_token_id=self.token_row_id_2, to_token_id=self.token_row_id_1,
+                                             from_blockchain_id=self.blockchain_row_id_2,
+                                             to_blockchain_id=self.blockchain_row_id_1,
                                              deposit_amount=1333050000000000000,
                                              claim_amount=1333050000000000000, fee_amount=0,
                                              status=ConversionStatus.USER_INITIATED.value,
@@ -223,6 +245,9 @@ class TestVariables:
                                              updated_at=updated_at),
                            create_conversion(row_id=self.conversion_id_3, id="51769f201e46446fb61a9c197cb0706b",
                                              wallet_pair_id=self.wallet_pair_id_1,
+                                             from_token_id=self.token_row_id_1, to_token_id=self.token_row_id_2,
+                                             from_blockchain_id=self.blockchain_row_id_1,
+                                             to_blockchain_id=self.blockchain_row_id_2,
                                              deposit_amount=1663050000000000000,
                                              claim_amount=1638104000000000000, fee_amount=24946000000000000,
                                              status=ConversionStatus.PROCESSING.value,
@@ -3,9 +3,13 @@ import unittest
 from unittest.mock import patch
 
 from application.handler.wallet_handlers import get_all_deposit_address, get_wallets_address_by_ethereum_address
+from application.service.wallet_pair_service import deposit_address_cache
 from infrastructure.models import TransactionDBModel, ConversionTransactionDBModel, ConversionDBModel, \
-    WalletPairDBModel, TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, MessageGroupPoolDBModel
+    WalletPairDBModel, TokenPairDBModel, ConversionFeeDBModel, TokenDBModel, BlockChainDBModel, MessageGroupPoolDBModel, \
+    WalletPairAddressDBModel
 from infrastructure.repositories.wallet_pair_repository import WalletPairRepository
+from infrastructure.repositories.blockchain_repository import blockchain_cache
+from infrastructure.repositories.token_repository import token_pair_cache
 from testcases.functional_testcases.test_variables import TestVariables
 
 wallet_repo = WalletPairRepository()
@@ -29,6 +33,8 @@ class TestWallet(unittest.TestCase):
         wallet_repo.session.commit()
         wallet_repo.session.add_all(TestVariables().wallet_pair)
         wallet_repo.session.commit()
+        wallet_repo.session.add_all(TestVariables().wallet_pair_address)
+        wallet_repo.session.commit()
         wallet_repo.session.add_all(TestVariables().conversion)
         wallet_repo.session.commit()
 
@@ -93,6 +99,9 @@ class TestWallet(unittest.TestCase):
         self.assertEqual(body, success_response_no_addresses)
 
     def tearDown(self):
+        token_pair_cache.clear()
+        blockchain_cache.clear()
+        deposit_address_cache.invalidate()
         TestWallet.delete_all_tables()
 
     @staticmethod
@@ -103,6 +112,8 @@ class TestWallet(unittest.TestCase):
         wallet_repo.session.commit()
         wallet_repo.session.query(ConversionDBModel).delete()
         wallet_repo.session.commit()
+        wallet_repo.session.query(WalletPairAddressDBModel).delete()
+        wallet_repo.session.commit()
         wallet_repo.session.query(WalletPairDBModel).delete()
         wallet_repo.session.commit()
         wallet_repo.session.query(TokenPairDBModel).delete()
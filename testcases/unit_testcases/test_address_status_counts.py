@@ -0,0 +1,33 @@
+import unittest
+from datetime import datetime
+
+from constants.status import ConversionStatus
+from infrastructure.repositories.conversion_repository import ConversionChange, get_address_status_counts
+
+CREATED_AT = datetime(2022, 1, 12, 4, 10, 54)
+
+
+def change(from_address, to_address, old_status, new_status):
+    return ConversionChange(from_address=from_address, to_address=to_address, token_pair_id=1, created_at=CREATED_AT,
+                            old_status=old_status, old_claim_amount="10", new_status=new_status,
+                            new_claim_amount="10")
+
+
+class TestAddressStatusCounts(unittest.TestCase):
+
+    def test_counter_rows_are_sorted(self):
+        processing, success = ConversionStatus.PROCESSING.value, ConversionStatus.SUCCESS.value
+        forward = get_address_status_counts([change("0xB", "addr_a", processing, success)])
+        backward = get_address_status_counts([change("0xb", "addr_a", success, processing)])
+        self.assertEqual([(row["address"].lower(), row["status"]) for row in forward],
+                         [(row["address"].lower(), row["status"]) for row in backward])
+        self.assertEqual(forward, [
+            {"address": "0xB", "status": processing, "conversion_count": -1},
+            {"address": "0xB", "status": success, "conversion_count": 1},
+            {"address": "addr_a", "status": processing, "conversion_count": -1},
+            {"address": "addr_a", "status": success, "conversion_count": 1}])
+
+    def test_unchanged_status_and_same_address_sides(self):
+        self.assertEqual(get_address_status_counts([change("0xa", "0xa", "PROCESSING", "PROCESSING")]), [])
+        self.assertEqual(get_address_status_counts([change("0xA", "0xa", None, "USER_INITIATED")]),
+                         [{"address": "0xa", "status": "USER_INITIATED", "conversion_count": 1}])
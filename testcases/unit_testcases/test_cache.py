@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import patch
+
+from utils.cache import TTLCache, LRUCache, cached
+
+
+shared_cache = TTLCache(name="shared", ttl_seconds=60)
+
+
+class Repository:
+
+    def __init__(self):
+        self.calls = 0
+
+    @cached(TTLCache(name="test", ttl_seconds=60))
+    def get_value(self, name):
+        self.calls += 1
+        return name.upper() if name else None
+
+
+class TokenRepository:
+
+    @cached(shared_cache)
+    def get(self, name):
+        return f"token {name}"
+
+
+class BlockchainRepository:
+
+    @cached(shared_cache)
+    def get(self, name):
+        return f"blockchain {name}"
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def test_hit_miss_and_expiry(self):
+        cache = TTLCache(name="test", ttl_seconds=60)
+        with patch("utils.cache.time.monotonic", return_value=100):
+            self.assertEqual(cache.get("key"), (False, None))
+            cache.set("key", "value")
+            self.assertEqual(cache.get("key"), (True, "value"))
+        with patch("utils.cache.time.monotonic", return_value=160):
+            self.assertEqual(cache.get("key"), (False, None))
+        self.assertEqual(cache.stats(), {"name": "test", "hits": 1, "misses": 2, "size": 0})
+
+    def test_clear(self):
+        cache = TTLCache(name="test", ttl_seconds=60)
+        cache.set("key_1", "value_1")
+        cache.set("key_2", "value_2")
+        cache.clear()
+        self.assertEqual(cache.get("key_1"), (False, None))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_disabled_cache(self):
+        cache = TTLCache(name="test", ttl_seconds=0)
+        cache.set("key", "value")
+        self.assertEqual(cache.get("key"), (False, None))
+
+    def test_cached_method(self):
+        repository = Repository()
+        self.assertEqual(repository.get_value("cardano"), "CARDANO")
+        self.assertEqual(repository.get_value("cardano"), "CARDANO")
+        self.assertEqual(repository.get_value(name="cardano"), "CARDANO")
+        # Positional and keyword calls are cached under their own keys
+        self.assertEqual(repository.calls, 2)
+
+    def test_cached_methods_sharing_a_cache(self):
+        self.assertEqual(TokenRepository().get("cardano"), "token cardano")
+        self.assertEqual(BlockchainRepository().get("cardano"), "blockchain cardano")
+        self.assertEqual(TokenRepository.get.__qualname__, "TokenRepository.get")
+
+    def test_cached_method_skips_none(self):
+        repository = Repository()
+        self.assertIsNone(repository.get_value(""))
+        self.assertIsNone(repository.get_value(""))
+        self.assertEqual(repository.calls, 2)
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_least_recently_used_is_evicted(self):
+        cache = LRUCache(name="test", max_size=2, negative_ttl_seconds=60)
+        cache.set("key_1", "value_1")
+        cache.set("key_2", "value_2")
+        cache.get("key_1")
+        cache.set("key_3", "value_3")
+        self.assertEqual(cache.get("key_2"), (False, None))
+        self.assertEqual(cache.get("key_1"), (True, "value_1"))
+        self.assertEqual(cache.get("key_3"), (True, "value_3"))
+
+    def test_missing_key_expires(self):
+        cache = LRUCache(name="test", max_size=2, negative_ttl_seconds=60)
+        with patch("utils.cache.time.monotonic", return_value=100):
+            cache.set_missing("key")
+            self.assertEqual(cache.get("key"), (True, None))
+        with patch("utils.cache.time.monotonic", return_value=160):
+            self.assertEqual(cache.get("key"), (False, None))
+        self.assertEqual(cache.stats(), {"name": "test", "hits": 1, "misses": 1, "size": 0})
+
+    def test_warmed_until_invalidated(self):
+        cache = LRUCache(name="test", max_size=2, negative_ttl_seconds=60)
+        self.assertFalse(cache.warmed)
+        cache.set_warmed()
+        self.assertTrue(cache.warmed)
+        cache.invalidate("key")
+        self.assertTrue(cache.warmed)
+        cache.invalidate()
+        self.assertFalse(cache.warmed)
+
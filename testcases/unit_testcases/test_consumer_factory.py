@@ -0,0 +1,33 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from application.factory.consumer_factory import convert_consumer_event
+from application.service.consumer_service import ConsumerService
+from constants.general import BlockchainName
+
+
+class TestConvertConsumerEvent(unittest.TestCase):
+
+    @patch("application.service.consumer_service.NotificationService.send_message_to_queue")
+    def test_block_confirmation_event_round_trip(self, mock_send_message_to_queue):
+        payloads = [
+            {"blockchain_name": BlockchainName.CARDANO.value,
+             "blockchain_event": {"id": 1, "tx_hash": "cardano_tx_hash", "event_type": "TOKEN_RECEIVED"}},
+            {"blockchain_name": BlockchainName.ETHEREUM.value,
+             "blockchain_event": {"name": "DepositToken", "data": {"transactionHash": "0xethereum_tx_hash",
+                                                                   "json_str": "{}"}}}
+        ]
+        for payload in payloads:
+            ConsumerService.enqueue_for_block_confirmation(payload=payload, blockchain_name=payload["blockchain_name"],
+                                                           missing_block_confirmation=3)
+            message = mock_send_message_to_queue.call_args.kwargs["message"]
+            new_format = convert_consumer_event(event={"Records": [{"body": message}]})
+            self.assertEqual(new_format, [{**payload, "block_confirmation_attempt": 1}])
+
+            ConsumerService.enqueue_for_block_confirmation(payload=new_format[0],
+                                                           blockchain_name=payload["blockchain_name"],
+                                                           missing_block_confirmation=3)
+            message = mock_send_message_to_queue.call_args.kwargs["message"]
+            new_format = convert_consumer_event(event={"Records": [{"body": message}]})
+            self.assertEqual(new_format, [{**payload, "block_confirmation_attempt": 2}])
@@ -0,0 +1,23 @@
+import unittest
+from unittest.mock import patch
+
+from application.service.wallet_pair_service import WalletPairService, deposit_address_cache
+
+
+class TestDepositAddressCache(unittest.TestCase):
+
+    @patch("application.service.wallet_pair_service.WalletPairRepository.get_wallet_pair_by_deposit_address")
+    @patch("application.service.wallet_pair_service.WalletPairRepository.get_all_deposit_address")
+    def test_empty_warm_load_is_not_repeated(self, mock_get_all_deposit_address,
+                                             mock_get_wallet_pair_by_deposit_address):
+        mock_get_all_deposit_address.return_value = []
+        mock_get_wallet_pair_by_deposit_address.return_value = None
+        wallet_pair_service = WalletPairService()
+        self.assertIsNone(wallet_pair_service.get_wallet_pair_by_deposit_address(deposit_address="addr_1"))
+        self.assertIsNone(wallet_pair_service.get_wallet_pair_by_deposit_address(deposit_address="addr_2"))
+        self.assertIsNone(wallet_pair_service.get_wallet_pair_by_deposit_address(deposit_address="addr_1"))
+        self.assertEqual(mock_get_all_deposit_address.call_count, 1)
+        self.assertEqual(mock_get_wallet_pair_by_deposit_address.call_count, 2)
+
+    def tearDown(self):
+        deposit_address_cache.invalidate()
@@ -0,0 +1,45 @@
+import json
+import unittest
+from unittest.mock import patch, Mock
+
+from utils.exception_handler import consumer_exception_handler
+from utils.exceptions import InternalServerErrorException, BadRequestException
+
+logger = Mock()
+
+
+@consumer_exception_handler(BATCH_ITEM_FAILURES=True, logger=logger)
+def handler(event, context):
+    for record in event["Records"]:
+        body = json.loads(record["body"])
+        if body == "bad request":
+            raise BadRequestException(error_code=None, error_details=None)
+        if body == "error":
+            raise InternalServerErrorException(error_code=None, error_details=None)
+
+
+def sqs_event(bodies, message_group_id=None):
+    records = []
+    for index, body in enumerate(bodies):
+        record = {"messageId": f"message_id_{index}", "body": json.dumps(body)}
+        if message_group_id:
+            record["attributes"] = {"MessageGroupId": message_group_id}
+        records.append(record)
+    return {"Records": records}
+
+
+@patch("common.utils.Utils.report_slack")
+class TestConsumerExceptionHandler(unittest.TestCase):
+
+    def test_failed_records_are_reported(self, mock_report_slack):
+        response = handler(sqs_event(["ok", "error", "bad request", "ok"]), {})
+        self.assertEqual(response, {"batchItemFailures": [{"itemIdentifier": "message_id_1"}]})
+        self.assertEqual(mock_report_slack.call_count, 1)
+
+    def test_message_group_is_failed_after_its_first_failure(self, mock_report_slack):
+        response = handler(sqs_event(["ok", "error", "ok"], message_group_id="group"), {})
+        self.assertEqual(response, {"batchItemFailures": [{"itemIdentifier": "message_id_1"},
+                                                          {"itemIdentifier": "message_id_2"}]})
+
+    def test_batch_without_success_raises(self, mock_report_slack):
+        self.assertRaises(InternalServerErrorException, handler, sqs_event(["error", "error"]), {})
@@ -0,0 +1,36 @@
+import unittest
+from unittest.mock import patch
+
+from application.service.pooling_service import PoolingService
+from utils.general import get_weighted_group
+
+
+class TestMessageGroupAssignment(unittest.TestCase):
+
+    def test_weighted_group(self):
+        weighted_groups = {"CONVERTER_BRIDGE_1": 3, "CONVERTER_BRIDGE_2": 1, "CONVERTER_BRIDGE_3": 0}
+        groups = [get_weighted_group(key=f"conversion_{index}", weighted_groups=weighted_groups)
+                  for index in range(4000)]
+        self.assertEqual(groups, [get_weighted_group(key=f"conversion_{index}", weighted_groups=weighted_groups)
+                                  for index in range(4000)])
+        self.assertAlmostEqual(groups.count("CONVERTER_BRIDGE_1") / len(groups), 0.75, delta=0.03)
+        self.assertEqual(groups.count("CONVERTER_BRIDGE_3"), 0)
+        self.assertIsNone(get_weighted_group(key="conversion", weighted_groups={}))
+
+    @patch("application.service.pooling_service.PoolingRepository.update_message_pool")
+    @patch("application.service.pooling_service.PoolingRepository.get_message_group_pool")
+    def test_hash_mode_skips_the_database(self, mock_get_message_group_pool, mock_update_message_pool):
+        with patch.dict("application.service.pooling_service.MESSAGE_GROUP_ASSIGNMENT",
+                        {"MODE": "hash", "GROUPS": {"CONVERTER_BRIDGE_1": 1, "CONVERTER_BRIDGE_2": 1}}):
+            message_group_id, message_pool_id = PoolingService().get_message_group_id(conversion_id="conversion")
+        self.assertIn(message_group_id, ["CONVERTER_BRIDGE_1", "CONVERTER_BRIDGE_2"])
+        self.assertIsNone(message_pool_id)
+        mock_get_message_group_pool.assert_not_called()
+        mock_update_message_pool.assert_not_called()
+
+    @patch("application.service.pooling_service.PoolingRepository.get_message_group_pool")
+    def test_least_recently_used_mode(self, mock_get_message_group_pool):
+        mock_get_message_group_pool.return_value = None
+        with patch.dict("application.service.pooling_service.MESSAGE_GROUP_ASSIGNMENT",
+                        {"MODE": "least_recently_used"}):
+            self.assertEqual(PoolingService().get_message_group_id(conversion_id="conversion"), ("", None))
@@ -1,5 +1,4 @@
 import os
-import time
 from decimal import Decimal
 from http import HTTPStatus
 import re
@@ -14,7 +13,7 @@ from blockfrost.utils import ApiError as BlockfrostApiError
 from application.service.cardano_service import CardanoService
 from common.blockchain_util import BlockChainUtil
 from common.logger import get_logger
-from config import TOKEN_CONTRACT_PATH, MAX_RETRY, SLEEP_TIME
+from config import TOKEN_CONTRACT_PATH, BLOCK_CONFIRMATION_WAIT
 from constants.blockchain import CardanoTransactionEntities, CardanoBlockEntities, EthereumBlockchainEntities, \
     BinanceBlockchainEntities
 from constants.entity import BlockchainEntities, TokenEntities, ConversionDetailEntities, TransactionEntities, \
@@ -22,7 +21,7 @@ from constants.entity import BlockchainEntities, TokenEntities, ConversionDetail
     EthereumAllowedEventType, CardanoAllowedEventType, CardanoServicesEventTypes, EthereumEventConsumerEntities, \
     BinanceAllowedEventType, BinanceEventConsumerEntities
 from constants.error_details import ErrorCode, ErrorDetails
-from constants.general import BlockchainName, ConversionOn, MaxRetryEntities, SleepTimeEntities
+from constants.general import BlockchainName, ConversionOn
 from constants.status import TransactionOperation, EthereumToCardanoEvent, CardanoToEthereumEvent, TransactionStatus, \
     ConversionStatus, EthereumToBinanceEvent, BinanceToEthereumEvent, CardanoToCardanoEvent
 from domain.entities.converter_bridge import ConverterBridge
@@ -587,64 +586,32 @@ def validate_conversion_with_blockchain(conversion_on, address, amount, conversi
 
 
 def get_current_block_confirmation(blockchain_name, tx_hash, network_id):
-    current_block_confirmation = 0
+    # Checked once, an event short of confirmations is re-enqueued with a delay instead of sleeping in the lambda
     logger.info("Getting the current block confirmation")
-    i = 1
-    BLOCK_CONFIRMATION_SLEEP_TIME = SLEEP_TIME.get(SleepTimeEntities.BLOCK_CONFIRMATION.value, 0)
-    MAX_RETRY_BLOCK_CONFIRMATION = MAX_RETRY.get(MaxRetryEntities.BLOCK_CONFIRMATION.value, 0)
-
-    while True:
-        try:
-            if blockchain_name.lower() == BlockchainName.CARDANO.value.lower():
-                current_block_confirmation = get_block_confirmation(tx_hash=tx_hash,
-                                                                    blockchain_network_id=network_id)
-            else:
-                current_block_confirmation = get_evm_block_confirmation(tx_hash=tx_hash,
-                                                                        blockchain_network_id=network_id)
-        except Exception as e:
-            logger.info(f"Transaction mayn't be available={e}, we will retry it ")
-
-        if i > MAX_RETRY_BLOCK_CONFIRMATION:
-            break
-
-        if not current_block_confirmation:
-            time.sleep(BLOCK_CONFIRMATION_SLEEP_TIME)
-            logger.info(f"Waiting to get at least 1 block confirmation for the last "
-                        f"{i * BLOCK_CONFIRMATION_SLEEP_TIME} seconds")
-        else:
-            break
-
-        i += 1
-    return current_block_confirmation
-
-
-def wait_until_transaction_hash_exists_in_blockchain(tx_hash, network_id):
-    logger.info("Waiting until the transaction hash exists in the blockchain exists ")
-    i = 1
-    SLEEP_TIME_TRANSACTION_HASH_PRESENCE = SLEEP_TIME.get(SleepTimeEntities.TRANSACTION_HASH_PRESENCE.value, 0)
-    MAX_RETRY_TRANSACTION_HASH_PRESENCE = MAX_RETRY.get(MaxRetryEntities.TRANSACTION_HASH_PRESENCE.value, 0)
-
-    url, project_id = get_cardano_network_url_and_project_id(chain_id=network_id)
-    cardano_blockchain = CardanoBlockchainUtil(project_id=project_id, base_url=url)
+    try:
+        if blockchain_name.lower() == BlockchainName.CARDANO.value.lower():
+            return get_block_confirmation(tx_hash=tx_hash, blockchain_network_id=network_id)
+        return get_evm_block_confirmation(tx_hash=tx_hash, blockchain_network_id=network_id)
+    except Exception as e:
+        logger.info(f"Transaction mayn't be available={e}, we will retry it ")
+        return 0
 
-    while True:
-        transaction = None
-        try:
-            transaction = cardano_blockchain.get_transaction(hash=tx_hash)
-        except Exception as e:
-            logger.info(f"Transaction  hash mayn't be available={e}, we will retry it ")
 
-        if i > MAX_RETRY_TRANSACTION_HASH_PRESENCE:
-            break
+def get_block_confirmation_delay(blockchain_name, missing_block_confirmation):
+    block_time = BLOCK_CONFIRMATION_WAIT["BLOCK_TIME_SECONDS"].get(blockchain_name.lower(), 0)
+    delay = max(block_time * missing_block_confirmation, BLOCK_CONFIRMATION_WAIT["MIN_DELAY_SECONDS"])
+    return min(delay, BLOCK_CONFIRMATION_WAIT["MAX_DELAY_SECONDS"])
 
-        if not transaction:
-            time.sleep(SLEEP_TIME_TRANSACTION_HASH_PRESENCE)
-            logger.info(f"Waiting for transaction hash presence continues for last "
-                        f"{i * SLEEP_TIME_TRANSACTION_HASH_PRESENCE} seconds")
-        else:
-            break
 
-        i += 1
+def is_transaction_hash_present(cardano_blockchain, tx_hash):
+    # Only a not found answer means the hash is absent, outages and rate limits are raised to the caller
+    try:
+        return bool(cardano_blockchain.get_transaction(hash=tx_hash))
+    except BlockfrostApiError as e:
+        if getattr(e, "status_code", None) != 404:
+            raise e
+        logger.info(f"Transaction hash={tx_hash} is not available yet")
+        return False
 
 
 def is_valid_cardano_address(address: str) -> bool:
@@ -0,0 +1,114 @@
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TTLCache:
+    # Module level instances outlive the invocation, a warm lambda container reuses them
+
+    def __init__(self, name, ttl_seconds):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.entries = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return True, entry[1]
+
+        if entry is not None:
+            del self.entries[key]
+        self.misses += 1
+        return False, None
+
+    def set(self, key, value):
+        if self.ttl_seconds > 0:
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {"name": self.name, "hits": self.hits, "misses": self.misses, "size": len(self.entries)}
+
+
+class LRUCache:
+    # Bounded by entry count, entries without a ttl stay until evicted and missing keys expire after negative_ttl
+
+    def __init__(self, name, max_size, negative_ttl_seconds):
+        self.name = name
+        self.max_size = max_size
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.entries = OrderedDict()
+        self.warmed = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+        if entry is not None:
+            del self.entries[key]
+        self.misses += 1
+        return False, None
+
+    def set(self, key, value):
+        self.__put(key, (None, value))
+
+    def set_missing(self, key):
+        if self.negative_ttl_seconds > 0:
+            self.__put(key, (time.monotonic() + self.negative_ttl_seconds, None))
+
+    def set_warmed(self):
+        self.warmed = True
+
+    def invalidate(self, key=None):
+        if key is None:
+            self.entries.clear()
+            self.warmed = False
+        else:
+            self.entries.pop(key, None)
+
+    def stats(self):
+        return {"name": self.name, "hits": self.hits, "misses": self.misses, "size": len(self.entries)}
+
+    def __put(self, key, entry):
+        if self.max_size <= 0:
+            return
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+
+def cached(cache):
+    # Exceptions and None are not cached, a missing row is looked up again on the next call and keys taken
+    # from event payloads never add entries for rows that do not exist
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__qualname__, args[1:], tuple(sorted(kwargs.items())))
+            found, value = cache.get(key)
+            if found:
+                return value
+
+            value = func(*args, **kwargs)
+            if value is not None:
+                cache.set(key, value)
+            logger.debug(f"Cache miss on {func.__qualname__}, cache stats={cache.stats()}")
+            return value
+
+        return wrapper
+
+    return decorator
@@ -1,16 +1,85 @@
+import threading
+from contextlib import contextmanager
+
+# State of the database calls made on the current thread, a lambda runs one invocation per thread
+db_context = threading.local()
+
+MYSQL_DUPLICATE_ENTRY_ERROR = 1062
+
+
+def in_unit_of_work():
+    return getattr(db_context, "unit_of_work_depth", 0) > 0
+
+
+def in_read():
+    return getattr(db_context, "read_depth", 0) > 0 and not in_unit_of_work()
+
+
+def get_read_session():
+    return getattr(db_context, "read_session", None)
+
+
+def can_read_from_replica(replica_lag_tolerance, replica_lag):
+    if getattr(db_context, "primary_read_depth", 0) > 0:
+        return False
+    return replica_lag_tolerance is None or replica_lag_tolerance >= replica_lag
+
+
+@contextmanager
+def read_from_primary():
+    # Read-your-writes paths pin every read made inside the block to the primary
+    db_context.primary_read_depth = getattr(db_context, "primary_read_depth", 0) + 1
+    try:
+        yield
+    finally:
+        db_context.primary_read_depth -= 1
+
+
+@contextmanager
+def unit_of_work(session):
+    # Only the outermost unit of work commits, nested ones flush so generated keys are available to the caller
+    db_context.unit_of_work_depth = getattr(db_context, "unit_of_work_depth", 0) + 1
+    outermost = db_context.unit_of_work_depth == 1
+    try:
+        yield session
+        if outermost:
+            session.commit()
+        else:
+            session.flush()
+    except Exception as e:
+        if outermost:
+            session.rollback()
+        raise e
+    finally:
+        db_context.unit_of_work_depth -= 1
+
+
+def is_duplicate_entry_error(error):
+    # Only a unique key violation, foreign key and not null failures carry other error codes
+    args = getattr(error.orig, "args", None)
+    return bool(args) and args[0] == MYSQL_DUPLICATE_ENTRY_ERROR
+
+
+def count_commit(session):
+    db_context.commit_count = get_commit_count() + 1
+
+
+def get_commit_count():
+    return getattr(db_context, "commit_count", 0)
+
+
+def reset_commit_count():
+    db_context.commit_count = 0
+
+
 def update_in_db(*decorator_args, **decorator_kwargs):
     def decorator(func):
         def wrapper(*args, **kwargs):
             if len(args) == 0:
                 raise Exception('should be used in class method')
             func_self = args[0]
-            try:
-                data = func(*args, **kwargs)
-                func_self.session.commit()
-                return data
-            except Exception as e:
-                func_self.session.rollback()
-                raise e
+            with unit_of_work(func_self.write_session):
+                return func(*args, **kwargs)
 
         return wrapper
 
@@ -18,18 +87,39 @@ def update_in_db(*decorator_args, **decorator_kwargs):
 
 
 def read_from_db(*decorator_args, **decorator_kwargs):
+    # Seconds of replication lag the method accepts, None accepts any lag and 0 always reads from the primary
+    replica_lag_tolerance = decorator_kwargs.get("replica_lag_tolerance")
+
     def decorator(func):
         def wrapper(*args, **kwargs):
             if len(args) == 0:
                 raise Exception('should be used in class method')
             func_self = args[0]
+            # Inside a unit of work the read joins its transaction to see the pending writes
+            if in_unit_of_work():
+                return func(*args, **kwargs)
+
+            db_context.read_depth = getattr(db_context, "read_depth", 0) + 1
+            outermost = db_context.read_depth == 1
+            if outermost:
+                use_replica = func_self.replica_session is not None \
+                    and can_read_from_replica(replica_lag_tolerance, func_self.replica_lag)
+                db_context.read_session = func_self.replica_session if use_replica else func_self.read_session
+            read_session = db_context.read_session
             try:
                 data = func(*args, **kwargs)
-                func_self.session.commit()
+                # Read session runs in autocommit, expiring its objects is enough to see newer rows on the next read
+                if outermost:
+                    read_session.expire_all()
                 return data
             except Exception as e:
-                func_self.session.rollback()
+                if outermost:
+                    read_session.rollback()
                 raise e
+            finally:
+                db_context.read_depth -= 1
+                if outermost:
+                    db_context.read_session = None
 
         return wrapper
 
@@ -5,7 +5,8 @@ from http import HTTPStatus
 
 from common.utils import generate_lambda_response, make_response_body, Utils
 from constants.entity import ConverterBridgeEntities
-from constants.lambdas import HttpRequestParamType, LambdaResponseStatus
+from constants.lambdas import HttpRequestParamType, LambdaResponseStatus, SQSBatchParamType
+from utils.database import reset_commit_count, get_commit_count
 from utils.exceptions import InternalServerErrorException, BlockConfirmationNotEnoughException, BadRequestException
 from utils.lambdas import make_error_format
 
@@ -32,6 +33,7 @@ def exception_handler(*decorator_args, **decorator_kwargs):
         def wrapper(*args, **kwargs):
             event = kwargs.get("event", args[0])
             now = time.time()
+            reset_commit_count()
 
             handler_name = decorator_kwargs.get("handler_name", func.__name__)
             path = event.get("path", None)
@@ -56,6 +58,7 @@ def exception_handler(*decorator_args, **decorator_kwargs):
                 difference = int(later - now)
 
                 logger.info(f"Time taken for handler name= {handler_name} time={difference} seconds")
+                logger.info(f"Database commits for handler name= {handler_name} commits={get_commit_count()}")
                 return func_response
             except EXCEPTIONS as e:
                 exec_info = get_exec_info()
@@ -99,6 +102,7 @@ def consumer_exception_handler(*decorator_args, **decorator_kwargs):
         NETWORK_ID = decorator_kwargs.get("NETWORK_ID", None)
         SLACK_HOOK = decorator_kwargs.get("SLACK_HOOK", None)
         EXCEPTIONS = decorator_kwargs.get("EXCEPTIONS", ())
+        BATCH_ITEM_FAILURES = decorator_kwargs.get("BATCH_ITEM_FAILURES", False)
 
         def get_exec_info():
             exec_info = sys.exc_info()
@@ -108,9 +112,10 @@ def consumer_exception_handler(*decorator_args, **decorator_kwargs):
                 exception_info = exception_info + exc_lines
             return exception_info
 
-        def wrapper(*args, **kwargs):
+        def handle(*args, **kwargs):
             event = kwargs.get("event", args[0])
             now = time.time()
+            reset_commit_count()
 
             handler_name = decorator_kwargs.get("handler_name", func.__name__)
             path = event.get("path", None)
@@ -135,6 +140,7 @@ def consumer_exception_handler(*decorator_args, **decorator_kwargs):
                 difference = int(later - now)
 
                 logger.info(f"Time taken for handler name= {handler_name} time={difference} seconds")
+                logger.info(f"Database commits for handler name= {handler_name} commits={get_commit_count()}")
                 return func_response
             except BlockConfirmationNotEnoughException as e:
                 logger.info("Not enough blockchain confirmation, so retrying silently")
@@ -148,6 +154,42 @@ def consumer_exception_handler(*decorator_args, **decorator_kwargs):
                 utils_obj.report_slack(slack_msg=slack_message, SLACK_HOOK=SLACK_HOOK)
                 raise e
 
+        def handle_batch(records, context):
+            # Every record runs as a batch of its own, only the failed ones are handed back to SQS for a retry.
+            # Once a record of a FIFO message group fails the rest of that group is failed too to keep the order.
+            batch_item_failures = []
+            failed_message_groups = set()
+            exception = None
+            for record in records:
+                message_group_id = record.get(SQSBatchParamType.ATTRIBUTES.value, {}) \
+                    .get(SQSBatchParamType.MESSAGE_GROUP_ID.value)
+                if message_group_id is None or message_group_id not in failed_message_groups:
+                    try:
+                        handle({SQSBatchParamType.RECORDS.value: [record]}, context)
+                        continue
+                    except Exception as e:
+                        exception = e
+
+                if message_group_id is not None:
+                    failed_message_groups.add(message_group_id)
+                batch_item_failures.append(
+                    {SQSBatchParamType.ITEM_IDENTIFIER.value: record.get(SQSBatchParamType.MESSAGE_ID.value)})
+
+            if len(batch_item_failures) == len(records):
+                # Nothing succeeded, fail the invocation as a whole like a batch of one did before
+                raise exception
+            if batch_item_failures:
+                logger.info(f"Batch items failed={len(batch_item_failures)} out of records={len(records)}")
+            return {SQSBatchParamType.BATCH_ITEM_FAILURES.value: batch_item_failures}
+
+        def wrapper(*args, **kwargs):
+            event = kwargs.get("event", args[0])
+            records = event.get(SQSBatchParamType.RECORDS.value)
+            if BATCH_ITEM_FAILURES and records:
+                context = kwargs.get("context", args[1] if len(args) > 1 else None)
+                return handle_batch(records=records, context=context)
+            return handle(*args, **kwargs)
+
         return wrapper
 
     return decorator
@@ -1,3 +1,5 @@
+import base64
+import hashlib
 import json
 import math
 import uuid
@@ -144,6 +146,31 @@ def paginate_items_response_format(items, total_records, page_number, page_size)
                 PaginationEntity.PAGE_SIZE.value: page_size}}
 
 
+def cursor_paginate_items_response_format(items, next_cursor, page_size):
+    return {PaginationEntity.ITEMS.value: items,
+            PaginationEntity.META.value: {
+                PaginationEntity.NEXT_CURSOR.value: next_cursor,
+                PaginationEntity.PAGE_SIZE.value: page_size}}
+
+
+def encode_pagination_cursor(order, status_rank, created_at, row_id):
+    position = [order, status_rank, datetime_to_str(created_at), row_id]
+    return base64.urlsafe_b64encode(json.dumps(position, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_pagination_cursor(cursor, order):
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        cursor_order, status_rank, created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        if cursor_order != order or not isinstance(status_rank, int) or not isinstance(row_id, int):
+            raise ValueError(f"Cursor not matching the order={order}")
+        return status_rank, datetime.strptime(created_at, '%Y-%m-%d %H:%M:%S'), row_id
+    except (TypeError, ValueError) as e:
+        logger.info(f"Unable to decode the pagination cursor={cursor}, error={e}")
+        raise BadRequestException(error_code=ErrorCode.INVALID_PAGINATION_CURSOR.value,
+                                  error_details=ErrorDetails[ErrorCode.INVALID_PAGINATION_CURSOR.value].value)
+
+
 def check_existing_transaction_succeed(transactions):
     is_check_existing_transaction_succeed = True
     for transaction in transactions:
@@ -271,3 +298,15 @@ def get_formatted_conversion_status_report(start_date, end_date, report):
         content = content + f"\n{from_blockchain}\t{to_blockchain}\t{token}\t{total_count}\t{each_count}"
     content = content + "\n------------------------------- Done :white_check_mark: -------------------------------\n"
     return content
+
+
+def get_weighted_group(key, weighted_groups):
+    # sha256 rather than hash(), the position has to be the same on every container and deploy
+    total_weight = sum(weighted_groups.values())
+    if total_weight <= 0:
+        return None
+    position = int(hashlib.sha256(key.encode("utf-8")).hexdigest(), 16) % total_weight
+    for group, weight in weighted_groups.items():
+        if position < weight:
+            return group
+        position -= weight
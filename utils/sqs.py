@@ -12,7 +12,7 @@ logger = get_logger(__name__)
 class SqsService:
 
     @staticmethod
-    def send_message_to_queue(queue: str, message: str, message_group_id: str):
+    def send_message_to_queue(queue: str, message: str, message_group_id: str, delay_seconds: int = None):
         payload = dict()
         queue_url = QUEUE_DETAILS.get(queue)
         if not queue_url:
@@ -24,6 +24,8 @@ class SqsService:
         payload[SQSEntities.MESSAGE_BODY.value] = message
         if message_group_id:
             payload[SQSEntities.MESSAGE_GROUP_ID.value] = message_group_id
+        if delay_seconds:
+            payload[SQSEntities.DELAY_SECONDS.value] = delay_seconds
 
         logger.info(f"Started publishing the message to the queue with details={payload}")
         try: